@@ -115,7 +115,7 @@ const Friends = () => {
                   </div>
                 </div>
                 <div className={`text-lg font-bold ${item.is_current_user ? 'text-blue-600' : 'text-gray-600'}`}>
-                  {item.weekly_score}
+                  {item.score}
                 </div>
               </div>
             ))
@@ -148,7 +148,7 @@ const Friends = () => {
                   </div>
                   <div>
                     <div className="font-medium text-gray-800">{friend.username}</div>
-                    <div className="text-sm text-gray-600">이번 주 점수: {friend.weekly_score}</div>
+                    <div className="text-sm text-gray-600">이번 주 점수: {friend.score}</div>
                   </div>
                 </div>
                 <button className="text-blue-600 hover:text-blue-800 text-sm font-medium">
@@ -2,20 +2,15 @@ import React, { useState, useEffect, useMemo } from 'react';
 import PropTypes from 'prop-types';
 import { Link } from 'react-router-dom';
 import { Plus, Activity } from 'lucide-react';
-import { API_BASE_URL } from './constants';
+import { getCachedRecords, syncRecords } from './recordSync';
 
 const HomePage = () => {
-  const [records, setRecords] = useState([]);
+  const [records, setRecords] = useState(getCachedRecords);
   
   useEffect(() => {
     const fetchRecords = async () => {
       try {
-        const response = await fetch(`${API_BASE_URL}/records`);
-        if (!response.ok) throw new Error('Failed to fetch records');
-        const result = await response.json();
-        if (result.status === 'success') {
-          setRecords(result.data);
-        }
+        setRecords(await syncRecords());
       } catch (error) {
         console.error("Error fetching records for homepage:", error);
       }
@@ -2,42 +2,31 @@ import React, { useState, useEffect, useMemo } from 'react';
 import PropTypes from 'prop-types';
 import { ArrowLeft, Search, Filter, Trash2, WifiOff } from 'lucide-react';
 import { useNavigate } from 'react-router-dom';
-import { TEXTS, SETTINGS, API_BASE_URL } from './constants';
+import { TEXTS, SETTINGS } from './constants';
+import { getCachedRecords, syncRecords } from './recordSync';
 import Card from './Card';
 
 /**
  * 운동 기록을 표시하고 관리하는 페이지 컴포넌트입니다.
- * API로부터 운동 기록을 가져와 목록으로 보여주며, 검색 및 필터링 기능을 제공합니다.
+ * 저장해 둔 목록을 먼저 보여준 뒤 API로부터 변경분만 받아 반영하며, 검색 및 필터링 기능을 제공합니다.
  * @returns {JSX.Element} Records 페이지의 JSX 엘리먼트
  */
 const Records = () => {
   const navigate = useNavigate();
-  const [records, setRecords] = useState([]);
-  const [isLoading, setIsLoading] = useState(true);
+  const [records, setRecords] = useState(getCachedRecords);
+  const [isLoading, setIsLoading] = useState(records.length === 0);
   const [error, setError] = useState(null);
   const [searchTerm, setSearchTerm] = useState('');
   const [filterType, setFilterType] = useState('전체');
 
   useEffect(() => {
     /**
-     * 서버에서 운동 기록 데이터를 비동기적으로 가져옵니다.
+     * 서버에서 마지막 동기화 이후 변경된 운동 기록을 비동기적으로 가져와 반영합니다.
      */
     const fetchRecords = async () => {
       try {
-        setIsLoading(true);
-        const response = await fetch(`${API_BASE_URL}/records`);
-
-        if (!response.ok) {
-          throw new Error(`HTTP 에러! 상태: ${response.status}`);
-        }
-
-        const result = await response.json();
-        if (result.status === 'success') {
-          setRecords(result.data);
-          setError(null);
-        } else {
-          throw new Error(result.message || TEXTS.ERROR_LOADING_RECORDS);
-        }
+        setRecords(await syncRecords());
+        setError(null);
       } catch (err) {
         setError(TEXTS.ERROR_LOADING_RECORDS);
         console.error(err);
@@ -0,0 +1,14 @@
+"""
+ASGI 서버에서 API를 실행하기 위한 진입점입니다.
+
+    uvicorn asgi:app --workers 4
+
+동기 Flask 뷰(블로킹 DB 작업 포함)는 워커 프로세스마다 크기가 ASGI_THREADS로 제한된
+스레드 풀에서 실행되므로, 느린 통계 집계가 이벤트 루프나 다른 요청을 막지 않습니다.
+한 요청 안의 독립적인 조회는 DB_QUERY_CONCURRENCY 크기의 별도 풀에서 동시에 실행됩니다.
+"""
+from a2wsgi import WSGIMiddleware
+from main import create_app
+
+flask_app = create_app()
+app = WSGIMiddleware(flask_app, workers=flask_app.config['ASGI_THREADS'])
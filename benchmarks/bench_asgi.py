@@ -0,0 +1,160 @@
+"""
+동기(WSGI, gunicorn sync 워커) 모드와 ASGI(uvicorn + asgi.py) 모드의 부하 테스트 하네스입니다.
+
+같은 워커 프로세스 수로 두 서버를 차례로 띄우고, 느린 통계 집계(1년 범위)와 리더보드,
+헬스 체크가 섞인 요청을 동시 클라이언트로 보내 엔드포인트별 p50/p99 지연 시간과 처리량을 비교합니다.
+느린 요청이 워커 전체를 점유하면 빠른 요청(health)의 p99가 크게 늘어납니다.
+
+실행: python benchmarks/bench_asgi.py [--workers 2] [--clients 32] [--duration 15]
+(gunicorn, uvicorn, a2wsgi가 설치되어 있어야 합니다)
+"""
+import argparse
+import os
+import random
+import shlex
+import subprocess
+import tempfile
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import date, datetime, timedelta
+
+from common import make_app
+from src.models.user import db, User
+from src.models.exercise_record import ExerciseRecord
+from src.models.friendship import Friendship
+from src.utils.catalog import encode_record_values
+from src.utils.friend_queries import rebuild_friend_edges
+from src.utils.rollup import rebuild_rollups
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+USER_COUNT = 200
+RECORDS_PER_USER = 300
+MODES = {
+    'sync': 'gunicorn -w {workers} -b 127.0.0.1:{port} "main:create_app()"',
+    'asgi': 'uvicorn asgi:app --workers {workers} --host 127.0.0.1 --port {port}'
+}
+# (이름, URL 템플릿, 가중치)
+REQUEST_MIX = [
+    ('statistics_year', '/api/statistics/{user_id}?period=year&bucket=day', 3),
+    ('leaderboard', '/api/friends/leaderboard/{user_id}', 3),
+    ('health', '/api/health', 4)
+]
+
+def seed(database_uri):
+    """임시 데이터베이스에 사용자, 친구 관계, 1년치 운동 기록과 일별 롤업을 만듭니다."""
+    app = make_app(database_uri)
+    today = date.today()
+    with app.app_context():
+        db.session.execute(User.__table__.insert(), [
+            {'id': uid, 'username': f'user{uid}', 'email': f'user{uid}@example.com'}
+            for uid in range(1, USER_COUNT + 1)
+        ])
+        db.session.execute(Friendship.__table__.insert(), [
+            {'user_id': uid, 'friend_id': friend_id, 'status': 'accepted'}
+            for uid in range(1, USER_COUNT + 1)
+            for friend_id in random.sample(range(uid + 1, USER_COUNT + 1), min(20, USER_COUNT - uid))
+        ])
+        db.session.execute(ExerciseRecord.__table__.insert(), encode_record_values([
+            {
+                'user_id': uid,
+                'date': today - timedelta(days=random.randrange(365)),
+                'time_of_day': random.choice(['오전', '오후', '야간']),
+                'intensity': random.randint(0, 10),
+                'exercise_type': random.choice(['러닝', '수영', '요가', '웨이트']),
+                'created_at': datetime.utcnow() - timedelta(days=random.randrange(14))
+            }
+            for uid in range(1, USER_COUNT + 1)
+            for _ in range(RECORDS_PER_USER)
+        ]))
+        db.session.commit()
+        rebuild_friend_edges()
+        rebuild_rollups()
+
+def wait_until_ready(base_url, timeout=30):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with urllib.request.urlopen(base_url + '/api/health', timeout=1):
+                return
+        except (urllib.error.URLError, ConnectionError):
+            time.sleep(0.2)
+    raise RuntimeError(f'{base_url} 서버가 {timeout}초 안에 시작되지 않았습니다.')
+
+def run_load(base_url, clients, duration):
+    """동시 클라이언트로 요청을 보내고 엔드포인트별 지연 시간(초) 목록을 반환합니다."""
+    names = [name for name, _, _ in REQUEST_MIX]
+    templates = {name: template for name, template, _ in REQUEST_MIX}
+    weights = [weight for _, _, weight in REQUEST_MIX]
+    latencies = {name: [] for name in names}
+    errors = []
+    lock = threading.Lock()
+    deadline = time.monotonic() + duration
+
+    def client(seed_value):
+        rng = random.Random(seed_value)
+        while time.monotonic() < deadline:
+            name = rng.choices(names, weights)[0]
+            url = base_url + templates[name].format(user_id=rng.randint(1, USER_COUNT))
+            started = time.perf_counter()
+            try:
+                with urllib.request.urlopen(url, timeout=60) as response:
+                    response.read()
+            except (urllib.error.URLError, ConnectionError) as e:
+                with lock:
+                    errors.append(str(e))
+                continue
+            with lock:
+                latencies[name].append(time.perf_counter() - started)
+
+    threads = [threading.Thread(target=client, args=(i,)) for i in range(clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return latencies, errors
+
+def percentile(values, fraction):
+    if not values:
+        return float('nan')
+    values = sorted(values)
+    return values[min(int(len(values) * fraction), len(values) - 1)]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--clients', type=int, default=32)
+    parser.add_argument('--duration', type=float, default=15)
+    parser.add_argument('--port', type=int, default=5055)
+    parser.add_argument('--modes', nargs='+', default=list(MODES), choices=list(MODES))
+    args = parser.parse_args()
+
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as directory:
+        database_uri = f"sqlite:///{os.path.join(directory, 'bench.db')}"
+        seed(database_uri)
+        env = dict(os.environ, DATABASE_URL=database_uri, ETAG_ENABLED='false', JSON_GZIP_MIN_BYTES='0')
+        base_url = f'http://127.0.0.1:{args.port}'
+
+        print(f"workers={args.workers} clients={args.clients} duration={args.duration}s")
+        print(f"{'mode':>5} | {'endpoint':>16} | {'requests':>8} | {'p50 ms':>8} | {'p99 ms':>8} | {'req/s':>8}")
+        for mode in args.modes:
+            command = MODES[mode].format(workers=args.workers, port=args.port)
+            server = subprocess.Popen(shlex.split(command), cwd=ROOT, env=env,
+                                      stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                wait_until_ready(base_url)
+                latencies, errors = run_load(base_url, args.clients, args.duration)
+            finally:
+                server.terminate()
+                server.wait(timeout=30)
+
+            for name, values in latencies.items():
+                print(f"{mode:>5} | {name:>16} | {len(values):8d} | {percentile(values, 0.5) * 1000:8.1f} | "
+                      f"{percentile(values, 0.99) * 1000:8.1f} | {len(values) / args.duration:8.1f}")
+            if errors:
+                print(f"{mode:>5} | 오류 {len(errors)}건 (예: {errors[0]})")
+
+if __name__ == '__main__':
+    main()
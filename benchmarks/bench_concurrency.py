@@ -0,0 +1,115 @@
+"""
+읽기/쓰기가 섞인 동시 부하에서 데이터베이스 프로필별 처리량을 측정합니다.
+
+- default: SQLite 기본 설정 (rollback journal, 풀 기본값)
+- tuned: config.py의 'tuned' 프로필 (WAL, synchronous=NORMAL, busy_timeout, mmap, cache_size, QueuePool)
+
+여러 스레드가 지정한 시간 동안 리더보드 조회(읽기)와 운동 기록 생성(쓰기)을 섞어 실행하고,
+초당 처리량과 'database is locked' 오류 수를 출력합니다.
+
+실행: python benchmarks/bench_concurrency.py [스레드 수] [측정 시간(초)] [쓰기 비율]
+"""
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+
+from common import make_app
+from sqlalchemy.exc import OperationalError
+from config import Config
+from src.models.user import db, User
+from src.models.exercise_record import ExerciseRecord
+from src.models.friendship import Friendship
+from src.utils.cache import invalidate_scores
+from src.utils.catalog import encode_record_values
+from src.utils.db_profile import pool_engine_options
+from src.utils.friend_queries import rebuild_friend_edges
+from src.utils.leaderboard import fetch_participant_scores
+from src.utils.rollup import apply_to_rollup, rebuild_rollups, record_snapshot
+
+USER_COUNT = 200
+
+PROFILES = {
+    'default': {'SQLITE_PRAGMAS': {}, 'SQLALCHEMY_ENGINE_OPTIONS': {'connect_args': {'check_same_thread': False}}},
+    'tuned': {'SQLITE_PRAGMAS': Config.SQLITE_PRAGMAS, 'SQLALCHEMY_ENGINE_OPTIONS': pool_engine_options(Config.DB_POOL_SIZE, Config.DB_BUSY_TIMEOUT_MS)},
+}
+
+def seed():
+    now = datetime.utcnow()
+    db.session.execute(User.__table__.insert(), [
+        {'id': uid, 'username': f'user{uid}', 'email': f'user{uid}@example.com'} for uid in range(1, USER_COUNT + 1)
+    ])
+    db.session.execute(Friendship.__table__.insert(), [
+        {'user_id': uid, 'friend_id': friend_id, 'status': 'accepted'}
+        for uid in range(1, USER_COUNT + 1)
+        for friend_id in random.sample(range(1, USER_COUNT + 1), 20) if friend_id > uid
+    ])
+    db.session.execute(ExerciseRecord.__table__.insert(), encode_record_values([
+        {'user_id': uid, 'date': (now - timedelta(days=day)).date(), 'time_of_day': '오전',
+         'intensity': random.randint(0, 10), 'exercise_type': '러닝', 'created_at': now - timedelta(days=day)}
+        for uid in range(1, USER_COUNT + 1) for day in range(10)
+    ]))
+    db.session.commit()
+    rebuild_friend_edges()
+    rebuild_rollups()
+
+def worker(app, deadline, write_ratio, results):
+    reads = writes = locked = 0
+    rng = random.Random()
+    while time.perf_counter() < deadline:
+        with app.app_context():
+            try:
+                if rng.random() < write_ratio:
+                    record = ExerciseRecord(
+                        user_id=rng.randint(1, USER_COUNT), date=datetime.utcnow().date(), time_of_day='오후',
+                        intensity=rng.randint(0, 10), exercise_type='수영'
+                    )
+                    db.session.add(record)
+                    apply_to_rollup(record_snapshot(record))
+                    db.session.commit()
+                    invalidate_scores([record.user_id])
+                    writes += 1
+                else:
+                    fetch_participant_scores(rng.randint(1, USER_COUNT))
+                    reads += 1
+            except OperationalError as e:
+                db.session.rollback()
+                if 'locked' not in str(e):
+                    raise
+                locked += 1
+            finally:
+                db.session.remove()
+    results.append((reads, writes, locked))
+
+def run_profile(name, threads, duration, write_ratio):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = make_app(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}", **PROFILES[name])
+        with app.app_context():
+            seed()
+        results = []
+        deadline = time.perf_counter() + duration
+        workers = [threading.Thread(target=worker, args=(app, deadline, write_ratio, results)) for _ in range(threads)]
+        for thread in workers:
+            thread.start()
+        for thread in workers:
+            thread.join()
+        with app.app_context():
+            db.engine.dispose()
+    reads, writes, locked = (sum(values) for values in zip(*results))
+    print(f"{name:>8} | {reads / duration:>10.1f} {writes / duration:>11.1f} {locked:>8}")
+
+def main():
+    threads = int(sys.argv[1]) if len(sys.argv) > 1 else 8
+    duration = float(sys.argv[2]) if len(sys.argv) > 2 else 5.0
+    write_ratio = float(sys.argv[3]) if len(sys.argv) > 3 else 0.2
+    random.seed(0)
+    print(f"threads={threads}, duration={duration}s, write_ratio={write_ratio}")
+    print(f"{'profile':>8} | {'reads/s':>10} {'writes/s':>11} {'locked':>8}")
+    for name in PROFILES:
+        run_profile(name, threads, duration, write_ratio)
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,108 @@
+"""
+전체 리더보드(상위 K명, 사용자 순위, 백분위) 조회 비용을 사용자 수(기본 100만 명)에서 측정합니다.
+
+- sql: 요청마다 일별 롤업 전체를 사용자별로 집계하는 방식 (GROUP BY 후 정렬/COUNT)
+- index: 메모리 순위 인덱스 (global_leaderboard, 펜윅 트리 기반)
+
+인덱스 재구성 시간과, 운동 기록 변경 시의 증분 갱신 비용도 함께 출력합니다.
+
+실행: python benchmarks/bench_global_leaderboard.py [--users 1000000]
+"""
+import argparse
+import random
+import time
+from datetime import date, timedelta
+
+from sqlalchemy import func
+
+from common import make_app, timed
+from src.models.user import db, User
+from src.models.daily_exercise_rollup import DailyExerciseRollup
+from src.utils.global_leaderboard import global_leaderboard
+from src.utils.scores import DEFAULT_SCORE_WINDOW, window_start
+
+CHUNK_SIZE = 50_000
+ACTIVE_RATIO = 0.7
+EXERCISE_TYPES = ['러닝', '수영', '요가', '웨이트', '사이클', '등산']
+CALLS = 1_000
+
+def seed(user_count):
+    """사용자와, 활동 사용자별로 최근 7일 중 1-4일의 일별 롤업을 만듭니다."""
+    today = date.today()
+    for start in range(1, user_count + 1, CHUNK_SIZE):
+        uids = range(start, min(start + CHUNK_SIZE, user_count + 1))
+        db.session.execute(User.__table__.insert(), [
+            {'id': uid, 'username': f'user{uid}', 'email': f'user{uid}@example.com'} for uid in uids
+        ])
+        rollups = []
+        for uid in uids:
+            if random.random() >= ACTIVE_RATIO:
+                continue
+            for day in random.sample(range(DEFAULT_SCORE_WINDOW), random.randint(1, 4)):
+                intensity = random.randint(0, 10)
+                counts = [0] * 11
+                counts[intensity] = 1
+                rollups.append({
+                    'user_id': uid, 'date': today - timedelta(days=day), 'workout_count': 1,
+                    'intensity_sum': intensity, 'intensity_max': intensity, 'intensity_counts': counts,
+                    'time_of_day_counts': {'오전': 1}, 'exercise_type_counts': {random.choice(EXERCISE_TYPES): 1}
+                })
+        db.session.execute(DailyExerciseRollup.__table__.insert(), rollups)
+    db.session.commit()
+
+def window_sums():
+    today = date.today()
+    score = func.sum(DailyExerciseRollup.intensity_sum)
+    return db.session.query(DailyExerciseRollup.user_id, score.label('score')).filter(
+        DailyExerciseRollup.date.between(window_start(DEFAULT_SCORE_WINDOW, today), today)
+    ).group_by(DailyExerciseRollup.user_id)
+
+def sql_top(limit=10):
+    sums = window_sums().subquery()
+    return db.session.query(sums.c.user_id, sums.c.score).order_by(sums.c.score.desc(), sums.c.user_id).limit(limit).all()
+
+def sql_rank(user_id):
+    sums = window_sums().subquery()
+    mine = db.session.query(sums.c.score).filter(sums.c.user_id == user_id).scalar_subquery()
+    return db.session.query(func.count()).select_from(sums).filter(sums.c.score > mine).scalar() + 1
+
+def per_call_us(call, calls=CALLS):
+    started = time.perf_counter()
+    for _ in range(calls):
+        call()
+    return (time.perf_counter() - started) / calls * 1_000_000
+
+def main():
+    parser = argparse.ArgumentParser(description='전체 리더보드 벤치마크')
+    parser.add_argument('--users', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    random.seed(0)
+    app = make_app()
+    with app.app_context():
+        seed(args.users)
+        rebuild_ms, _ = timed(global_leaderboard.rebuild, repeat=1)
+        stats = global_leaderboard.stats()
+        print(f"users={args.users:,} participants={stats['participants']:,} cohorts={stats['cohorts']}")
+        print(f"index rebuild: {rebuild_ms:.0f} ms")
+
+        sample_ids = [random.randint(1, args.users) for _ in range(CALLS)]
+        ids = iter(sample_ids * 2)
+
+        sql_top_ms, _ = timed(sql_top, repeat=1)
+        sql_rank_ms, _ = timed(lambda: sql_rank(sample_ids[0]), repeat=1)
+        print(f"\n{'operation':>22} | {'sql ms':>8} | {'index us':>9}")
+        print(f"{'top 10':>22} | {sql_top_ms:>8.1f} | {per_call_us(lambda: global_leaderboard.top(10)):>9.1f}")
+        print(f"{'rank + percentile':>22} | {sql_rank_ms:>8.1f} | "
+              f"{per_call_us(lambda: global_leaderboard.user_rank(next(ids))):>9.1f}")
+        print(f"{'cohort top 10':>22} | {'-':>8} | "
+              f"{per_call_us(lambda: global_leaderboard.top(10, exercise_type='러닝')):>9.1f}")
+        print(f"{'top 10 @ offset 10000':>22} | {'-':>8} | "
+              f"{per_call_us(lambda: global_leaderboard.top(10, offset=10_000), calls=100):>9.1f}")
+
+        # 증분 갱신: 기록 변경 후 사용자 한 명의 롤업을 다시 읽어 인덱스에 반영 (쿼리 2회 포함)
+        refresh_us = per_call_us(lambda: global_leaderboard.refresh_users([random.randint(1, args.users)]), calls=200)
+        print(f"\nincremental refresh (per user, incl. queries): {refresh_us:.1f} us")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,103 @@
+"""
+친구 수에 따른 리더보드 계산 비용을 측정합니다.
+
+기존 방식(친구마다 User.query.get + 주간 점수 SUM 쿼리, 2N+1 회)과
+리더보드 엔진(참가자 조회 + 캐시에 없는 점수의 집계 쿼리)의 쿼리 수와 지연 시간을 비교합니다.
+엔진은 점수 캐시가 빈 경우(cold)와 채워진 경우(warm)를 함께 측정합니다.
+
+실행: python benchmarks/bench_leaderboard.py
+"""
+import random
+from datetime import datetime, timedelta
+
+from sqlalchemy import func
+
+from common import make_app, count_queries, timed
+from src.models.user import db, User
+from src.models.exercise_record import ExerciseRecord
+from src.models.friendship import Friendship
+from src.utils.cache import get_weekly_score_cache
+from src.utils.catalog import encode_record_values, exercise_type_catalog
+from src.utils.friend_queries import rebuild_friend_edges
+from src.utils.leaderboard import build_leaderboard
+from src.utils.rollup import rebuild_rollups
+
+FRIEND_COUNTS = [10, 100, 1000, 5000]
+RECORDS_PER_USER = 5
+
+def seed(friend_count):
+    """사용자 1명과 friend_count 명의 친구, 친구별 운동 기록을 생성합니다."""
+    db.drop_all()
+    db.create_all()
+    exercise_type_catalog.clear()
+    get_weekly_score_cache().clear()
+    now = datetime.utcnow()
+    user_count = friend_count + 1
+
+    db.session.execute(User.__table__.insert(), [
+        {'id': uid, 'username': f'user{uid}', 'email': f'user{uid}@example.com'}
+        for uid in range(1, user_count + 1)
+    ])
+    db.session.execute(Friendship.__table__.insert(), [
+        {'user_id': 1, 'friend_id': uid, 'status': 'accepted'} if uid % 2 else
+        {'user_id': uid, 'friend_id': 1, 'status': 'accepted'}
+        for uid in range(2, user_count + 1)
+    ])
+    db.session.execute(ExerciseRecord.__table__.insert(), encode_record_values([
+        {
+            'user_id': uid,
+            'date': (now - timedelta(days=day)).date(),
+            'time_of_day': '오전',
+            'intensity': random.randint(0, 10),
+            'exercise_type': '러닝',
+            'created_at': now - timedelta(days=day)
+        }
+        for uid in range(1, user_count + 1)
+        for day in range(RECORDS_PER_USER)
+    ]))
+    db.session.commit()
+    rebuild_friend_edges()
+    rebuild_rollups()
+
+def legacy_leaderboard(user_id):
+    """기존 get_leaderboard 구현 (친구마다 쿼리 2회, created_at 기준 최근 7일)"""
+    friendships = db.session.query(Friendship).filter(
+        ((Friendship.user_id == user_id) | (Friendship.friend_id == user_id)) &
+        (Friendship.status == 'accepted')
+    ).all()
+    friend_ids = [f.friend_id if f.user_id == user_id else f.user_id for f in friendships]
+    week_ago = datetime.now() - timedelta(days=7)
+    leaderboard = []
+    for uid in [user_id] + friend_ids:
+        user = db.session.get(User, uid)
+        if user:
+            leaderboard.append({'user_id': uid, 'username': user.username,
+                                'weekly_score': db.session.query(func.sum(ExerciseRecord.intensity)).filter(
+                                    ExerciseRecord.user_id == uid, ExerciseRecord.created_at >= week_ago
+                                ).scalar() or 0})
+    leaderboard.sort(key=lambda x: x['weekly_score'], reverse=True)
+    return leaderboard
+
+def measure(call):
+    db.session.expire_all()
+    with count_queries() as counter:
+        call()
+    elapsed, _ = timed(lambda: (db.session.expire_all(), call()))
+    return counter.count, elapsed
+
+def main():
+    random.seed(0)
+    app = make_app()
+    print(f"{'friends':>8} | {'legacy queries':>14} {'legacy ms':>10} | {'cold queries':>12} {'cold ms':>8} | "
+          f"{'warm queries':>12} {'warm ms':>8}")
+    with app.app_context():
+        for friend_count in FRIEND_COUNTS:
+            seed(friend_count)
+            legacy_queries, legacy_ms = measure(lambda: legacy_leaderboard(1))
+            cold_queries, cold_ms = measure(lambda: (get_weekly_score_cache().clear(), build_leaderboard(1)))
+            warm_queries, warm_ms = measure(lambda: build_leaderboard(1))
+            print(f"{friend_count:>8} | {legacy_queries:>14} {legacy_ms:>10.1f} | {cold_queries:>12} {cold_ms:>8.1f} | "
+                  f"{warm_queries:>12} {warm_ms:>8.1f}")
+
+if __name__ == '__main__':
+    main()
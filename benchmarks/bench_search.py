@@ -0,0 +1,98 @@
+"""
+운동 기록 검색 비용을 기록 수(기본 100만 건)에서 측정합니다.
+
+- ilike: 기존 방식 (운동 종류/memo에 '%검색어%' ILIKE, 인덱스를 사용할 수 없는 전체 스캔)
+- fts: FTS5 trigram 색인 + bm25 관련도 정렬 (search_records)
+
+전체 검색과 사용자 한 명으로 범위를 좁힌 검색을 모두 측정합니다.
+
+실행: python benchmarks/bench_search.py [--rows 1000000]
+"""
+import argparse
+import os
+import random
+import tempfile
+from datetime import datetime, timedelta
+
+from sqlalchemy import or_
+
+from common import make_app, timed
+from src.models.user import db, User
+from src.models.exercise_record import ExerciseRecord
+from src.utils.catalog import encode_record_values
+from src.utils.search import ensure_search_index, matching_type_ids, search_records
+
+USER_COUNT = 1_000
+CHUNK_SIZE = 50_000
+LIMIT = 50
+EXERCISE_TYPES = ['러닝', '수영', '요가', '웨이트 트레이닝', '사이클', '등산', '필라테스', '크로스핏']
+MEMO_PHRASES = [
+    '한강에서 가볍게 {n}km', '하체 스쿼트 {n}세트', '상체 벤치프레스 {n}세트', '자유형 {n}바퀴',
+    '아침 스트레칭 {n}분', '인터벌 트레이닝 {n}회', '북한산 등산 {n}시간', None
+]
+# (검색어, 사용자 범위 여부)
+QUERIES = [
+    ('웨이트', False),
+    ('스쿼트', False),
+    ('벤치프레스', False),
+    ('하체 스쿼트', False),
+    ('트레이닝', True),
+    ('러닝', True)
+]
+
+def seed(rows):
+    today = datetime.utcnow().date()
+    db.session.execute(User.__table__.insert(), [
+        {'id': uid, 'username': f'user{uid}', 'email': f'user{uid}@example.com'} for uid in range(1, USER_COUNT + 1)
+    ])
+    for start in range(0, rows, CHUNK_SIZE):
+        batch = []
+        for _ in range(min(CHUNK_SIZE, rows - start)):
+            phrase = random.choice(MEMO_PHRASES)
+            batch.append({
+                'user_id': random.randint(1, USER_COUNT),
+                'date': today - timedelta(days=random.randrange(365)),
+                'time_of_day': '오전',
+                'intensity': random.randint(0, 10),
+                'exercise_type': random.choice(EXERCISE_TYPES),
+                'memo': phrase.format(n=random.randint(1, 20)) if phrase else None
+            })
+        db.session.execute(ExerciseRecord.__table__.insert(), encode_record_values(batch))
+    db.session.commit()
+
+def ilike_search(query_text, user_id=None):
+    """기존 방식: 검색어마다 운동 종류/memo ILIKE, 최신순"""
+    query = ExerciseRecord.query
+    if user_id is not None:
+        query = query.filter(ExerciseRecord.user_id == user_id)
+    for term in query_text.split():
+        query = query.filter(or_(
+            ExerciseRecord.exercise_type_id.in_(matching_type_ids(term)),
+            ExerciseRecord.memo.ilike(f'%{term}%')
+        ))
+    return query.order_by(ExerciseRecord.created_at.desc()).limit(LIMIT).all()
+
+def main():
+    parser = argparse.ArgumentParser(description='운동 기록 검색 벤치마크')
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    random.seed(0)
+    with tempfile.TemporaryDirectory() as directory:
+        app = make_app(f"sqlite:///{os.path.join(directory, 'search.db')}")
+        with app.app_context():
+            if not ensure_search_index():
+                raise SystemExit('이 SQLite 빌드는 FTS5 trigram 토크나이저를 지원하지 않습니다.')
+            seed(args.rows)
+
+            print(f"rows={args.rows:,}")
+            print(f"{'query':>12} | {'scope':>5} | {'ilike ms':>9} | {'fts ms':>8} | {'hits':>4}")
+            for query_text, scoped in QUERIES:
+                user_id = 1 if scoped else None
+                ilike_ms, _ = timed(lambda: ilike_search(query_text, user_id), repeat=3)
+                fts_ms, hits = timed(lambda: search_records(query_text, user_id=user_id, limit=LIMIT), repeat=3)
+                scope = 'user' if scoped else 'all'
+                print(f"{query_text:>12} | {scope:>5} | {ilike_ms:>9.1f} | {fts_ms:>8.1f} | {len(hits):>4}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,74 @@
+"""
+운동 기록 목록 응답의 직렬화 처리량(records/sec)을 측정합니다.
+
+- orm + to_dict + json: 기존 방식 (ORM 객체 생성 → to_dict → 표준 json)
+- projected + json: 필요한 컬럼만 조회 (project_records) → 표준 json
+- projected + orjson: 필요한 컬럼만 조회 → orjson (설치된 경우)
+
+조회부터 JSON 문자열 생성까지의 시간을 포함합니다.
+
+실행: python benchmarks/bench_serialization.py
+"""
+import json
+import random
+from datetime import datetime, timedelta
+
+from common import make_app, timed
+from src.models.user import db, User
+from src.models.exercise_record import ExerciseRecord
+from src.utils import serialization
+from src.utils.catalog import encode_record_values
+from src.utils.serialization import dumps, project_records, record_row_to_dict
+
+RECORD_COUNT = 10_000
+
+def seed():
+    now = datetime.utcnow()
+    db.session.execute(User.__table__.insert(), [{'id': 1, 'username': 'user1', 'email': 'user1@example.com'}])
+    db.session.execute(ExerciseRecord.__table__.insert(), encode_record_values([
+        {
+            'user_id': 1,
+            'date': (now - timedelta(days=i % 365)).date(),
+            'time_of_day': random.choice(['오전', '오후', '야간']),
+            'intensity': random.randint(0, 10),
+            'exercise_type': random.choice(['러닝', '수영', '요가']),
+            'memo': '가볍게 운동했습니다',
+            'created_at': now - timedelta(minutes=i),
+            'updated_at': now - timedelta(minutes=i)
+        }
+        for i in range(RECORD_COUNT)
+    ]))
+    db.session.commit()
+
+def orm_to_dict_json():
+    db.session.expunge_all()
+    records = ExerciseRecord.query.order_by(ExerciseRecord.created_at.desc()).all()
+    return json.dumps([record.to_dict() for record in records], ensure_ascii=False)
+
+def projected(use_orjson):
+    def run():
+        query = project_records(ExerciseRecord.query.order_by(ExerciseRecord.created_at.desc()))
+        return dumps([record_row_to_dict(row) for row in query.all()], use_orjson=use_orjson)
+    return run
+
+def main():
+    random.seed(0)
+    app = make_app()
+    cases = [
+        ('orm + to_dict + json', orm_to_dict_json),
+        ('projected + json', projected(False))
+    ]
+    if serialization.orjson is not None:
+        cases.append(('projected + orjson', projected(True)))
+    else:
+        print("orjson이 설치되지 않아 orjson 경로는 건너뜁니다.")
+
+    with app.app_context():
+        seed()
+        print(f"{'path':>22} | {'ms':>8} | {'records/sec':>12}")
+        for name, func in cases:
+            elapsed, _ = timed(func)
+            print(f"{name:>22} | {elapsed:8.1f} | {RECORD_COUNT / (elapsed / 1000):12,.0f}")
+
+if __name__ == '__main__':
+    main()
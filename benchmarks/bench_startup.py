@@ -0,0 +1,108 @@
+"""
+워커 콜드 스타트 시간(`import main` + `create_app()`)을 측정합니다.
+
+새 Python 프로세스를 `-X importtime`으로 여러 번 실행하여 다음을 보고합니다.
+
+- 프로세스 전체 시간, import 시간 합계, create_app() 실행 시간 (최솟값/중앙값)
+- 누적 import 시간이 가장 큰 최상위 모듈
+
+CI에서 추적할 수 있도록 `--json`으로 기계가 읽을 수 있는 결과를 출력하고,
+`--max-ms`를 지정하면 중앙값이 이를 넘을 때 종료 코드 1로 실패합니다.
+
+실행: python benchmarks/bench_startup.py [--repeat 5] [--json] [--max-ms 1500]
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STARTUP_CODE = (
+    "import time; started = time.perf_counter(); "
+    "import main; imported = time.perf_counter(); "
+    "main.create_app(); "
+    "print(f'{(imported - started) * 1000:.3f} {(time.perf_counter() - imported) * 1000:.3f}')"
+)
+
+def parse_importtime(stderr):
+    """
+    `-X importtime` 출력에서 (import 시간 합계 ms, {최상위 모듈: 누적 ms})를 구합니다.
+
+    출력 형식: 'import time: <self us> | <cumulative us> | <들여쓰기><모듈 이름>'
+    들여쓰기가 없는 줄이 최상위 import입니다.
+    """
+    total_us = 0
+    top_level = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, name = line[len('import time:'):].split('|', 2)
+        total_us += int(self_us)
+        if not name.startswith('  '):
+            module = name.strip()
+            top_level[module] = top_level.get(module, 0) + int(cumulative_us) / 1000
+    return total_us / 1000, top_level
+
+def measure_once(env):
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', STARTUP_CODE],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    wall_ms = (time.perf_counter() - started) * 1000
+    import_main_ms, create_app_ms = (float(value) for value in result.stdout.split()[-2:])
+    import_total_ms, top_level = parse_importtime(result.stderr)
+    return {
+        'wall_ms': wall_ms,
+        'import_main_ms': import_main_ms,
+        'create_app_ms': create_app_ms,
+        'import_total_ms': import_total_ms,
+        'top_level': top_level
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='워커 콜드 스타트 시간 측정')
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--top', type=int, default=10, help='출력할 최상위 모듈 수')
+    parser.add_argument('--json', action='store_true', help='결과를 JSON으로 출력합니다.')
+    parser.add_argument('--max-ms', type=float, default=None, help='프로세스 전체 시간 중앙값 상한 (ms)')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(
+            os.environ,
+            DATABASE_URL=f"sqlite:///{os.path.join(directory, 'startup.db')}",
+            GLOBAL_STATS_BACKGROUND_REFRESH='false',
+            INSTRUMENTATION_ENABLED='false'
+        )
+        runs = [measure_once(env) for _ in range(args.repeat)]
+
+    summary = {}
+    for key in ('wall_ms', 'import_main_ms', 'create_app_ms', 'import_total_ms'):
+        values = [run[key] for run in runs]
+        summary[key] = {'min': round(min(values), 1), 'median': round(statistics.median(values), 1)}
+    # 마지막 실행 기준 누적 import 시간이 큰 최상위 모듈 (첫 실행은 .pyc 생성 비용이 섞일 수 있음)
+    slowest = sorted(runs[-1]['top_level'].items(), key=lambda item: item[1], reverse=True)[:args.top]
+    summary['slowest_imports'] = [{'module': module, 'cumulative_ms': round(ms, 1)} for module, ms in slowest]
+
+    if args.json:
+        print(json.dumps(summary, ensure_ascii=False, indent=2))
+    else:
+        print(f"{'metric':>16} | {'min ms':>8} | {'median ms':>9}")
+        for key in ('wall_ms', 'import_main_ms', 'create_app_ms', 'import_total_ms'):
+            print(f"{key:>16} | {summary[key]['min']:8.1f} | {summary[key]['median']:9.1f}")
+        print()
+        print(f"{'module':>40} | {'cumulative ms':>13}")
+        for entry in summary['slowest_imports']:
+            print(f"{entry['module']:>40} | {entry['cumulative_ms']:13.1f}")
+
+    if args.max_ms is not None and summary['wall_ms']['median'] > args.max_ms:
+        print(f"시작 시간 중앙값 {summary['wall_ms']['median']}ms가 상한 {args.max_ms}ms를 넘었습니다.", file=sys.stderr)
+        sys.exit(1)
+
+if __name__ == '__main__':
+    main()
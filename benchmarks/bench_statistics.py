@@ -0,0 +1,86 @@
+"""
+운동 기록 수(1만~100만 건)에 따른 통계 계산 비용을 측정합니다.
+
+- legacy: 기존 get_user_statistics/compare_with_friend 방식 (날짜마다 전체 기록 재탐색)
+- rollup: 일별 롤업(최대 365행)에서 daily_series로 계산 (실제 API 경로)
+
+데이터베이스 없이 메모리의 합성 데이터로 계산 부분만 비교합니다.
+
+실행: python benchmarks/bench_statistics.py
+"""
+import random
+from collections import namedtuple
+from datetime import date, timedelta
+
+from common import timed
+from src.utils.stats_core import daily_series
+
+HISTORY_SIZES = [10_000, 100_000, 1_000_000]
+PERIOD_DAYS = 365
+TIMES_OF_DAY = ['오전', '오후', '야간', '틈틈이']
+EXERCISE_TYPES = ['러닝', '수영', '요가', '웨이트', '사이클', '등산']
+
+Record = namedtuple('Record', 'date intensity time_of_day exercise_type')
+Rollup = namedtuple('Rollup', 'date workout_count intensity_sum')
+
+def make_records(size, today):
+    return [
+        Record(
+            today - timedelta(days=random.randrange(PERIOD_DAYS)),
+            random.randint(0, 10),
+            random.choice(TIMES_OF_DAY),
+            random.choice(EXERCISE_TYPES)
+        )
+        for _ in range(size)
+    ]
+
+def legacy_statistics(records, today):
+    """기존 구현과 같은 방식의 Python 루프 집계 (일별 추이 7일 + 비교 30일)"""
+    intensities = [r.intensity for r in records]
+    result = {
+        'total': len(records),
+        'average': sum(intensities) / len(intensities),
+        'max': max(intensities),
+        'time_of_day': {},
+        'exercise_type': {}
+    }
+    for r in records:
+        result['time_of_day'][r.time_of_day] = result['time_of_day'].get(r.time_of_day, 0) + 1
+        result['exercise_type'][r.exercise_type] = result['exercise_type'].get(r.exercise_type, 0) + 1
+    for days in (7, 30):
+        for i in range(days):
+            day = today - timedelta(days=days - 1 - i)
+            day_records = [r for r in records if r.date == day]
+            if day_records:
+                sum(r.intensity for r in day_records) / len(day_records)
+    return result
+
+def to_rollups(records):
+    days = {}
+    for r in records:
+        count, total = days.get(r.date, (0, 0))
+        days[r.date] = (count + 1, total + r.intensity)
+    return [Rollup(day, count, total) for day, (count, total) in days.items()]
+
+def rollup_statistics(rollups, today):
+    ordinals = [r.date.toordinal() for r in rollups]
+    sums = [r.intensity_sum for r in rollups]
+    counts = [r.workout_count for r in rollups]
+    for days in (7, 30, PERIOD_DAYS):
+        daily_series(ordinals, sums, today - timedelta(days=days - 1), days, workout_counts=counts)
+
+def main():
+    random.seed(0)
+    today = date.today()
+    print(f"{'records':>10} | {'legacy ms':>10} {'rollup ms':>10}")
+    for size in HISTORY_SIZES:
+        records = make_records(size, today)
+        rollups = to_rollups(records)
+
+        repeat = 1 if size >= 1_000_000 else 3
+        legacy_ms, _ = timed(lambda: legacy_statistics(records, today), repeat=repeat)
+        rollup_ms, _ = timed(lambda: rollup_statistics(rollups, today))
+        print(f"{size:>10} | {legacy_ms:>10.1f} {rollup_ms:>10.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,119 @@
+"""
+합성 친구 그래프에서 친구 추천("알 수도 있는 사람") 계산 비용을 측정합니다.
+
+사용자 USER_COUNT명 중 대상 사용자(1번)에게 친구 F명을, 그 친구들에게 각각 FRIENDS_OF_FRIEND명의
+무작위 친구를 만들어 2촌 연결이 수천 개인 그래프를 구성한 뒤 다음을 비교합니다.
+
+- legacy: friendships 테이블을 친구마다 양방향 OR로 조회하여 Python에서 공통 친구 수를 세는 방식
+- mutual: friend_edges 자기 조인 집계 한 번 (캐시 없음)
+- weighted: mutual + 후보들의 운동 종류 분포 유사도 보정 (캐시 없음)
+- cached: 캐시에 저장된 추천 목록 조회
+
+목표: 캐시 없는 계산도 2촌 연결 수천 개에서 50ms 미만.
+
+실행: python benchmarks/bench_suggestions.py
+"""
+import random
+from collections import Counter
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from common import make_app, count_queries, timed
+from src.models.user import db, User
+from src.models.exercise_record import ExerciseRecord
+from src.models.friendship import Friendship
+from src.models.friend_edge import FriendEdge
+from src.utils.cache import invalidate_suggestions
+from src.utils.catalog import encode_record_values, exercise_type_catalog
+from src.utils.friend_queries import rebuild_friend_edges
+from src.utils.suggestions import compute_suggestions, get_suggestions
+
+USER_COUNT = 20_000
+FRIEND_COUNTS = [50, 200, 500]
+FRIENDS_OF_FRIEND = 30
+RECORDS_PER_USER = 5
+EXERCISE_TYPES = ['러닝', '수영', '요가', '웨이트', '사이클', '등산']
+TARGET_MS = 50
+
+def seed(friend_count):
+    """대상 사용자(1번)의 친구 friend_count명과, 친구마다 FRIENDS_OF_FRIEND명의 친구를 만듭니다."""
+    db.drop_all()
+    db.create_all()
+    exercise_type_catalog.clear()
+    today = datetime.utcnow().date()
+    db.session.execute(User.__table__.insert(), [
+        {'id': uid, 'username': f'user{uid}', 'email': f'user{uid}@example.com'}
+        for uid in range(1, USER_COUNT + 1)
+    ])
+
+    pairs = set()
+    friends = random.sample(range(2, USER_COUNT + 1), friend_count)
+    for friend_id in friends:
+        pairs.add((1, friend_id))
+        for other_id in random.sample(range(2, USER_COUNT + 1), FRIENDS_OF_FRIEND):
+            if other_id != friend_id:
+                pairs.add((min(friend_id, other_id), max(friend_id, other_id)))
+    db.session.execute(Friendship.__table__.insert(), [
+        {'user_id': a, 'friend_id': b, 'status': 'accepted'} for a, b in pairs
+    ])
+
+    participants = {1} | {uid for pair in pairs for uid in pair}
+    db.session.execute(ExerciseRecord.__table__.insert(), encode_record_values([
+        {'user_id': uid, 'date': today - timedelta(days=random.randrange(60)), 'time_of_day': '오전',
+         'intensity': random.randint(0, 10), 'exercise_type': random.choice(EXERCISE_TYPES)}
+        for uid in participants for _ in range(RECORDS_PER_USER)
+    ]))
+    db.session.commit()
+    rebuild_friend_edges()
+
+def legacy_suggestions(user_id, limit=10):
+    """친구마다 양방향 OR 조회로 친구 목록을 구해 Python에서 공통 친구 수를 세는 방식"""
+    def friends_of(uid):
+        rows = db.session.query(Friendship.user_id, Friendship.friend_id).filter(
+            ((Friendship.user_id == uid) | (Friendship.friend_id == uid)) & (Friendship.status == 'accepted')
+        ).all()
+        return {b if a == uid else a for a, b in rows}
+
+    my_friends = friends_of(user_id)
+    mutual = Counter()
+    for friend_id in my_friends:
+        mutual.update(friends_of(friend_id) - my_friends - {user_id})
+    return mutual.most_common(limit)
+
+def second_degree_links(user_id):
+    """대상 사용자의 (친구 → 친구의 친구) 경로 수 (본인으로 돌아오는 경로 제외)"""
+    friend_ids = select(FriendEdge.friend_id).where(FriendEdge.user_id == user_id)
+    return db.session.query(func.count()).select_from(FriendEdge).filter(
+        FriendEdge.user_id.in_(friend_ids), FriendEdge.friend_id != user_id
+    ).scalar()
+
+def measure(call):
+    with count_queries() as counter:
+        call()
+    elapsed, _ = timed(call)
+    return counter.count, elapsed
+
+def main():
+    random.seed(0)
+    app = make_app()
+    print(f"{'friends':>8} | {'2nd-degree':>10} | {'path':>8} | {'queries':>7} | {'ms':>8}")
+    with app.app_context():
+        for friend_count in FRIEND_COUNTS:
+            seed(friend_count)
+            links = second_degree_links(1)
+            invalidate_suggestions([1])
+            get_suggestions(1)
+            cases = [
+                ('legacy', lambda: legacy_suggestions(1)),
+                ('mutual', lambda: compute_suggestions(1)),
+                ('weighted', lambda: compute_suggestions(1, weighted=True)),
+                ('cached', lambda: get_suggestions(1))
+            ]
+            for name, call in cases:
+                queries, elapsed = measure(call)
+                flag = ' (목표 초과)' if name in ('mutual', 'weighted') and elapsed > TARGET_MS else ''
+                print(f"{friend_count:>8} | {links:>10} | {name:>8} | {queries:>7} | {elapsed:>8.1f}{flag}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+요청 본문 검증 처리량(validations/sec)을 측정합니다.
+
+- legacy exercise: 기존 exercise.py 방식 (json.loads + 수작업 검증 + datetime.strptime)
+- legacy validate_with: 기존 validate_with 방식 (json.loads + 요청마다 스키마(**data) 생성)
+- adapter: 한 번 만든 TypeAdapter로 JSON에서 바로 검증 (validate_json)
+- bulk: 1,000행 배열을 행마다 검증 vs validate_rows (list 어댑터 한 번)
+- date: datetime.strptime vs parse_iso_date
+
+실행: python benchmarks/bench_validation.py
+"""
+import json
+from datetime import datetime
+
+from common import timed
+from src.utils.validation import get_adapter, parse_iso_date, resolve_schema, validate_rows
+
+ITERATIONS = 20_000
+BULK_ROWS = 1_000
+
+EXERCISE_BODY = json.dumps({
+    'user_id': 1, 'date': '2024-05-01', 'time_of_day': '오전', 'intensity': 7,
+    'exercise_type': '러닝', 'memo': '가볍게 5km', 'client_key': 'watch-0001'
+}, ensure_ascii=False).encode('utf-8')
+FRIEND_BODY = json.dumps({'user_id': 1, 'friend_username': 'runner42'}).encode('utf-8')
+
+def legacy_parse_exercise_payload(data):
+    """기존 exercise.py의 수작업 검증"""
+    for field in ('user_id', 'date', 'time_of_day', 'intensity', 'exercise_type'):
+        if field not in data:
+            raise ValueError(f'{field}는 필수 필드입니다.')
+    intensity = data['intensity']
+    if isinstance(intensity, bool) or not isinstance(intensity, int) or not (0 <= intensity <= 10):
+        raise ValueError('운동 강도는 0-10 사이의 값이어야 합니다.')
+    exercise_date = datetime.strptime(data['date'], '%Y-%m-%d').date()
+    return dict(data, date=exercise_date)
+
+def rate(func, iterations):
+    elapsed, _ = timed(lambda: [func() for _ in range(iterations)], repeat=3)
+    return iterations / (elapsed / 1000)
+
+def main():
+    exercise_schema = resolve_schema('ExerciseRecordSchema')
+    friend_schema = resolve_schema('FriendRequestSchema')
+    exercise_adapter = get_adapter('ExerciseRecordSchema')
+    friend_adapter = get_adapter('FriendRequestSchema')
+
+    rows = [json.loads(EXERCISE_BODY) for _ in range(BULK_ROWS)]
+    cases = [
+        ('exercise', 'legacy exercise', lambda: legacy_parse_exercise_payload(json.loads(EXERCISE_BODY)), ITERATIONS),
+        ('exercise', 'legacy validate_with', lambda: exercise_schema(**json.loads(EXERCISE_BODY)), ITERATIONS),
+        ('exercise', 'adapter', lambda: exercise_adapter.validate_json(EXERCISE_BODY), ITERATIONS),
+        ('friend', 'legacy validate_with', lambda: friend_schema(**json.loads(FRIEND_BODY)), ITERATIONS),
+        ('friend', 'adapter', lambda: friend_adapter.validate_json(FRIEND_BODY), ITERATIONS),
+        ('bulk rows', 'legacy per row', lambda: [legacy_parse_exercise_payload(row) for row in rows], 20),
+        ('bulk rows', 'validate_rows', lambda: validate_rows('ExerciseRecordSchema', rows), 20),
+        ('date', 'strptime', lambda: datetime.strptime('2024-05-01', '%Y-%m-%d').date(), ITERATIONS),
+        ('date', 'parse_iso_date', lambda: parse_iso_date('2024-05-01'), ITERATIONS)
+    ]
+
+    print(f"{'payload':>10} | {'path':>22} | {'validations/sec':>16}")
+    for payload, name, func, iterations in cases:
+        per_call = BULK_ROWS if payload == 'bulk rows' else 1
+        print(f"{payload:>10} | {name:>22} | {rate(func, iterations) * per_call:16,.0f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+벤치마크 스크립트에서 공통으로 사용하는 헬퍼 모음입니다.
+
+각 벤치마크는 프로젝트 루트에서 `python benchmarks/<스크립트>.py` 형태로 실행합니다.
+"""
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import event
+from src.models.user import db
+from src.utils.db_profile import init_db_profile
+
+def make_app(database_uri='sqlite://', **config):
+    """
+    벤치마크용 Flask 앱을 생성하고 스키마를 만듭니다.
+
+    Args:
+        database_uri: 사용할 데이터베이스 URI. 기본값은 인메모리 SQLite입니다.
+        **config: 추가로 적용할 앱 설정 (예: SQLITE_PRAGMAS, SQLALCHEMY_ENGINE_OPTIONS).
+
+    Returns:
+        Flask: 데이터베이스가 초기화된 Flask 앱.
+    """
+    import src.models.exercise_type  # noqa: F401 (테이블 등록)
+    import src.models.exercise_record  # noqa: F401
+    import src.models.exercise_record_deletion  # noqa: F401
+    import src.models.friendship  # noqa: F401
+    import src.models.friend_edge  # noqa: F401
+    import src.models.daily_exercise_rollup  # noqa: F401
+
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = database_uri
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config.update(config)
+    db.init_app(app)
+    init_db_profile(app)
+    with app.app_context():
+        db.create_all()
+    return app
+
+class QueryCounter:
+    """`count_queries` 블록 안에서 실행된 SQL 문 수를 담는 객체"""
+
+    def __init__(self):
+        self.count = 0
+
+@contextmanager
+def count_queries():
+    """
+    블록 안에서 실행된 SQL 문 수를 셉니다. 앱 컨텍스트 안에서 사용해야 합니다.
+
+    Yields:
+        QueryCounter: 블록 종료 후 `count` 속성에 실행된 문장 수가 담깁니다.
+    """
+    counter = QueryCounter()
+
+    def _before_cursor_execute(*args, **kwargs):
+        counter.count += 1
+
+    event.listen(db.engine, 'before_cursor_execute', _before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', _before_cursor_execute)
+
+def timed(func, repeat=5):
+    """
+    함수를 여러 번 실행하여 가장 빠른 실행 시간(ms)과 마지막 결과를 반환합니다.
+
+    Args:
+        func: 인자 없이 호출할 함수.
+        repeat: 반복 횟수.
+
+    Returns:
+        tuple: (최소 실행 시간(ms), 마지막 반환값).
+    """
+    best = float('inf')
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, (time.perf_counter() - started) * 1000)
+    return best, result
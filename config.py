@@ -12,9 +12,76 @@ class Config:
     BASE_DIR = os.path.abspath(os.path.dirname(__file__))
     DATABASE_DIR = os.path.join(BASE_DIR, 'database')
 
-    # 데이터베이스 디렉토리가 없으면 생성
-    if not os.path.exists(DATABASE_DIR):
-        os.makedirs(DATABASE_DIR)
+    # 데이터베이스 디렉토리는 `flask --app main init-db` 실행 시 생성됩니다 (설정 로딩 시 파일 시스템 접근 없음).
 
-    SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(DATABASE_DIR, 'app.db')}"
+    SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or f"sqlite:///{os.path.join(DATABASE_DIR, 'app.db')}"
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+
+    # 읽기 전용 데이터베이스 (선택). 설정하면 통계, 기록 목록, 리더보드 조회가 이 연결을 사용합니다.
+    READ_DATABASE_URL = os.environ.get('READ_DATABASE_URL')
+    SQLALCHEMY_BINDS = {'read': READ_DATABASE_URL} if READ_DATABASE_URL else {}
+
+    # 데이터베이스 프로필: 'tuned'(WAL 등 동시성 튜닝, 기본값) 또는 'default'(SQLite 기본 설정)
+    DB_PROFILE = os.environ.get('DB_PROFILE', 'tuned')
+    # tuned 프로필의 커넥션 풀 크기 (파일 SQLite에만 적용, db_profile.configure_engine_options 참고)
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 10))
+    DB_BUSY_TIMEOUT_MS = int(os.environ.get('DB_BUSY_TIMEOUT_MS', 5000))
+    # 한 요청 안의 독립적인 조회를 동시에 실행할 스레드 풀 크기 (1이면 순차 실행)
+    DB_QUERY_CONCURRENCY = int(os.environ.get('DB_QUERY_CONCURRENCY', 4))
+    # ASGI 모드(asgi.py)에서 동기 Flask 뷰를 실행할 워커 프로세스당 스레드 수
+    ASGI_THREADS = int(os.environ.get('ASGI_THREADS', 16))
+
+    # 커넥션마다 적용되는 SQLite PRAGMA (WAL: 읽기와 쓰기가 서로를 막지 않음)
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': DB_BUSY_TIMEOUT_MS,
+        'mmap_size': int(os.environ.get('DB_MMAP_SIZE', 256 * 1024 * 1024)),
+        'cache_size': -int(os.environ.get('DB_CACHE_SIZE_KB', 64 * 1024)),  # 음수: KiB 단위
+        'temp_store': 'MEMORY'
+    } if DB_PROFILE == 'tuned' else {}
+
+    # 캐시 설정 (주간 점수 등)
+    # CACHE_BACKEND: 'local'(프로세스 내 LRU+TTL) 또는 'shared'(CACHE_SHARED_URL의 Redis 등)
+    CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'local')
+    CACHE_MAX_SIZE = int(os.environ.get('CACHE_MAX_SIZE', 10000))
+    CACHE_TTL_SECONDS = int(os.environ.get('CACHE_TTL_SECONDS', 60))
+    CACHE_SHARED_URL = os.environ.get('CACHE_SHARED_URL')
+
+    # 전체 통계(/api/statistics/global) 스냅샷 갱신 주기(초)와 백그라운드 갱신 사용 여부
+    GLOBAL_STATS_REFRESH_SECONDS = int(os.environ.get('GLOBAL_STATS_REFRESH_SECONDS', 60))
+    GLOBAL_STATS_BACKGROUND_REFRESH = os.environ.get('GLOBAL_STATS_BACKGROUND_REFRESH', 'true').lower() == 'true'
+
+    # 전체 리더보드(/api/leaderboard/global) 점수 기간(7, 30, 90일)과, 다른 워커의 쓰기를 반영하기 위한 인덱스 재구성 주기(초)
+    GLOBAL_LEADERBOARD_WINDOW_DAYS = int(os.environ.get('GLOBAL_LEADERBOARD_WINDOW_DAYS', 7))
+    GLOBAL_LEADERBOARD_REFRESH_SECONDS = int(os.environ.get('GLOBAL_LEADERBOARD_REFRESH_SECONDS', 300))
+
+    # 운동 기록 증분 동기화(/api/records/changes): 늦게 커밋된 쓰기를 다시 전달하기 위해 커서를 늦추는 시간(초)과
+    # 삭제 툼스톤 보존 기간(일). 이보다 오래된 커서는 410으로 응답하며 클라이언트는 전체 목록을 다시 받습니다.
+    SYNC_OVERLAP_SECONDS = int(os.environ.get('SYNC_OVERLAP_SECONDS', 5))
+    SYNC_TOMBSTONE_RETENTION_DAYS = int(os.environ.get('SYNC_TOMBSTONE_RETENTION_DAYS', 30))
+
+    # 요청 계측 설정 (기본값: 비활성화)
+    INSTRUMENTATION_ENABLED = os.environ.get('INSTRUMENTATION_ENABLED', 'false').lower() == 'true'
+    INSTRUMENTATION_N_PLUS_ONE_THRESHOLD = int(os.environ.get('INSTRUMENTATION_N_PLUS_ONE_THRESHOLD', 10))
+    INSTRUMENTATION_PROFILE_SAMPLE_RATE = float(os.environ.get('INSTRUMENTATION_PROFILE_SAMPLE_RATE', 0.0))
+    INSTRUMENTATION_PROFILE_KEEP = int(os.environ.get('INSTRUMENTATION_PROFILE_KEEP', 20))
+    INSTRUMENTATION_PROFILE_DIR = os.environ.get('INSTRUMENTATION_PROFILE_DIR')
+
+    # JSON 직렬화 백엔드: 'auto'(orjson이 설치되어 있으면 사용) 또는 'stdlib'
+    JSON_BACKEND = os.environ.get('JSON_BACKEND', 'auto')
+
+    # 조건부 GET (ETag / If-None-Match)
+    ETAG_ENABLED = os.environ.get('ETAG_ENABLED', 'true').lower() == 'true'
+
+    # 친구 추천: 공통 친구 수 상위 후보 수, 운동 종류 유사도 가중치와 분포 집계 기간(일)
+    SUGGESTION_POOL_SIZE = int(os.environ.get('SUGGESTION_POOL_SIZE', 100))
+    SUGGESTION_TYPE_WEIGHT = float(os.environ.get('SUGGESTION_TYPE_WEIGHT', 1.0))
+    SUGGESTION_TYPE_WINDOW_DAYS = int(os.environ.get('SUGGESTION_TYPE_WINDOW_DAYS', 90))
+
+    # 정적 자산 파이프라인 (시작 시 매니페스트 생성, gzip/brotli 사전 압축, 해시 자산 장기 캐시)
+    STATIC_PIPELINE_ENABLED = os.environ.get('STATIC_PIPELINE_ENABLED', 'true').lower() == 'true'
+    STATIC_COMPRESS_MIN_BYTES = int(os.environ.get('STATIC_COMPRESS_MIN_BYTES', 1024))
+    # 이 크기(바이트) 이상의 JSON API 응답은 gzip으로 압축합니다 (0이면 사용 안 함)
+    JSON_GZIP_MIN_BYTES = int(os.environ.get('JSON_GZIP_MIN_BYTES', 4096))
+    JSON_GZIP_LEVEL = int(os.environ.get('JSON_GZIP_LEVEL', 5))
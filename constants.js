@@ -42,4 +42,7 @@ export const SETTINGS = {
 
   // Friends.jsx - 임시 사용자 ID
   CURRENT_USER_ID: 1,
+
+  // recordSync.js - 운동 기록 목록과 증분 동기화 커서를 저장하는 localStorage 키
+  RECORDS_SYNC_STORAGE_KEY: 'exerciseRecordsSync',
 };
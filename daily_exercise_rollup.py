@@ -0,0 +1,36 @@
+from src.models.user import db
+from datetime import datetime
+
+class DailyExerciseRollup(db.Model):
+    __tablename__ = 'daily_exercise_rollups'
+    
+    # (user_id, date) 별로 하루치 운동 기록을 미리 집계해 둔 테이블
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    date = db.Column(db.Date, primary_key=True)
+    workout_count = db.Column(db.Integer, nullable=False, default=0)
+    intensity_sum = db.Column(db.Integer, nullable=False, default=0)
+    intensity_max = db.Column(db.Integer, nullable=False, default=0)
+    intensity_counts = db.Column(db.JSON, nullable=False, default=list)  # 강도(0-10)별 횟수, 삭제 시 최대값 재계산용
+    time_of_day_counts = db.Column(db.JSON, nullable=False, default=dict)  # {'오전': 2, ...}
+    exercise_type_counts = db.Column(db.JSON, nullable=False, default=dict)  # {'러닝': 1, ...}
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    
+    # 전체 사용자 집계(전체 통계, 전체 리더보드 인덱스 재구성)의 기간 조회용
+    __table_args__ = (
+        db.Index('ix_daily_exercise_rollups_date', 'date'),
+    )
+    
+    def to_dict(self):
+        return {
+            'user_id': self.user_id,
+            'date': self.date.isoformat() if self.date else None,
+            'workout_count': self.workout_count,
+            'intensity_sum': self.intensity_sum,
+            'intensity_max': self.intensity_max,
+            'time_of_day_counts': self.time_of_day_counts,
+            'exercise_type_counts': self.exercise_type_counts,
+            'updated_at': self.updated_at.isoformat() if self.updated_at else None
+        }
+    
+    def __repr__(self):
+        return f'<DailyExerciseRollup {self.user_id} {self.date}: {self.workout_count}>'
@@ -1,44 +1,68 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, request, jsonify, g
 from src.models.user import db
 from src.models.exercise_record import ExerciseRecord
+from src.utils.rollup import record_snapshot, apply_to_rollup, apply_many_to_rollup
+from src.utils.db_helpers import apply_record_filters
+from src.utils.cache import invalidate_scores
+from src.utils.catalog import encode_record_values
+from src.utils.etag import bump_data_versions
+from src.utils.global_leaderboard import global_leaderboard
+from src.utils.serialization import project_records, record_row_to_dict
+from src.utils.sync import record_deletion
+from src.utils.validation import validate_rows, validate_with
 from datetime import datetime, date
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import IntegrityError
 
 exercise_bp = Blueprint('exercise', __name__)
 
+BULK_MAX_ROWS = 5000
+BULK_CHUNK_SIZE = 500
+
+def _find_by_client_key(user_id, client_key):
+    """사용자의 멱등 키로 저장된 운동 기록을 (user_id, client_key) 고유 인덱스로 찾습니다. 키가 없으면 None."""
+    if not client_key:
+        return None
+    return ExerciseRecord.query.filter_by(user_id=user_id, client_key=client_key).first()
+
+def _duplicate_response(exercise_record):
+    return jsonify({
+        'message': '이미 등록된 운동 기록입니다.',
+        'exercise_record': exercise_record.to_dict()
+    }), 200
+
 @exercise_bp.route('/exercises', methods=['POST'])
+@validate_with('ExerciseRecordSchema')
 def create_exercise_record():
-    """운동 기록 생성"""
+    """
+    운동 기록 생성 (요청 본문은 ExerciseRecordSchema로 검증됩니다)
+
+    같은 사용자의 `client_key`로 이미 저장된 기록이 있으면 (동시에 재시도한 요청 포함)
+    새로 저장하지 않고 기존 기록을 200으로 반환합니다.
+    """
     try:
-        data = request.get_json()
-        
-        # 필수 필드 검증
-        required_fields = ['user_id', 'date', 'time_of_day', 'intensity', 'exercise_type']
-        for field in required_fields:
-            if field not in data:
-                return jsonify({'error': f'{field}는 필수 필드입니다.'}), 400
+        values = g.validated_data.model_dump()
+        existing = _find_by_client_key(values['user_id'], values['client_key'])
+        if existing:
+            return _duplicate_response(existing)
         
-        # 강도 값 검증 (0-10)
-        if not (0 <= data['intensity'] <= 10):
-            return jsonify({'error': '운동 강도는 0-10 사이의 값이어야 합니다.'}), 400
+        # 운동 기록 생성
+        exercise_record = ExerciseRecord(**values)
         
-        # 날짜 파싱
         try:
-            exercise_date = datetime.strptime(data['date'], '%Y-%m-%d').date()
-        except ValueError:
-            return jsonify({'error': '날짜 형식이 올바르지 않습니다. (YYYY-MM-DD)'}), 400
-        
-        # 운동 기록 생성
-        exercise_record = ExerciseRecord(
-            user_id=data['user_id'],
-            date=exercise_date,
-            time_of_day=data['time_of_day'],
-            intensity=data['intensity'],
-            exercise_type=data['exercise_type'],
-            memo=data.get('memo', '')
-        )
-        
-        db.session.add(exercise_record)
-        db.session.commit()
+            db.session.add(exercise_record)
+            apply_to_rollup(record_snapshot(exercise_record))
+            bump_data_versions([exercise_record.user_id])
+            db.session.commit()
+        except IntegrityError:
+            # 조회 이후 같은 키로 먼저 커밋된 요청이 있으면 (user_id, client_key) 고유 인덱스에서 충돌합니다.
+            db.session.rollback()
+            existing = _find_by_client_key(values['user_id'], values['client_key'])
+            if existing is None:
+                raise
+            return _duplicate_response(existing)
+        invalidate_scores([exercise_record.user_id])
+        global_leaderboard.refresh_users([exercise_record.user_id])
         
         return jsonify({
             'message': '운동 기록이 성공적으로 생성되었습니다.',
@@ -49,6 +73,105 @@ def create_exercise_record():
         db.session.rollback()
         return jsonify({'error': str(e)}), 500
 
+def _read_bulk_rows():
+    """
+    대량 등록 요청 본문을 행 리스트로 읽습니다.
+
+    JSON 배열 또는 NDJSON(`application/x-ndjson`, 한 줄에 JSON 객체 하나)을 지원합니다.
+    NDJSON의 각 줄은 파싱하지 않은 문자열로 반환하여 검증기가 JSON에서 바로 검증하게 하므로,
+    해석할 수 없는 줄은 행별 오류로 보고됩니다.
+
+    Returns:
+        tuple: (행 리스트, 행이 JSON 문자열인지 여부).
+    """
+    if request.mimetype in ('application/x-ndjson', 'application/jsonl'):
+        lines = request.get_data(as_text=True).splitlines()
+        return [line for line in lines if line.strip()], True
+    
+    data = request.get_json(silent=True)
+    if not isinstance(data, list):
+        raise ValueError('요청 본문은 JSON 배열 또는 NDJSON이어야 합니다.')
+    return data, False
+
+@exercise_bp.route('/exercises/bulk', methods=['POST'])
+def create_exercise_records_bulk():
+    """
+    운동 기록 대량 생성 (웨어러블 동기화용)
+
+    각 행은 단건 생성과 같은 스키마(ExerciseRecordSchema)로 검증되며, 유효한 행만 하나의 트랜잭션 안에서
+    청크 단위 executemany INSERT로 저장됩니다. `client_key`가 같은 행이 이미 있으면
+    (같은 사용자 기준, 동시에 재시도한 요청 포함) 다시 저장하지 않고 `skipped_duplicates`로 보고하므로,
+    동기화를 재시도해도 중복되지 않습니다.
+    """
+    try:
+        try:
+            rows, from_json = _read_bulk_rows()
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        if not rows:
+            return jsonify({'error': '등록할 운동 기록이 없습니다.'}), 400
+        if len(rows) > BULK_MAX_ROWS:
+            return jsonify({'error': f'한 번에 최대 {BULK_MAX_ROWS}건까지 등록할 수 있습니다.'}), 400
+        
+        # 모든 행을 ExerciseRecordSchema로 한 번에 검증 (실패한 행만 행별 오류로 보고)
+        validated, errors = validate_rows('ExerciseRecordSchema', rows, from_json=from_json)
+        valid_rows = [(index, record.model_dump()) for index, record in validated]
+        
+        now = datetime.utcnow()
+        to_insert = []
+        skipped = []
+        seen_keys = set()
+        for index, values in valid_rows:
+            key = (values['user_id'], values['client_key'])
+            if values['client_key']:
+                # 요청 안에서 중복된 키는 첫 행만 저장합니다.
+                if key in seen_keys:
+                    skipped.append({'index': index, 'client_key': values['client_key']})
+                    continue
+                seen_keys.add(key)
+            to_insert.append((index, dict(values, created_at=now, updated_at=now)))
+        
+        # 운동 종류/시간대를 ID/코드로 바꾼 뒤 청크 단위 executemany INSERT (전체가 하나의 트랜잭션).
+        # 이미 저장된 멱등 키는 (user_id, client_key) 고유 인덱스 충돌로 건너뛰므로, 같은 키로 동시에
+        # 재시도한 요청끼리도 중복 저장이나 IntegrityError 없이 한쪽만 저장됩니다.
+        # RETURNING으로 실제로 저장된 키를 받아 건너뛴 행을 보고합니다.
+        insert_statement = sqlite_insert(ExerciseRecord).on_conflict_do_nothing(
+            index_elements=['user_id', 'client_key']
+        ).returning(ExerciseRecord.user_id, ExerciseRecord.client_key)
+        encoded = encode_record_values([values for _, values in to_insert])
+        inserted_keys = set()
+        for start in range(0, len(encoded), BULK_CHUNK_SIZE):
+            inserted_keys.update(db.session.execute(insert_statement, encoded[start:start + BULK_CHUNK_SIZE]).all())
+        
+        inserted = []
+        for index, values in to_insert:
+            if values['client_key'] and (values['user_id'], values['client_key']) not in inserted_keys:
+                skipped.append({'index': index, 'client_key': values['client_key']})
+            else:
+                inserted.append(values)
+        skipped.sort(key=lambda item: item['index'])
+        to_insert = inserted
+        
+        # 일별 롤업은 (사용자, 날짜)별로 합쳐 행마다 한 번만 갱신합니다.
+        apply_many_to_rollup(to_insert)
+        user_ids = {values['user_id'] for values in to_insert}
+        bump_data_versions(user_ids)
+        db.session.commit()
+        invalidate_scores(user_ids)
+        global_leaderboard.refresh_users(user_ids)
+        
+        return jsonify({
+            'message': f'운동 기록 {len(to_insert)}건이 등록되었습니다.',
+            'inserted_count': len(to_insert),
+            'skipped_duplicates': skipped,
+            'errors': errors
+        }), 201 if to_insert else 200
+        
+    except Exception as e:
+        db.session.rollback()
+        return jsonify({'error': str(e)}), 500
+
 @exercise_bp.route('/exercises/<int:user_id>', methods=['GET'])
 def get_exercise_records(user_id):
     """사용자의 운동 기록 조회"""
@@ -59,37 +182,23 @@ def get_exercise_records(user_id):
         exercise_type = request.args.get('exercise_type')
         limit = request.args.get('limit', type=int)
         
-        # 기본 쿼리
+        # 기본 쿼리 및 필터 (날짜, 운동 종류)
         query = ExerciseRecord.query.filter_by(user_id=user_id)
-        
-        # 날짜 필터
-        if start_date:
-            try:
-                start_date_obj = datetime.strptime(start_date, '%Y-%m-%d').date()
-                query = query.filter(ExerciseRecord.date >= start_date_obj)
-            except ValueError:
-                return jsonify({'error': '시작 날짜 형식이 올바르지 않습니다.'}), 400
-        
-        if end_date:
-            try:
-                end_date_obj = datetime.strptime(end_date, '%Y-%m-%d').date()
-                query = query.filter(ExerciseRecord.date <= end_date_obj)
-            except ValueError:
-                return jsonify({'error': '종료 날짜 형식이 올바르지 않습니다.'}), 400
-        
-        # 운동 종류 필터
-        if exercise_type:
-            query = query.filter(ExerciseRecord.exercise_type.ilike(f'%{exercise_type}%'))
+        try:
+            query = apply_record_filters(query, start_date, end_date, exercise_type)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
         # 정렬 및 제한
         query = query.order_by(ExerciseRecord.created_at.desc())
         if limit:
             query = query.limit(limit)
         
-        records = query.all()
+        # ORM 객체 없이 필요한 컬럼만 조회하여 직렬화
+        records = [record_row_to_dict(row) for row in project_records(query).all()]
         
         return jsonify({
-            'exercise_records': [record.to_dict() for record in records],
+            'exercise_records': records,
             'total_count': len(records)
         }), 200
         
@@ -97,35 +206,26 @@ def get_exercise_records(user_id):
         return jsonify({'error': str(e)}), 500
 
 @exercise_bp.route('/exercises/<int:record_id>', methods=['PUT'])
+@validate_with('ExerciseRecordUpdateSchema')
 def update_exercise_record(record_id):
-    """운동 기록 수정"""
+    """운동 기록 수정 (요청 본문은 ExerciseRecordUpdateSchema로 검증됩니다)"""
     try:
         record = ExerciseRecord.query.get_or_404(record_id)
-        data = request.get_json()
-        
-        # 수정 가능한 필드들
-        if 'date' in data:
-            try:
-                record.date = datetime.strptime(data['date'], '%Y-%m-%d').date()
-            except ValueError:
-                return jsonify({'error': '날짜 형식이 올바르지 않습니다.'}), 400
+        previous = record_snapshot(record)
         
-        if 'time_of_day' in data:
-            record.time_of_day = data['time_of_day']
-        
-        if 'intensity' in data:
-            if not (0 <= data['intensity'] <= 10):
-                return jsonify({'error': '운동 강도는 0-10 사이의 값이어야 합니다.'}), 400
-            record.intensity = data['intensity']
-        
-        if 'exercise_type' in data:
-            record.exercise_type = data['exercise_type']
-        
-        if 'memo' in data:
-            record.memo = data['memo']
+        # 요청에 포함된 필드만 수정
+        for field, value in g.validated_data.model_dump(exclude_unset=True).items():
+            setattr(record, field, value)
         
         record.updated_at = datetime.utcnow()
+        
+        # 일별 롤업 갱신 (새 값을 먼저 반영해야 같은 날짜의 롤업 행이 삭제되지 않습니다)
+        apply_to_rollup(record_snapshot(record))
+        apply_to_rollup(previous, sign=-1)
+        bump_data_versions([record.user_id])
         db.session.commit()
+        invalidate_scores([record.user_id])
+        global_leaderboard.refresh_users([record.user_id])
         
         return jsonify({
             'message': '운동 기록이 성공적으로 수정되었습니다.',
@@ -138,12 +238,18 @@ def update_exercise_record(record_id):
 
 @exercise_bp.route('/exercises/<int:record_id>', methods=['DELETE'])
 def delete_exercise_record(record_id):
-    """운동 기록 삭제"""
+    """운동 기록 삭제 (증분 동기화 클라이언트에 전달할 툼스톤을 같은 트랜잭션에서 남깁니다)"""
     try:
         record = ExerciseRecord.query.get_or_404(record_id)
         
+        user_id = record.user_id
+        apply_to_rollup(record_snapshot(record), sign=-1)
+        record_deletion(record)
         db.session.delete(record)
+        bump_data_versions([user_id])
         db.session.commit()
+        invalidate_scores([user_id])
+        global_leaderboard.refresh_users([user_id])
         
         return jsonify({'message': '운동 기록이 성공적으로 삭제되었습니다.'}), 200
         
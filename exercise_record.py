@@ -1,4 +1,5 @@
 from src.models.user import db
+from src.utils.catalog import exercise_type_catalog, time_of_day_code, time_of_day_label
 from datetime import datetime
 
 class ExerciseRecord(db.Model):
@@ -7,16 +8,45 @@ class ExerciseRecord(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
     date = db.Column(db.Date, nullable=False)
-    time_of_day = db.Column(db.String(20), nullable=False)  # 오전, 오후, 야간, 틈틈이
+    time_of_day_code = db.Column(db.SmallInteger, nullable=False)  # 1: 오전, 2: 오후, 3: 야간, 4: 틈틈이 (0: 기타)
     intensity = db.Column(db.Integer, nullable=False)  # 0-10
-    exercise_type = db.Column(db.String(100), nullable=False)
+    exercise_type_id = db.Column(db.Integer, db.ForeignKey('exercise_types.id'), nullable=False)
     memo = db.Column(db.Text)
+    client_key = db.Column(db.String(64))  # 클라이언트가 보낸 멱등 키 (동기화 재시도 시 중복 방지)
     created_at = db.Column(db.DateTime, default=datetime.utcnow)
     updated_at = db.Column(db.DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     # 관계 설정
     user = db.relationship('User', backref=db.backref('exercise_records', lazy=True))
     
+    # 인덱스 (자주 사용하는 필터: 사용자별 최근 기록, 사용자별 날짜 범위, 전체 최신순/기간 조회,
+    # 전체/사용자별 증분 동기화의 (updated_at, id) 커서 이후 변경 조회)
+    __table_args__ = (
+        db.Index('ix_exercise_records_user_created', 'user_id', 'created_at'),
+        db.Index('ix_exercise_records_user_date', 'user_id', 'date'),
+        db.Index('ix_exercise_records_created_id', 'created_at', 'id'),
+        db.Index('ix_exercise_records_updated_id', 'updated_at', 'id'),
+        db.Index('ix_exercise_records_user_updated_id', 'user_id', 'updated_at', 'id'),
+        db.Index('ux_exercise_records_user_client_key', 'user_id', 'client_key', unique=True),
+    )
+    
+    # 운동 종류와 시간대는 ID/코드로 저장하고, 이름은 프로세스 내 카탈로그 캐시로 변환합니다.
+    @property
+    def time_of_day(self):
+        return time_of_day_label(self.time_of_day_code)
+    
+    @time_of_day.setter
+    def time_of_day(self, label):
+        self.time_of_day_code = time_of_day_code(label)
+    
+    @property
+    def exercise_type(self):
+        return exercise_type_catalog.name_of(self.exercise_type_id)
+    
+    @exercise_type.setter
+    def exercise_type(self, name):
+        self.exercise_type_id = exercise_type_catalog.id_of(name)
+    
     def to_dict(self):
         return {
             'id': self.id,
@@ -26,6 +56,7 @@ class ExerciseRecord(db.Model):
             'intensity': self.intensity,
             'exercise_type': self.exercise_type,
             'memo': self.memo,
+            'client_key': self.client_key,
             'created_at': self.created_at.isoformat() if self.created_at else None,
             'updated_at': self.updated_at.isoformat() if self.updated_at else None
         }
@@ -0,0 +1,29 @@
+from src.models.user import db
+from datetime import datetime
+
+class ExerciseRecordDeletion(db.Model):
+    __tablename__ = 'exercise_record_deletions'
+    
+    # 삭제된 운동 기록의 툼스톤 로그. 증분 동기화(/api/records/changes)가 삭제를 클라이언트에 전달하는 데 사용합니다.
+    # 운동 기록 테이블에 삭제 표시(soft delete)를 두면 모든 조회에 조건이 붙어야 하므로, 삭제는 별도 로그에 남깁니다.
+    # 보존 기간(SYNC_TOMBSTONE_RETENTION_DAYS)이 지난 행은 `flask --app main prune-deletions`로 정리합니다.
+    id = db.Column(db.Integer, primary_key=True)
+    record_id = db.Column(db.Integer, nullable=False)  # 삭제된 exercise_records.id (행이 없으므로 외래 키가 아님)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    deleted_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    
+    # 전체/사용자별 "커서 이후의 삭제" 범위 조회용
+    __table_args__ = (
+        db.Index('ix_exercise_record_deletions_deleted', 'deleted_at', 'id'),
+        db.Index('ix_exercise_record_deletions_user_deleted', 'user_id', 'deleted_at', 'id'),
+    )
+    
+    def to_dict(self):
+        return {
+            'id': self.record_id,
+            'user_id': self.user_id,
+            'deleted_at': self.deleted_at.isoformat() if self.deleted_at else None
+        }
+    
+    def __repr__(self):
+        return f'<ExerciseRecordDeletion {self.record_id} ({self.user_id})>'
@@ -0,0 +1,20 @@
+from src.models.user import db
+from datetime import datetime
+
+class ExerciseType(db.Model):
+    __tablename__ = 'exercise_types'
+    
+    # 운동 종류 이름 사전. 운동 기록은 이름 대신 이 테이블의 ID(exercise_type_id)를 저장합니다.
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), unique=True, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'name': self.name,
+            'created_at': self.created_at.isoformat() if self.created_at else None
+        }
+    
+    def __repr__(self):
+        return f'<ExerciseType {self.id}: {self.name}>'
@@ -0,0 +1,29 @@
+from src.models.user import db
+
+class FriendEdge(db.Model):
+    __tablename__ = 'friend_edges'
+    
+    # 친구 관계 하나를 방향별로 한 행씩(양방향 2행) 저장하는 대칭 인접 인덱스.
+    # 기본 키 (user_id, friend_id)로 "A의 친구 목록"과 "A와 B가 이미 친구(요청 중)인가?"를
+    # 각각 인덱스 범위 조회 한 번, 기본 키 조회 한 번으로 처리합니다.
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    friend_id = db.Column(db.Integer, db.ForeignKey('users.id'), primary_key=True)
+    friendship_id = db.Column(db.Integer, db.ForeignKey('friendships.id', ondelete='CASCADE'), nullable=False, index=True)
+    status = db.Column(db.String(20), nullable=False)  # Friendship.status와 같은 값
+    since = db.Column(db.DateTime)  # Friendship.created_at
+    
+    __table_args__ = (
+        db.Index('ix_friend_edges_user_status', 'user_id', 'status', 'friend_id'),
+    )
+    
+    def to_dict(self):
+        return {
+            'user_id': self.user_id,
+            'friend_id': self.friend_id,
+            'friendship_id': self.friendship_id,
+            'status': self.status,
+            'since': self.since.isoformat() if self.since else None
+        }
+    
+    def __repr__(self):
+        return f'<FriendEdge {self.user_id} - {self.friend_id}: {self.status}>'
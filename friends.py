@@ -1,17 +1,23 @@
-from flask import Blueprint, request, jsonify, g, current_app
+from flask import Blueprint, request, g, current_app
 from src.models.user import db, User
 from src.models.friendship import Friendship
 from src.utils.response import api_success, api_error
-from src.utils.db_helpers import get_user_weekly_score
-from src.models.exercise_record import ExerciseRecord
-from datetime import datetime, timedelta
+from src.utils.friend_queries import (
+    FRIEND_SORTS, add_friend_edges, delete_friend_edges, fetch_friends_page, find_friendship, update_friend_edges
+)
+from src.utils.cache import invalidate_friend_ids, invalidate_suggestions
+from src.utils.suggestions import get_suggestions, invalidate_suggestions_around
+from src.utils.leaderboard import build_leaderboard
+from src.utils.scores import parse_score_window
+from src.utils.db_profile import use_read_replica
+from src.utils.etag import bump_data_versions, conditional_get
+from datetime import datetime
 from src.utils.validation import validate_with
-from src.validation.schemas import FriendRequestSchema, AcceptFriendRequestSchema, RemoveFriendSchema
 
 friends_bp = Blueprint('friends', __name__)
 
 @friends_bp.route('/friends/request', methods=['POST'])
-@validate_with(FriendRequestSchema)
+@validate_with('FriendRequestSchema')
 def send_friend_request():
     """
     친구 요청을 보냅니다.
@@ -33,10 +39,8 @@ def send_friend_request():
         if int(user_id) == friend.id:
             return api_error(message="자기 자신에게는 친구 요청을 보낼 수 없습니다.")
         
-        existing_friendship = Friendship.query.filter(
-            ((Friendship.user_id == user_id) & (Friendship.friend_id == friend.id)) |
-            ((Friendship.user_id == friend.id) & (Friendship.friend_id == user_id))
-        ).first()
+        # 방향과 상태에 관계없이 기존 관계를 인접 인덱스의 기본 키 조회 한 번으로 확인
+        existing_friendship = find_friendship(user_id, friend.id)
         
         if existing_friendship:
             return api_error(message=f"이미 친구 관계가 존재하거나 요청 대기 중입니다: {existing_friendship.status}", status_code=409)
@@ -48,7 +52,12 @@ def send_friend_request():
             status='pending'
         )
         db.session.add(friendship)
+        db.session.flush()
+        add_friend_edges(friendship)
+        bump_data_versions([user_id, friend.id])
         db.session.commit()
+        # 대기 중인 요청 상대는 추천 후보에서 제외되므로 두 사용자의 추천 목록만 다시 계산합니다.
+        invalidate_suggestions([user_id, friend.id])
         
         current_app.logger.info(f"사용자 {user_id}가 {friend.id}에게 친구 요청을 보냈습니다.")
         return api_success(data=friendship.to_dict(), message="친구 요청이 성공적으로 전송되었습니다.", status_code=201)
@@ -59,7 +68,7 @@ def send_friend_request():
         return api_error(message="친구 요청 처리 중 서버 오류가 발생했습니다.", status_code=500)
 
 @friends_bp.route('/friends/accept', methods=['POST'])
-@validate_with(AcceptFriendRequestSchema)
+@validate_with('AcceptFriendRequestSchema')
 def accept_friend_request():
     """
     친구 요청을 수락합니다.
@@ -78,8 +87,12 @@ def accept_friend_request():
         
         friendship.status = 'accepted'
         friendship.updated_at = datetime.utcnow()
+        update_friend_edges(friendship)
+        bump_data_versions([friendship.user_id, friendship.friend_id])
         
         db.session.commit()
+        invalidate_friend_ids([friendship.user_id, friendship.friend_id])
+        invalidate_suggestions_around([friendship.user_id, friendship.friend_id])
         
         current_app.logger.info(f"친구 요청 {friendship.id}가 수락되었습니다.")
         return api_success(data=friendship.to_dict(), message="친구 요청이 수락되었습니다.")
@@ -90,88 +103,120 @@ def accept_friend_request():
         return api_error(message="친구 요청 수락 중 서버 오류가 발생했습니다.", status_code=500)
 
 @friends_bp.route('/friends/<int:user_id>', methods=['GET'])
+@conditional_get(include_friends=True)
 def get_friends(user_id):
     """
-    특정 사용자의 모든 친구 목록을 조회합니다.
+    특정 사용자의 친구 목록을 조회합니다.
 
-    'accepted' 상태인 친구 관계만 조회하여, 각 친구의 정보와
-    최근 7일간의 운동 점수를 계산하여 함께 반환합니다.
+    'accepted' 상태인 친구 관계만 조회하며, 각 친구의 정보와 기간 점수(기본값: 최근 7일)를 함께 반환합니다.
+    정렬과 페이지 나누기는 SQL에서 처리하며 (점수 정렬은 일별 롤업 합계를 조인), 반환할 페이지의 친구만 읽습니다.
+
+    쿼리 파라미터:
+    - sort (str, 선택): 'score'(점수 내림차순, 기본값) 또는 'name'(이름 오름차순).
+    - limit (int, 선택): 반환할 최대 친구 수.
+    - offset (int, 선택): 건너뛸 친구 수.
+    - window (int, 선택): 점수 기간(일). 7(기본값), 30, 90 중 하나.
+    - as_of (str, 선택): 점수 기준일 (YYYY-MM-DD, 기본값 오늘). 기준일을 포함한 최근 window일을 집계합니다.
+
+    사용자와 친구들의 데이터가 바뀌지 않았으면 `If-None-Match`에 대해 304를 반환합니다.
     """
     try:
-        friendships = db.session.query(Friendship).filter(
-            ((Friendship.user_id == user_id) | (Friendship.friend_id == user_id)) &
-            (Friendship.status == 'accepted')
-        ).all()
-        
-        friends_list = []
-        for friendship in friendships:
-            friend_id = friendship.friend_id if friendship.user_id == user_id else friendship.user_id
-            friend = User.query.get(friend_id)
-            
-            if friend:
-                weekly_score = get_user_weekly_score(friend_id)
-                
-                friends_list.append({
-                    'id': friend.id,
-                    'username': friend.username,
-                    'email': friend.email,
-                    'weekly_score': weekly_score,
-                    'friendship_since': friendship.created_at.isoformat()
-                })
-        
-        return api_success(data={'friends': friends_list, 'total_count': len(friends_list)}, message="친구 목록 조회 성공")
+        sort = request.args.get('sort', 'score')
+        limit = request.args.get('limit', type=int)
+        offset = request.args.get('offset', 0, type=int)
+
+        if sort not in FRIEND_SORTS:
+            return api_error(message="sort는 score 또는 name이어야 합니다.")
+        if (limit is not None and limit < 0) or offset < 0:
+            return api_error(message="limit, offset 값은 0 이상이어야 합니다.")
+        try:
+            days, as_of = parse_score_window(request.args.get('window'), request.args.get('as_of'))
+        except ValueError as e:
+            return api_error(message=str(e))
+
+        friends_list, total_count = fetch_friends_page(
+            user_id, sort=sort, limit=limit, offset=offset, days=days, as_of=as_of
+        )
+        
+        return api_success(data={
+            'friends': friends_list,
+            'total_count': total_count,
+            'window_days': days,
+            'as_of': as_of.isoformat()
+        }, message="친구 목록 조회 성공")
         
     except Exception as e:
         current_app.logger.error(f"사용자 {user_id}의 친구 목록 조회 중 오류 발생: {e}", exc_info=True)
         return api_error(message="친구 목록 조회 중 서버 오류가 발생했습니다.", status_code=500)
 
 @friends_bp.route('/friends/leaderboard/<int:user_id>', methods=['GET'])
+@use_read_replica
+@conditional_get(include_friends=True)
 def get_leaderboard(user_id):
     """
-    사용자와 친구들의 주간 운동 점수를 기반으로 리더보드를 생성합니다.
+    사용자와 친구들의 기간 운동 점수(기본값: 주간)를 기반으로 리더보드를 생성합니다.
 
-    사용자 본인과 모든 친구의 최근 7일간 운동 강도 총합을 계산하여
-    점수가 높은 순으로 정렬된 리더보드를 반환합니다.
+    사용자 본인과 모든 친구의 기간 운동 강도 총합을 점수 캐시(없으면 일별 롤업의 단일 집계 쿼리)에서 읽어
+    점수가 높은 순으로 정렬된 리더보드를 반환합니다. 동점자는 같은 순위를 받습니다.
+
+    쿼리 파라미터:
+    - limit (int, 선택): 반환할 최대 항목 수.
+    - offset (int, 선택): 건너뛸 항목 수.
+    - around (int, 선택): 지정 시 현재 사용자 위아래로 이 개수만큼의 항목만 반환합니다.
+    - window (int, 선택): 점수 기간(일). 7(기본값), 30, 90 중 하나.
+    - as_of (str, 선택): 점수 기준일 (YYYY-MM-DD, 기본값 오늘).
+
+    사용자와 친구들의 데이터가 바뀌지 않았으면 `If-None-Match`에 대해 304를 반환합니다.
     """
     try:
-        friendships = db.session.query(Friendship).filter(
-            ((Friendship.user_id == user_id) | (Friendship.friend_id == user_id)) &
-            (Friendship.status == 'accepted')
-        ).all()
-        
-        friend_ids = [f.friend_id if f.user_id == user_id else f.user_id for f in friendships]
-        all_user_ids = [user_id] + friend_ids
-        
-        leaderboard = []
-        
-        for uid in all_user_ids:
-            user = User.query.get(uid)
-            if user:
-                weekly_score = get_user_weekly_score(uid)
-                
-                leaderboard.append({
-                    'user_id': uid,
-                    'username': user.username,
-                    'weekly_score': weekly_score,
-                    'is_current_user': uid == user_id
-                })
-        
-        leaderboard.sort(key=lambda x: x['weekly_score'], reverse=True)
-        
-        for i, entry in enumerate(leaderboard):
-            entry['rank'] = i + 1
-        
-        return api_success(
-            data={'leaderboard': leaderboard, 'total_participants': len(leaderboard)},
-            message="리더보드 조회 성공"
-        )
+        limit = request.args.get('limit', type=int)
+        offset = request.args.get('offset', 0, type=int)
+        around = request.args.get('around', type=int)
+
+        if (limit is not None and limit < 0) or offset < 0 or (around is not None and around < 0):
+            return api_error(message="limit, offset, around 값은 0 이상이어야 합니다.")
+        try:
+            days, as_of = parse_score_window(request.args.get('window'), request.args.get('as_of'))
+        except ValueError as e:
+            return api_error(message=str(e))
+
+        leaderboard = build_leaderboard(user_id, limit=limit, offset=offset, around=around, days=days, as_of=as_of)
+
+        return api_success(data=leaderboard, message="리더보드 조회 성공")
         
     except Exception as e:
         current_app.logger.error(f"사용자 {user_id}의 리더보드 조회 중 오류 발생: {e}", exc_info=True)
         return api_error(message="리더보드 조회 중 서버 오류가 발생했습니다.", status_code=500)
 
+@friends_bp.route('/friends/suggestions/<int:user_id>', methods=['GET'])
+@use_read_replica
+def get_friend_suggestions(user_id):
+    """
+    친구의 친구 중 "알 수도 있는 사람"을 공통 친구 수 순으로 추천합니다.
+
+    쿼리 파라미터:
+    - limit (int, 선택): 반환할 최대 추천 수 (기본값 10, 최대 50).
+    - weighted (bool, 선택): 'true'이면 최근 운동 종류가 비슷한 사용자에게 가중치를 줍니다.
+    """
+    try:
+        limit = request.args.get('limit', 10, type=int)
+        weighted = request.args.get('weighted', 'false').lower() == 'true'
+
+        if not 0 <= limit <= 50:
+            return api_error(message="limit 값은 0 이상 50 이하이어야 합니다.")
+        if not db.session.get(User, user_id):
+            return api_error(message="사용자를 찾을 수 없습니다.", status_code=404)
+
+        suggestions = get_suggestions(user_id, limit=limit, weighted=weighted)
+
+        return api_success(data={'suggestions': suggestions}, message="친구 추천 조회 성공")
+        
+    except Exception as e:
+        current_app.logger.error(f"사용자 {user_id}의 친구 추천 조회 중 오류 발생: {e}", exc_info=True)
+        return api_error(message="친구 추천 조회 중 서버 오류가 발생했습니다.", status_code=500)
+
 @friends_bp.route('/friends/remove', methods=['DELETE'])
-@validate_with(RemoveFriendSchema)
+@validate_with('RemoveFriendSchema')
 def remove_friend():
     """
     친구 관계를 삭제합니다.
@@ -186,17 +231,19 @@ def remove_friend():
         friend_id = validated_data.friend_id
 
         # 친구 관계 찾기
-        friendship = Friendship.query.filter(
-            ((Friendship.user_id == user_id) & (Friendship.friend_id == friend_id)) |
-            ((Friendship.user_id == friend_id) & (Friendship.friend_id == user_id))
-        ).first()
+        friendship = find_friendship(user_id, friend_id)
         
         if not friendship:
             return api_error(message="친구 관계를 찾을 수 없습니다.", status_code=404)
         
         friendship_id_log = friendship.id
+        member_ids = [friendship.user_id, friendship.friend_id]
+        delete_friend_edges(friendship)
         db.session.delete(friendship)
+        bump_data_versions(member_ids)
         db.session.commit()
+        invalidate_friend_ids(member_ids)
+        invalidate_suggestions_around(member_ids)
         
         current_app.logger.info(f"친구 관계 {friendship_id_log} (사용자 {user_id}와 {friend_id} 사이)가 삭제되었습니다.")
         return api_success(message="친구 관계가 성공적으로 삭제되었습니다.")
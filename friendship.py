@@ -15,8 +15,13 @@ class Friendship(db.Model):
     user = db.relationship('User', foreign_keys=[user_id], backref='sent_friend_requests')
     friend = db.relationship('User', foreign_keys=[friend_id], backref='received_friend_requests')
     
-    # 유니크 제약 조건 (같은 사용자 간 중복 친구 관계 방지)
-    __table_args__ = (db.UniqueConstraint('user_id', 'friend_id', name='unique_friendship'),)
+    # 유니크 제약 조건 (같은 사용자 간 중복 친구 관계 방지) 및
+    # 양방향 조회((user_id = ? OR friend_id = ?) AND status = ?)를 위한 방향별 인덱스
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'friend_id', name='unique_friendship'),
+        db.Index('ix_friendships_user_status', 'user_id', 'status'),
+        db.Index('ix_friendships_friend_status', 'friend_id', 'status'),
+    )
     
     def to_dict(self):
         return {
@@ -5,89 +5,221 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
 
 from flask import Flask, send_from_directory, jsonify
 from werkzeug.exceptions import NotFound, InternalServerError
-from flask_cors import CORS
-from src.models.user import db
-from src.models.exercise_record import ExerciseRecord
-from src.models.friendship import Friendship
-from src.routes.user import user_bp
-from src.routes.exercise import exercise_bp
-from src.routes.friends import friends_bp
-from src.routes.statistics import statistics_bp
-from src.routes.records import records_bp
 from config import Config
-
+from flask.cli import with_appcontext
+from importlib import import_module
+import click
 import logging
 
-app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
-app.config.from_object(Config)
-
-# 로깅 설정
-logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]')
-app.logger.info("애플리케이션 시작")
-
-# CORS 설정 - 모든 도메인에서 접근 허용
-CORS(app)
+# 등록할 블루프린트 ('모듈 경로:블루프린트 이름'). create_app 안에서 필요한 것만 불러옵니다.
+BLUEPRINTS = (
+    'src.routes.user:user_bp',
+    'src.routes.exercise:exercise_bp',
+    'src.routes.friends:friends_bp',
+    'src.routes.statistics:statistics_bp',
+    'src.routes.records:records_bp',
+    'src.routes.leaderboard:leaderboard_bp'
+)
+
+def register_blueprints(app):
+    """
+    BLUEPRINTS 설정(기본값: 모든 블루프린트)에 나열된 블루프린트를 불러와 '/api' 아래에 등록합니다.
 
-# 블루프린트 등록
-app.register_blueprint(user_bp, url_prefix='/api')
-app.register_blueprint(exercise_bp, url_prefix='/api')
-app.register_blueprint(friends_bp, url_prefix='/api')
-app.register_blueprint(statistics_bp, url_prefix='/api')
-app.register_blueprint(records_bp, url_prefix='/api')
+    블루프린트 모듈은 이 함수가 호출될 때 처음 import되므로, `main` 모듈 import 자체는 가볍게 유지됩니다.
+    """
+    for target in app.config.get('BLUEPRINTS') or BLUEPRINTS:
+        module_name, attribute = target.split(':')
+        app.register_blueprint(getattr(import_module(module_name), attribute), url_prefix='/api')
+
+@click.command('init-db')
+@with_appcontext
+def init_db_command():
+    """데이터베이스 디렉토리와 테이블을 만들고, 누락된 컬럼과 인덱스를 추가합니다."""
+    from src.utils.migrations import init_database
+    added, checked = init_database()
+    click.echo(f"데이터베이스 초기화 완료 (추가된 컬럼 {len(added)}개, 확인한 인덱스 {checked}개)")
+
+@click.command('rebuild-rollups')
+@click.option('--user-id', type=int, default=None, help='지정한 사용자의 롤업만 다시 만듭니다.')
+@with_appcontext
+def rebuild_rollups_command(user_id):
+    """운동 기록으로부터 일별 롤업 테이블을 백필하거나 다시 만듭니다."""
+    from src.utils.rollup import rebuild_rollups
+    count = rebuild_rollups(user_id)
+    click.echo(f"일별 롤업 {count}건을 생성했습니다.")
+
+@click.command('rebuild-search-index')
+@with_appcontext
+def rebuild_search_index_command():
+    """운동 기록 검색 색인(FTS5)을 exercise_records 전체로부터 다시 만듭니다."""
+    from src.utils.search import ensure_search_index, rebuild_search_index
+    if not ensure_search_index():
+        raise click.ClickException("이 데이터베이스는 FTS5 trigram 검색 색인을 지원하지 않습니다.")
+    count = rebuild_search_index()
+    click.echo(f"운동 기록 {count}건을 검색 색인에 반영했습니다.")
+
+@click.command('rebuild-friend-edges')
+@with_appcontext
+def rebuild_friend_edges_command():
+    """친구 관계 테이블로부터 대칭 친구 인접 인덱스(friend_edges)를 다시 만듭니다."""
+    from src.utils.friend_queries import rebuild_friend_edges
+    count = rebuild_friend_edges()
+    click.echo(f"친구 인접 인덱스 {count}행을 생성했습니다.")
+
+@click.command('prune-deletions')
+@with_appcontext
+def prune_deletions_command():
+    """보존 기간(SYNC_TOMBSTONE_RETENTION_DAYS)이 지난 운동 기록 삭제 툼스톤을 정리합니다."""
+    from src.utils.sync import prune_deletions
+    count = prune_deletions()
+    click.echo(f"삭제 툼스톤 {count}건을 정리했습니다.")
+
+def create_app(config_object=Config):
+    """
+    Flask 애플리케이션을 생성하고 설정, 블루프린트, 데이터베이스, 캐시, 계측을 초기화합니다.
 
-# 데이터베이스 초기화
-db.init_app(app)
+    워커 시작 시간을 줄이기 위해 스키마 생성과 마이그레이션은 수행하지 않습니다.
+    배포 시(또는 스키마 변경 후) `flask --app main init-db`를 한 번 실행해야 합니다.
 
-with app.app_context():
-    db.create_all()
+    Args:
+        config_object: 앱 설정 객체 (기본값: config.Config).
 
-@app.route('/', defaults={'path': ''})
-@app.route('/<path:path>')
-def serve(path):
-    """
-    React 애플리케이션의 정적 파일들을 제공합니다.
-    요청된 경로에 파일이 존재하면 해당 파일을, 그렇지 않으면 index.html을 반환하여
-    클라이언트 사이드 라우팅을 지원합니다.
+    Returns:
+        Flask: 초기화된 Flask 앱.
     """
-    static_folder_path = app.static_folder
-    if static_folder_path is None:
-        app.logger.error("정적 폴더가 설정되지 않았습니다.")
-        return "Static folder not configured", 404
-
-    if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
-        return send_from_directory(static_folder_path, path)
-    else:
-        index_path = os.path.join(static_folder_path, 'index.html')
-        if os.path.exists(index_path):
-            return send_from_directory(static_folder_path, 'index.html')
+    # 모델(SQLAlchemy)과 확장 모듈은 `import main`이 아니라 앱을 만들 때 불러옵니다.
+    # (CLI 명령 탐색이나 `main` 모듈만 import하는 도구는 이 비용을 내지 않습니다)
+    from flask_cors import CORS
+    from src.models.user import db
+    import src.models.exercise_type  # noqa: F401 (테이블 등록)
+    import src.models.exercise_record  # noqa: F401
+    import src.models.exercise_record_deletion  # noqa: F401
+    import src.models.friendship  # noqa: F401
+    import src.models.friend_edge  # noqa: F401
+    import src.models.daily_exercise_rollup  # noqa: F401
+    from src.utils.cache import init_cache, get_friend_ids_cache, get_suggestions_cache, get_weekly_score_cache
+    from src.utils.global_stats import global_stats_snapshot
+    from src.utils.global_leaderboard import global_leaderboard
+    from src.utils.instrumentation import instrumentation
+    from src.utils.db_profile import configure_engine_options, init_db_profile
+    from src.utils.concurrency import query_executor
+    from src.utils.serialization import init_json_provider
+    from src.utils.static_assets import static_assets
+    from src.utils.compression import init_json_compression
+
+    app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
+    app.config.from_object(config_object)
+    init_json_provider(app)
+
+    # 로깅 설정
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]')
+    app.logger.info("애플리케이션 시작")
+
+    # CORS 설정 - 모든 도메인에서 접근 허용
+    CORS(app)
+
+    # 블루프린트 등록
+    register_blueprints(app)
+
+    # 데이터베이스 및 캐시 초기화
+    configure_engine_options(app)
+    db.init_app(app)
+    init_db_profile(app)
+    query_executor.init_app(app)
+    init_cache(app)
+
+    # 전체 통계 스냅샷과 전체 리더보드 인덱스 (갱신 스레드는 첫 요청 때 워커 프로세스에서 시작)
+    global_stats_snapshot.init_app(app)
+    global_leaderboard.init_app(app)
+
+    # 요청 계측 (INSTRUMENTATION_ENABLED가 켜져 있을 때만 등록, /api/metrics 제공)
+    instrumentation.init_app(app)
+
+    # 정적 자산 매니페스트/사전 압축, 큰 JSON 응답 gzip 압축
+    static_assets.init_app(app)
+    init_json_compression(app)
+
+    # 스키마 생성/마이그레이션은 시작 시가 아니라 `flask --app main init-db`로 명시적으로 실행합니다.
+    app.cli.add_command(init_db_command)
+    app.cli.add_command(rebuild_rollups_command)
+    app.cli.add_command(rebuild_friend_edges_command)
+    app.cli.add_command(rebuild_search_index_command)
+    app.cli.add_command(prune_deletions_command)
+
+    @app.route('/', defaults={'path': ''})
+    @app.route('/<path:path>')
+    def serve(path):
+        """
+        React 애플리케이션의 정적 파일들을 제공합니다.
+        요청된 경로에 파일이 존재하면 해당 파일을, 그렇지 않으면 index.html을 반환하여
+        클라이언트 사이드 라우팅을 지원합니다.
+
+        정적 자산 파이프라인이 켜져 있으면(STATIC_PIPELINE_ENABLED) 시작 시 만든 매니페스트에서
+        미리 압축된 변형과 캐시 헤더를 붙여 제공합니다.
+        """
+        if static_assets.enabled:
+            response = static_assets.serve(path)
+            if response is None:
+                app.logger.error("index.html 파일을 찾을 수 없습니다.")
+                return "index.html not found", 404
+            return response
+
+        static_folder_path = app.static_folder
+        if static_folder_path is None:
+            app.logger.error("정적 폴더가 설정되지 않았습니다.")
+            return "Static folder not configured", 404
+
+        if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
+            return send_from_directory(static_folder_path, path)
         else:
-            app.logger.error("index.html 파일을 찾을 수 없습니다.")
-            return "index.html not found", 404
-
-# 공통 에러 핸들러
-@app.errorhandler(NotFound)
-def handle_not_found(e):
-    """404 Not Found 에러를 처리합니다."""
-    app.logger.warning(f"요청한 리소스를 찾을 수 없습니다: {e.description}")
-    return jsonify(error=f"리소스를 찾을 수 없습니다: {e.description}"), 404
-
-@app.errorhandler(InternalServerError)
-def handle_internal_server_error(e):
-    """500 Internal Server Error를 처리합니다."""
-    app.logger.error(f"서버 내부 오류 발생: {e}")
-    return jsonify(error="서버 내부 오류가 발생했습니다."), 500
-
-@app.errorhandler(Exception)
-def handle_general_exception(e):
-    """처리되지 않은 모든 예외를 처리합니다."""
-    app.logger.error(f"예상치 못한 오류 발생: {e}", exc_info=True)
-    return jsonify(error=f"예상치 못한 오류가 발생했습니다: {str(e)}"), 500
-
-@app.route('/api/health')
-def health_check():
-    """API 서버의 상태를 확인하는 엔드포인트입니다."""
-    return {'status': 'healthy', 'message': '운동 강도 측정 API 서버가 정상 작동 중입니다.'}
+            index_path = os.path.join(static_folder_path, 'index.html')
+            if os.path.exists(index_path):
+                return send_from_directory(static_folder_path, 'index.html')
+            else:
+                app.logger.error("index.html 파일을 찾을 수 없습니다.")
+                return "index.html not found", 404
+
+    # 공통 에러 핸들러
+    @app.errorhandler(NotFound)
+    def handle_not_found(e):
+        """404 Not Found 에러를 처리합니다."""
+        app.logger.warning(f"요청한 리소스를 찾을 수 없습니다: {e.description}")
+        return jsonify(error=f"리소스를 찾을 수 없습니다: {e.description}"), 404
+
+    @app.errorhandler(InternalServerError)
+    def handle_internal_server_error(e):
+        """500 Internal Server Error를 처리합니다."""
+        app.logger.error(f"서버 내부 오류 발생: {e}")
+        return jsonify(error="서버 내부 오류가 발생했습니다."), 500
+
+    @app.errorhandler(Exception)
+    def handle_general_exception(e):
+        """처리되지 않은 모든 예외를 처리합니다."""
+        app.logger.error(f"예상치 못한 오류 발생: {e}", exc_info=True)
+        return jsonify(error=f"예상치 못한 오류가 발생했습니다: {str(e)}"), 500
+
+    @app.route('/api/health')
+    def health_check():
+        """API 서버의 상태를 확인하는 엔드포인트입니다."""
+        return {'status': 'healthy', 'message': '운동 강도 측정 API 서버가 정상 작동 중입니다.'}
+
+    @app.route('/api/cache/stats')
+    def cache_stats():
+        """주간 점수, 친구 ID 집합, 친구 추천 캐시의 적중/실패/제거 횟수와 전체 리더보드 인덱스 상태를 반환합니다."""
+        return {
+            'weekly_score': get_weekly_score_cache().stats(),
+            'friend_ids': get_friend_ids_cache().stats(),
+            'suggestions': get_suggestions_cache().stats(),
+            'global_leaderboard': global_leaderboard.stats()
+        }
+
+    return app
 
 if __name__ == '__main__':
+    app = create_app()
+    # 개발 서버는 편의를 위해 시작 시 데이터베이스를 초기화합니다.
+    with app.app_context():
+        from src.utils.migrations import init_database
+        init_database()
     app.run(host='0.0.0.0', port=5000, debug=True)
 
@@ -0,0 +1,75 @@
+import { API_BASE_URL, SETTINGS } from './constants';
+
+/**
+ * 운동 기록 목록의 로컬 사본과 증분 동기화 커서를 localStorage에 유지합니다.
+ * 전체 목록을 매번 다시 받는 대신 `/records/changes`로 마지막 동기화 이후의 변경(생성/수정, 삭제)만 받아 반영합니다.
+ */
+
+/**
+ * 저장된 목록과 커서를 읽습니다. 없거나 손상되었으면 빈 상태를 반환합니다.
+ * @returns {{records: Array<object>, since: string|null}}
+ */
+const loadSnapshot = () => {
+  try {
+    const snapshot = JSON.parse(localStorage.getItem(SETTINGS.RECORDS_SYNC_STORAGE_KEY));
+    if (snapshot && Array.isArray(snapshot.records)) {
+      return { records: snapshot.records, since: snapshot.since || null };
+    }
+  } catch (err) {
+    console.warn('저장된 운동 기록을 읽지 못해 전체 목록을 다시 받습니다.', err);
+  }
+  return { records: [], since: null };
+};
+
+/**
+ * 마지막으로 동기화한 운동 기록 목록을 반환합니다 (서버 응답을 기다리지 않고 먼저 표시하는 용도).
+ * @returns {Array<object>} 운동 기록 리스트
+ */
+export const getCachedRecords = () => loadSnapshot().records;
+
+/**
+ * 서버의 변경 내역을 로컬 목록에 반영하고, 최신 목록을 반환합니다.
+ * 커서가 없거나 서버가 커서 만료(410)를 알리면 전체 목록을 처음부터 다시 받습니다.
+ * @returns {Promise<Array<object>>} 동기화된 운동 기록 리스트
+ */
+export const syncRecords = async () => {
+  const snapshot = loadSnapshot();
+  const recordsById = new Map(snapshot.records.map(record => [record.id, record]));
+  let since = snapshot.since;
+  let hasMore = true;
+
+  while (hasMore) {
+    const query = since ? `?since=${encodeURIComponent(since)}` : '';
+    const response = await fetch(`${API_BASE_URL}/records/changes${query}`);
+
+    if (response.status === 410 && since) {
+      recordsById.clear();
+      since = null;
+      continue;
+    }
+    if (!response.ok) {
+      throw new Error(`HTTP 에러! 상태: ${response.status}`);
+    }
+
+    const result = await response.json();
+    if (result.status !== 'success') {
+      throw new Error(result.message);
+    }
+
+    // 같은 기록이 겹쳐서 다시 올 수 있으므로 ID 기준으로 덮어씁니다.
+    const { records, deleted, next_since: nextSince, has_more: more } = result.data;
+    records.forEach(record => recordsById.set(record.id, record));
+    deleted.forEach(id => recordsById.delete(id));
+    since = nextSince;
+    hasMore = more;
+  }
+
+  const records = [...recordsById.values()];
+  try {
+    localStorage.setItem(SETTINGS.RECORDS_SYNC_STORAGE_KEY, JSON.stringify({ records, since }));
+  } catch (err) {
+    // 저장 공간이 부족하면 다음 번에 전체 목록을 다시 받습니다.
+    console.warn('운동 기록을 저장하지 못했습니다.', err);
+  }
+  return records;
+};
@@ -0,0 +1,180 @@
+"""
+모든 API 라우트가 실행하는 SQL의 SQLite 실행 계획을 검사합니다.
+
+임시 SQLite 데이터베이스에 샘플 데이터를 만든 뒤 각 라우트를 테스트 클라이언트로 호출하고,
+그 과정에서 실행된 모든 SELECT/UPDATE/DELETE 문에 대해 `EXPLAIN QUERY PLAN`을 실행합니다.
+인덱스 없이 테이블 전체를 훑는 단계(`SCAN <table>`)가 하나라도 있으면 실패(종료 코드 1)합니다.
+
+실행: python scripts/check_query_plans.py
+"""
+import os
+import re
+import sys
+import tempfile
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from sqlalchemy import event
+from src.models.user import db, User
+from src.models.exercise_record import ExerciseRecord
+from src.models.exercise_record_deletion import ExerciseRecordDeletion  # noqa: F401 (테이블 등록)
+from src.models.friendship import Friendship
+from src.models.friend_edge import FriendEdge  # noqa: F401 (테이블 등록)
+from src.models.exercise_type import ExerciseType
+from src.models.daily_exercise_rollup import DailyExerciseRollup  # noqa: F401 (테이블 등록)
+from src.routes.exercise import exercise_bp
+from src.routes.friends import friends_bp
+from src.routes.statistics import statistics_bp
+from src.routes.records import records_bp
+from src.routes.leaderboard import leaderboard_bp
+from src.utils.catalog import encode_record_values
+from src.utils.migrations import ensure_indexes
+from src.utils.search import ensure_search_index
+from src.utils.friend_queries import rebuild_friend_edges
+from src.utils.rollup import rebuild_rollups
+
+# 'SCAN exercise_records' (SQLite 3.36+) 또는 'SCAN TABLE exercise_records' 형식
+FULL_SCAN_PATTERN = re.compile(r'^SCAN (?:TABLE )?(\w+)(?!.*\bUSING\b)')
+# 행 수가 운동 종류 수 정도로 작아 전체 스캔이 문제가 되지 않는 테이블 (카탈로그 로드, 이름 부분 일치)
+SMALL_TABLES = {ExerciseType.__tablename__}
+
+def route_calls(client, cursor_holder):
+    """검사할 라우트 호출 목록을 (이름, 호출 함수) 형태로 반환합니다."""
+    today = datetime.utcnow().date().isoformat()
+    return [
+        ('POST /exercises', lambda: client.post('/api/exercises', json={
+            'user_id': 1, 'date': today, 'time_of_day': '오전', 'intensity': 7, 'exercise_type': '러닝'
+        })),
+        ('POST /exercises/bulk', lambda: client.post('/api/exercises/bulk', json=[
+            {'user_id': 2, 'date': today, 'time_of_day': '야간', 'intensity': 4,
+             'exercise_type': '요가', 'client_key': f'sync-{i}'}
+            for i in range(3)
+        ])),
+        ('GET /exercises/<user_id>', lambda: client.get('/api/exercises/1')),
+        ('GET /exercises/<user_id> (filters)', lambda: client.get(
+            f'/api/exercises/1?start_date={today}&end_date={today}&exercise_type=러닝&limit=10')),
+        ('PUT /exercises/<record_id>', lambda: client.put('/api/exercises/1', json={'intensity': 5})),
+        ('DELETE /exercises/<record_id>', lambda: client.delete('/api/exercises/2')),
+        ('GET /records', lambda: client.get('/api/records')),
+        ('GET /records (page)', lambda: cursor_holder.update(
+            next=client.get('/api/records?limit=5').get_json()['meta']['next_cursor'])),
+        ('GET /records (cursor)', lambda: client.get(f"/api/records?limit=5&cursor={cursor_holder['next']}")),
+        ('GET /records (user filter)', lambda: client.get(f'/api/records?user_id=1&limit=5&start_date={today}')),
+        ('GET /records (indexed exercise_type)', lambda: client.get('/api/records?exercise_type=러닝머신&limit=5')),
+        ('GET /records/search', lambda: client.get('/api/records/search?q=러닝머신 5km')),
+        ('GET /records/search (user, short term)', lambda: client.get('/api/records/search?q=러닝&user_id=1')),
+        ('GET /records (ndjson)', lambda: client.get('/api/records?format=ndjson&user_id=1').get_data()),
+        ('GET /records/changes', lambda: cursor_holder.update(
+            since=client.get('/api/records/changes?limit=5').get_json()['data']['next_since'])),
+        ('GET /records/changes (since)', lambda: client.get(f"/api/records/changes?since={cursor_holder['since']}")),
+        ('GET /records/changes (user, since)', lambda: client.get(
+            f"/api/records/changes?user_id=2&since={cursor_holder['since']}")),
+        ('GET /statistics/<user_id>', lambda: [
+            client.get(f'/api/statistics/1?period={period}') for period in ('day', 'week', 'month', 'year')
+        ]),
+        ('GET /statistics/<user_id> (custom range)', lambda: client.get(
+            '/api/statistics/1?start=2020-01-01&end=2020-12-31&bucket=week')),
+        ('GET /statistics/compare', lambda: client.get('/api/statistics/compare/1/2?period=month')),
+        ('GET /statistics/global', lambda: client.get('/api/statistics/global')),
+        ('POST /friends/request', lambda: client.post('/api/friends/request', json={
+            'user_id': 1, 'friend_username': 'user9'
+        })),
+        ('POST /friends/accept', lambda: client.post('/api/friends/accept', json={'friendship_id': 10})),
+        ('GET /friends/<user_id>', lambda: client.get('/api/friends/1')),
+        ('GET /friends/<user_id> (page)', lambda: client.get('/api/friends/1?sort=name&limit=2&offset=50')),
+        ('GET /friends/leaderboard/<user_id>', lambda: client.get('/api/friends/leaderboard/1?around=2')),
+        ('GET /friends/leaderboard/<user_id> (window, as_of)', lambda: client.get(
+            f'/api/friends/leaderboard/1?window=30&as_of={today}')),
+        ('GET /friends/<user_id> (window)', lambda: client.get('/api/friends/1?window=90')),
+        ('GET /friends/suggestions/<user_id>', lambda: client.get('/api/friends/suggestions/1')),
+        ('GET /friends/suggestions/<user_id> (weighted)', lambda: client.get(
+            '/api/friends/suggestions/1?weighted=true')),
+        ('GET /leaderboard/global', lambda: client.get('/api/leaderboard/global?limit=5')),
+        ('GET /leaderboard/global (cohort)', lambda: client.get('/api/leaderboard/global?exercise_type=러닝')),
+        ('GET /leaderboard/global/<user_id>', lambda: client.get('/api/leaderboard/global/1')),
+        ('DELETE /friends/remove', lambda: client.delete('/api/friends/remove', json={
+            'user_id': 1, 'friend_id': 9
+        })),
+    ]
+
+def seed():
+    """라우트가 실제 데이터를 읽도록 사용자, 친구 관계, 운동 기록을 만듭니다."""
+    now = datetime.utcnow()
+    db.session.execute(User.__table__.insert(), [
+        {'id': uid, 'username': f'user{uid}', 'email': f'user{uid}@example.com'} for uid in range(1, 11)
+    ])
+    db.session.execute(Friendship.__table__.insert(), [
+        {'user_id': 1, 'friend_id': uid, 'status': 'accepted'} for uid in range(2, 6)
+    ] + [
+        {'user_id': uid, 'friend_id': 1, 'status': 'accepted'} for uid in range(6, 9)
+    ] + [
+        {'user_id': uid, 'friend_id': 10, 'status': 'accepted'} for uid in (2, 6)
+    ])
+    db.session.execute(ExerciseRecord.__table__.insert(), encode_record_values([
+        {
+            'user_id': uid, 'date': (now - timedelta(days=day)).date(), 'time_of_day': '오전',
+            'intensity': (uid + day) % 11, 'exercise_type': '러닝', 'created_at': now - timedelta(days=day)
+        }
+        for uid in range(1, 11) for day in range(20)
+    ]))
+    db.session.commit()
+    rebuild_friend_edges()
+    rebuild_rollups()
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(tmp_dir, 'plans.db')}"
+        app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        for blueprint in (exercise_bp, friends_bp, statistics_bp, records_bp, leaderboard_bp):
+            app.register_blueprint(blueprint, url_prefix='/api')
+        db.init_app(app)
+
+        with app.app_context():
+            db.create_all()
+            ensure_indexes()
+            ensure_search_index()
+            seed()
+            table_names = set(db.metadata.tables) - SMALL_TABLES
+
+            statements = []
+
+            def _capture(conn, cursor, statement, parameters, context, executemany):
+                if not executemany and statement.lstrip().upper().startswith(('SELECT', 'UPDATE', 'DELETE', 'WITH')):
+                    statements.append((statement, parameters))
+
+            event.listen(db.engine, 'before_cursor_execute', _capture)
+            client = app.test_client()
+            cursor_holder = {}
+            failures = []
+
+            for name, call in route_calls(client, cursor_holder):
+                statements.clear()
+                call()
+                raw = db.engine.raw_connection()
+                try:
+                    for statement, parameters in statements:
+                        cursor = raw.cursor()
+                        cursor.execute('EXPLAIN QUERY PLAN ' + statement, parameters)
+                        for row in cursor.fetchall():
+                            detail = row[-1]
+                            match = FULL_SCAN_PATTERN.match(detail)
+                            if match and match.group(1) in table_names:
+                                failures.append((name, detail, statement))
+                finally:
+                    raw.close()
+                print(f"검사 완료: {name} ({len(statements)}개 쿼리)")
+
+            event.remove(db.engine, 'before_cursor_execute', _capture)
+
+    if failures:
+        print(f"\n전체 테이블 스캔 {len(failures)}건 발견:")
+        for name, detail, statement in failures:
+            print(f"- [{name}] {detail}\n    {' '.join(statement.split())}")
+        sys.exit(1)
+    print("\n모든 라우트 쿼리가 인덱스를 사용합니다.")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+운동 기록을 쓴 직후 친구 목록과 친구 리더보드의 점수가 갱신되는지 검사합니다.
+
+오늘 기준 점수와 지난 날짜(`as_of`) 기준 점수를 각각 한 번 조회해 캐시가 채워질 기회를 준 뒤,
+그 구간에 포함되는 운동 기록을 추가/수정/삭제하고 같은 요청을 다시 보냅니다.
+두 번째 응답이 기록 변경을 반영하지 않으면 (캐시된 이전 점수를 반환하면) 실패(종료 코드 1)합니다.
+
+실행: python scripts/check_score_cache.py
+"""
+import os
+import sys
+import tempfile
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from flask import Flask
+from src.models.user import db, User
+from src.models.exercise_record import ExerciseRecord  # noqa: F401 (테이블 등록)
+from src.models.exercise_record_deletion import ExerciseRecordDeletion  # noqa: F401 (테이블 등록)
+from src.models.exercise_type import ExerciseType  # noqa: F401 (테이블 등록)
+from src.models.daily_exercise_rollup import DailyExerciseRollup  # noqa: F401 (테이블 등록)
+from src.models.friendship import Friendship
+from src.routes.exercise import exercise_bp
+from src.routes.friends import friends_bp
+from src.utils.friend_queries import rebuild_friend_edges
+
+USER_ID = 1
+FRIEND_ID = 2
+
+def friend_scores(client, as_of):
+    """
+    친구 리더보드, 이름순 친구 목록, 점수순 친구 목록에서 FRIEND_ID의 점수를 튜플로 반환합니다.
+
+    점수순 목록은 SQL에서 계산한 점수로 캐시를 다시 채우므로, 캐시를 읽는 두 경로를 먼저 호출합니다.
+    """
+    query = f'as_of={as_of.isoformat()}'
+    leaderboard = client.get(f'/api/friends/leaderboard/{USER_ID}?{query}').get_json()['data']['leaderboard']
+    scores = [next(entry['score'] for entry in leaderboard if entry['user_id'] == FRIEND_ID)]
+    for sort in ('name', 'score'):
+        friends = client.get(f'/api/friends/{USER_ID}?sort={sort}&{query}').get_json()['data']['friends']
+        scores.append(next(friend['score'] for friend in friends if friend['id'] == FRIEND_ID))
+    return tuple(scores)
+
+def seed():
+    db.session.execute(User.__table__.insert(), [
+        {'id': uid, 'username': f'user{uid}', 'email': f'user{uid}@example.com'} for uid in (USER_ID, FRIEND_ID)
+    ])
+    db.session.execute(Friendship.__table__.insert(), [
+        {'user_id': USER_ID, 'friend_id': FRIEND_ID, 'status': 'accepted'}
+    ])
+    db.session.commit()
+    rebuild_friend_edges()
+
+def main():
+    today = date.today()
+    yesterday = today - timedelta(days=1)
+    failures = []
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        app = Flask(__name__)
+        app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(tmp_dir, 'scores.db')}"
+        app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+        for blueprint in (exercise_bp, friends_bp):
+            app.register_blueprint(blueprint, url_prefix='/api')
+        db.init_app(app)
+
+        with app.app_context():
+            db.create_all()
+            seed()
+            client = app.test_client()
+            record_id = None
+
+            def create():
+                nonlocal record_id
+                record_id = client.post('/api/exercises', json={
+                    'user_id': FRIEND_ID, 'date': yesterday.isoformat(), 'time_of_day': '오전',
+                    'intensity': 8, 'exercise_type': '러닝'
+                }).get_json()['exercise_record']['id']
+
+            steps = [
+                ('POST /exercises', create, 8),
+                ('PUT /exercises/<record_id>', lambda: client.put(f'/api/exercises/{record_id}', json={'intensity': 3}), 3),
+                ('DELETE /exercises/<record_id>', lambda: client.delete(f'/api/exercises/{record_id}'), 0),
+            ]
+            for name, write, expected in steps:
+                for as_of in (today, yesterday):
+                    friend_scores(client, as_of)
+                write()
+                for as_of in (today, yesterday):
+                    scores = friend_scores(client, as_of)
+                    if scores != (expected,) * len(scores):
+                        failures.append((name, as_of, expected, scores))
+                print(f"검사 완료: {name}")
+
+    if failures:
+        print(f"\n기록 변경이 반영되지 않은 점수 {len(failures)}건 발견:")
+        for name, as_of, expected, (ranked, by_name, by_score) in failures:
+            print(f"- [{name}] as_of={as_of.isoformat()}: 기대값 {expected}, 리더보드 {ranked}, "
+                  f"친구 목록(이름순) {by_name}, 친구 목록(점수순) {by_score}")
+        sys.exit(1)
+    print("\n기록 변경 직후의 점수가 모든 기준일에서 최신입니다.")
+
+if __name__ == '__main__':
+    main()
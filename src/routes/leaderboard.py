@@ -0,0 +1,60 @@
+from flask import Blueprint, current_app, request
+from ..models.user import db, User
+from ..utils.db_profile import use_read_replica
+from ..utils.global_leaderboard import global_leaderboard
+from ..utils.response import api_success, api_error
+
+leaderboard_bp = Blueprint('leaderboard', __name__)
+
+MAX_LEADERBOARD_SIZE = 100
+
+@leaderboard_bp.route('/leaderboard/global', methods=['GET'])
+@use_read_replica
+def get_global_leaderboard():
+    """
+    전체 사용자(또는 운동 종류 코호트)의 기간 점수 상위 목록을 반환합니다.
+
+    점수는 GLOBAL_LEADERBOARD_WINDOW_DAYS(기본값 7일) 동안의 운동 강도 합계이며, 메모리의 순위 인덱스에서
+    조회하므로 사용자 수와 관계없이 빠릅니다. 동점자는 같은 순위를 받습니다.
+
+    쿼리 파라미터:
+    - limit (int, 선택): 반환할 최대 항목 수 (기본값 10, 최대 100).
+    - offset (int, 선택): 건너뛸 항목 수.
+    - exercise_type (str, 선택): 지정하면 기간 안에 이 운동을 기록한 사용자들 사이의 순위를 반환합니다.
+    """
+    try:
+        limit = request.args.get('limit', 10, type=int)
+        offset = request.args.get('offset', 0, type=int)
+        exercise_type = request.args.get('exercise_type') or None
+
+        if not 0 <= limit <= MAX_LEADERBOARD_SIZE or offset < 0:
+            return api_error(message=f"limit은 0-{MAX_LEADERBOARD_SIZE}, offset은 0 이상이어야 합니다.")
+
+        leaderboard = global_leaderboard.top(limit=limit, offset=offset, exercise_type=exercise_type)
+        return api_success(data=leaderboard, message="전체 리더보드 조회 성공")
+
+    except Exception as e:
+        current_app.logger.error(f"전체 리더보드 조회 중 오류 발생: {e}", exc_info=True)
+        return api_error(message="전체 리더보드 조회 중 서버 오류가 발생했습니다.", status_code=500)
+
+@leaderboard_bp.route('/leaderboard/global/<int:user_id>', methods=['GET'])
+@use_read_replica
+def get_global_rank(user_id):
+    """
+    사용자의 전체(또는 운동 종류 코호트) 순위, 점수, 백분위를 반환합니다.
+
+    쿼리 파라미터:
+    - exercise_type (str, 선택): 지정하면 해당 운동 종류 코호트 안에서의 순위를 반환합니다.
+
+    기간 점수가 0이거나 코호트에 속하지 않으면 rank와 percentile은 null입니다.
+    """
+    try:
+        if not db.session.get(User, user_id):
+            return api_error(message="사용자를 찾을 수 없습니다.", status_code=404)
+
+        rank = global_leaderboard.user_rank(user_id, exercise_type=request.args.get('exercise_type') or None)
+        return api_success(data=rank, message="전체 순위 조회 성공")
+
+    except Exception as e:
+        current_app.logger.error(f"사용자 {user_id}의 전체 순위 조회 중 오류 발생: {e}", exc_info=True)
+        return api_error(message="전체 순위 조회 중 서버 오류가 발생했습니다.", status_code=500)
@@ -1,22 +1,174 @@
-from flask import Blueprint, current_app
+from flask import Blueprint, Response, current_app, request, stream_with_context
 from ..models.exercise_record import ExerciseRecord
+from ..utils.db_helpers import apply_record_filters
+from ..utils.db_profile import use_read_replica
+from ..utils.pagination import InvalidCursorError, apply_keyset, encode_cursor
 from ..utils.response import api_success, api_error
+from ..utils.search import search_records
+from ..utils.serialization import dumps, project_records, record_row_to_dict
+from ..utils.sync import SyncCursorExpiredError, fetch_changes
 
 records_bp = Blueprint('records', __name__)
 
+MAX_PAGE_SIZE = 500
+STREAM_BATCH_SIZE = 1000
+
 @records_bp.route('/records', methods=['GET'])
+@use_read_replica
 def get_records():
     """
-    데이터베이스에 저장된 모든 운동 기록을 조회하여 반환합니다.
+    데이터베이스에 저장된 운동 기록을 최신순으로 조회하여 반환합니다.
+
+    쿼리 파라미터:
+    - user_id (int, 선택): 특정 사용자의 기록만 조회합니다.
+    - start_date, end_date (str, 선택): 운동 날짜 범위 (YYYY-MM-DD). `/exercises/<user_id>`와 동일합니다.
+    - exercise_type (str, 선택): 운동 종류 부분 일치 검색.
+    - limit (int, 선택): 페이지 크기 (최대 500). 지정하면 `meta.next_cursor`가 함께 반환됩니다.
+    - cursor (str, 선택): 이전 응답의 `meta.next_cursor` 값. (created_at, id) 키셋 페이지네이션에 사용됩니다.
+    - format (str, 선택): 'ndjson'이면 한 줄에 한 건씩 스트리밍합니다 (전체 내보내기용, 메모리 사용량 일정).
+
+    limit, cursor, format을 모두 생략하면 기존 클라이언트 호환을 위해 전체 목록을 반환합니다.
 
     Returns:
-        Response: 성공 시 모든 운동 기록 리스트를 JSON 형식으로 반환합니다.
-                  실패 시 500 에러와 함께 오류 메시지를 반환합니다.
+        Response: 성공 시 운동 기록 리스트를 JSON (또는 NDJSON) 형식으로 반환합니다.
+                  실패 시 400/500 에러와 함께 오류 메시지를 반환합니다.
     """
     try:
-        records = ExerciseRecord.query.order_by(ExerciseRecord.created_at.desc()).all()
-        record_list = [record.to_dict() for record in records]
-        return api_success(data=record_list, message="운동 기록 조회 성공")
+        limit = request.args.get('limit', type=int)
+        cursor = request.args.get('cursor')
+        response_format = request.args.get('format', 'json')
+        user_id = request.args.get('user_id', type=int)
+
+        if limit is not None and not (1 <= limit <= MAX_PAGE_SIZE):
+            return api_error(message=f"limit은 1-{MAX_PAGE_SIZE} 사이의 값이어야 합니다.")
+        if response_format not in ('json', 'ndjson'):
+            return api_error(message="format은 json 또는 ndjson이어야 합니다.")
+
+        query = ExerciseRecord.query
+        if user_id is not None:
+            query = query.filter(ExerciseRecord.user_id == user_id)
+        try:
+            query = apply_record_filters(
+                query,
+                request.args.get('start_date'),
+                request.args.get('end_date'),
+                request.args.get('exercise_type')
+            )
+            query = apply_keyset(query, ExerciseRecord.created_at, ExerciseRecord.id, cursor)
+        except (ValueError, InvalidCursorError) as e:
+            return api_error(message=str(e))
+
+        # 목록 응답은 ORM 객체를 만들지 않고 필요한 컬럼만 조회하여 직렬화합니다.
+        query = project_records(query)
+
+        if response_format == 'ndjson':
+            if limit is not None:
+                query = query.limit(limit)
+            return Response(stream_with_context(_stream_ndjson(query)), mimetype='application/x-ndjson')
+
+        if limit is None and cursor is None:
+            records = [record_row_to_dict(row) for row in query.all()]
+            return api_success(data=records, message="운동 기록 조회 성공")
+
+        # 다음 페이지 존재 여부를 알기 위해 한 건 더 조회합니다.
+        page_size = limit or MAX_PAGE_SIZE
+        records = [record_row_to_dict(row) for row in query.limit(page_size + 1).all()]
+        has_more = len(records) > page_size
+        records = records[:page_size]
+        next_cursor = encode_cursor(records[-1]['created_at'], records[-1]['id']) if has_more else None
+
+        return api_success(
+            data=records,
+            message="운동 기록 조회 성공",
+            meta={'limit': page_size, 'has_more': has_more, 'next_cursor': next_cursor}
+        )
     except Exception as e:
         current_app.logger.error(f"운동 기록 조회 중 데이터베이스 오류 발생: {e}", exc_info=True)
         return api_error(message="운동 기록을 불러오는 중 서버 오류가 발생했습니다.", status_code=500)
+
+@records_bp.route('/records/search', methods=['GET'])
+@use_read_replica
+def search_exercise_records():
+    """
+    운동 종류와 메모에서 검색어를 포함하는 운동 기록을 관련도 순으로 검색합니다.
+
+    SQLite FTS5 trigram 색인을 사용하므로 한글 단어의 일부(3글자 이상)로도 검색되며,
+    공백으로 구분한 여러 검색어는 모두 포함하는 기록만 찾습니다.
+
+    쿼리 파라미터:
+    - q (str, 필수): 검색어.
+    - user_id (int, 선택): 특정 사용자의 기록만 검색합니다.
+    - limit (int, 선택): 최대 결과 수 (기본값 50, 최대 500).
+
+    Returns:
+        Response: 성공 시 운동 기록 리스트(각 항목에 관련도 'relevance' 포함)를 반환합니다.
+    """
+    try:
+        query_text = request.args.get('q', '').strip()
+        user_id = request.args.get('user_id', type=int)
+        limit = request.args.get('limit', 50, type=int)
+
+        if not query_text:
+            return api_error(message="검색어(q)가 필요합니다.")
+        if not (1 <= limit <= MAX_PAGE_SIZE):
+            return api_error(message=f"limit은 1-{MAX_PAGE_SIZE} 사이의 값이어야 합니다.")
+
+        records = search_records(query_text, user_id=user_id, limit=limit)
+        return api_success(data=records, message="운동 기록 검색 성공", meta={'query': query_text, 'count': len(records)})
+    except Exception as e:
+        current_app.logger.error(f"운동 기록 검색 중 오류 발생: {e}", exc_info=True)
+        return api_error(message="운동 기록 검색 중 서버 오류가 발생했습니다.", status_code=500)
+
+@records_bp.route('/records/changes', methods=['GET'])
+def get_record_changes():
+    """
+    커서 이후에 생성/수정된 운동 기록과 삭제된 기록 ID를 반환합니다 (클라이언트 목록 증분 동기화용).
+
+    전체 목록을 다시 받는 대신, 클라이언트는 저장해 둔 목록에 `records`를 ID 기준으로 덮어쓰고
+    `deleted`의 ID를 제거한 뒤, `next_since`를 다음 요청의 since로 사용합니다.
+    `has_more`가 true이면 바로 다음 페이지를 요청합니다.
+
+    복제 지연 중에 커서가 앞서가지 않도록 읽기 전용 엔진이 아니라 기본 엔진에서 조회합니다.
+
+    쿼리 파라미터:
+    - since (str, 선택): 이전 응답의 `next_since` 값. 생략하면 전체 기록을 (updated_at, id) 순서로 반환합니다.
+    - user_id (int, 선택): 특정 사용자의 변경만 조회합니다.
+    - limit (int, 선택): 한 번에 반환할 최대 기록 수 (기본값 500, 최대 500).
+
+    Returns:
+        Response: 성공 시 {'records', 'deleted', 'next_since', 'has_more'}를 반환합니다.
+                  커서가 툼스톤 보존 기간보다 오래되었으면 410을 반환하며, 클라이언트는 since 없이 다시 동기화해야 합니다.
+    """
+    try:
+        limit = request.args.get('limit', MAX_PAGE_SIZE, type=int)
+        if not (1 <= limit <= MAX_PAGE_SIZE):
+            return api_error(message=f"limit은 1-{MAX_PAGE_SIZE} 사이의 값이어야 합니다.")
+
+        try:
+            changes = fetch_changes(
+                request.args.get('since'),
+                user_id=request.args.get('user_id', type=int),
+                limit=limit
+            )
+        except InvalidCursorError as e:
+            return api_error(message=str(e))
+        except SyncCursorExpiredError as e:
+            return api_error(message=str(e), status_code=410)
+
+        return api_success(data=changes, message="운동 기록 변경 내역 조회 성공")
+    except Exception as e:
+        current_app.logger.error(f"운동 기록 변경 내역 조회 중 오류 발생: {e}", exc_info=True)
+        return api_error(message="운동 기록 변경 내역을 불러오는 중 서버 오류가 발생했습니다.", status_code=500)
+
+def _stream_ndjson(query):
+    """
+    쿼리 결과를 `yield_per` 배치 단위로 읽어 NDJSON 줄로 내보내는 제너레이터입니다.
+
+    한 번에 배치 하나 분량의 행만 메모리에 유지됩니다.
+    """
+    try:
+        for row in query.yield_per(STREAM_BATCH_SIZE):
+            yield dumps(record_row_to_dict(row)) + '\n'
+    except Exception as e:
+        # 응답 헤더가 이미 전송되었으므로 로그만 남기고 스트림을 종료합니다.
+        current_app.logger.error(f"운동 기록 스트리밍 중 오류 발생: {e}", exc_info=True)
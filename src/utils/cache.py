@@ -0,0 +1,290 @@
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+logger = logging.getLogger(__name__)
+
+class CacheBackend:
+    """
+    캐시 백엔드 인터페이스입니다.
+
+    `get`은 (적중 여부, 값) 튜플을 반환하여 None 값도 캐시할 수 있게 합니다.
+    """
+
+    def get(self, key):
+        raise NotImplementedError
+
+    def set(self, key, value):
+        raise NotImplementedError
+
+    def set_many(self, items):
+        for key, value in items.items():
+            self.set(key, value)
+
+    def delete(self, key):
+        raise NotImplementedError
+
+    def clear(self):
+        raise NotImplementedError
+
+    def stats(self):
+        raise NotImplementedError
+
+class LRUTTLCache(CacheBackend):
+    """
+    프로세스 내 LRU + TTL 캐시입니다.
+
+    항목 수가 `max_size`를 넘으면 가장 오래 사용되지 않은 항목부터 제거(eviction)하고,
+    `ttl`초가 지난 항목은 조회 시 만료 처리합니다. 여러 스레드에서 안전하게 사용할 수 있습니다.
+
+    Args:
+        max_size: 최대 항목 수.
+        ttl: 항목 유효 시간(초). None이면 만료되지 않습니다.
+    """
+
+    def __init__(self, max_size=10000, ttl=60):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                self.misses += 1
+                return False, None
+            value, expires_at = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._items[key]
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+            self._items.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def set(self, key, value):
+        expires_at = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            self._items[key] = (value, expires_at)
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._items.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': 'local',
+                'size': len(self._items),
+                'max_size': self.max_size,
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations
+            }
+
+class LocalSharedClient:
+    """
+    공유 캐시 서버(Redis 등) 클라이언트를 대신하는 프로세스 내 대체 구현입니다.
+
+    `get(key)`, `set(key, value, ex=None)`, `delete(key)`, `flushdb()`만 사용하는
+    최소 인터페이스를 제공하므로, 개발 환경에서는 실제 서버 없이 `SharedCacheBackend`를 사용할 수 있습니다.
+    """
+
+    def __init__(self):
+        self._items = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._items[key]
+                return None
+            return value
+
+    def set(self, key, value, ex=None):
+        with self._lock:
+            self._items[key] = (value, time.monotonic() + ex if ex else None)
+
+    def delete(self, key):
+        with self._lock:
+            self._items.pop(key, None)
+
+    def flushdb(self):
+        with self._lock:
+            self._items.clear()
+
+class SharedCacheBackend(CacheBackend):
+    """
+    여러 워커 프로세스가 공유하는 캐시 백엔드입니다.
+
+    값은 JSON으로 직렬화되어 저장되며, 만료는 클라이언트의 TTL(`ex`) 기능에 맡깁니다.
+    공유 서버에서는 LRU 제거가 서버 정책에 따르므로 eviction 카운터는 집계하지 않습니다.
+
+    Args:
+        client: `LocalSharedClient`와 같은 인터페이스를 가진 클라이언트 (예: redis.Redis).
+        ttl: 항목 유효 시간(초).
+        prefix: 다른 애플리케이션과 키가 겹치지 않도록 붙이는 접두사.
+    """
+
+    def __init__(self, client, ttl=60, prefix='exercise-app:'):
+        self.client = client
+        self.ttl = ttl
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        raw = self.client.get(self.prefix + key)
+        with self._lock:
+            if raw is None:
+                self.misses += 1
+                return False, None
+            self.hits += 1
+        return True, json.loads(raw)
+
+    def set(self, key, value):
+        self.client.set(self.prefix + key, json.dumps(value), ex=self.ttl)
+
+    def delete(self, key):
+        self.client.delete(self.prefix + key)
+
+    def clear(self):
+        self.client.flushdb()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': 'shared',
+                'ttl_seconds': self.ttl,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': 0
+            }
+
+def create_cache_backend(config):
+    """
+    앱 설정으로부터 캐시 백엔드를 생성합니다.
+
+    설정 키:
+    - CACHE_BACKEND: 'local'(기본값) 또는 'shared'.
+    - CACHE_MAX_SIZE, CACHE_TTL_SECONDS: 크기와 유효 시간.
+    - CACHE_SHARED_URL: 'shared' 백엔드에서 사용할 Redis URL. redis 패키지가 없거나
+      URL이 없으면 프로세스 내 대체 클라이언트를 사용합니다.
+
+    Args:
+        config: Flask 앱 설정 (dict 형태).
+
+    Returns:
+        CacheBackend: 생성된 캐시 백엔드.
+    """
+    ttl = config.get('CACHE_TTL_SECONDS', 60)
+    if config.get('CACHE_BACKEND', 'local') != 'shared':
+        return LRUTTLCache(max_size=config.get('CACHE_MAX_SIZE', 10000), ttl=ttl)
+
+    client = None
+    url = config.get('CACHE_SHARED_URL')
+    if url:
+        try:
+            import redis
+            client = redis.Redis.from_url(url)
+        except ImportError:
+            logger.warning("redis 패키지가 설치되지 않아 프로세스 내 공유 캐시 대체 구현을 사용합니다.")
+    return SharedCacheBackend(client or LocalSharedClient(), ttl=ttl)
+
+# 기간별(주간 등) 점수, 사용자별 친구 ID 집합, 친구 추천 캐시 (init_cache로 앱 설정에 맞게 교체됩니다)
+weekly_score_cache = LRUTTLCache()
+friend_ids_cache = LRUTTLCache()
+suggestions_cache = LRUTTLCache()
+
+def init_cache(app):
+    """
+    앱 설정에 따라 주간 점수, 친구 ID 집합, 친구 추천 캐시 백엔드를 초기화합니다.
+
+    Args:
+        app: Flask 앱.
+    """
+    global weekly_score_cache, friend_ids_cache, suggestions_cache
+    weekly_score_cache = create_cache_backend(app.config)
+    friend_ids_cache = create_cache_backend(app.config)
+    suggestions_cache = create_cache_backend(app.config)
+    app.logger.info(f"주간 점수 캐시 초기화: {weekly_score_cache.stats()['backend']}")
+
+def get_weekly_score_cache():
+    """현재 사용 중인 점수 캐시 백엔드를 반환합니다 (주간 점수와 30일/90일 점수를 함께 저장)."""
+    return weekly_score_cache
+
+def score_key(user_id, days, as_of):
+    return f'score:{user_id}:{days}:{as_of.isoformat()}'
+
+def invalidate_scores(user_ids):
+    """
+    사용자들의 캐시된 오늘 기준 기간 점수를 모두 삭제합니다. 운동 기록 변경이 커밋된 뒤 호출합니다.
+
+    오늘이 아닌 기준일의 점수는 캐시하지 않으므로 (`scores.get_window_scores`) 지울 키가 없습니다.
+
+    Args:
+        user_ids: 사용자 ID의 iterable.
+    """
+    from .scores import SCORE_WINDOWS, score_as_of
+    as_of = score_as_of()
+    for user_id in set(user_ids):
+        for days in SCORE_WINDOWS:
+            weekly_score_cache.delete(score_key(user_id, days, as_of))
+
+def get_friend_ids_cache():
+    """현재 사용 중인 친구 ID 집합 캐시 백엔드를 반환합니다."""
+    return friend_ids_cache
+
+def friend_ids_key(user_id):
+    return f'friend_ids:{user_id}'
+
+def invalidate_friend_ids(user_ids):
+    """
+    사용자들의 캐시된 친구 ID 집합을 삭제합니다. 친구 관계 변경이 커밋된 뒤 호출합니다.
+
+    Args:
+        user_ids: 사용자 ID의 iterable.
+    """
+    for user_id in set(user_ids):
+        friend_ids_cache.delete(friend_ids_key(user_id))
+
+def get_suggestions_cache():
+    """현재 사용 중인 친구 추천 캐시 백엔드를 반환합니다."""
+    return suggestions_cache
+
+def suggestions_key(user_id, weighted):
+    return f"suggestions:{user_id}:{'weighted' if weighted else 'mutual'}"
+
+def invalidate_suggestions(user_ids):
+    """
+    사용자들의 캐시된 친구 추천 목록을 (가중치 사용 여부와 관계없이) 삭제합니다.
+
+    Args:
+        user_ids: 사용자 ID의 iterable.
+    """
+    for user_id in set(user_ids):
+        for weighted in (False, True):
+            suggestions_cache.delete(suggestions_key(user_id, weighted))
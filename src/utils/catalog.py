@@ -0,0 +1,151 @@
+import threading
+from sqlalchemy import event, select
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+from ..models.user import db
+from ..models.exercise_type import ExerciseType
+
+# 시간대 코드. 코드 0은 목록에 없는 기존 값(자유 입력 시절의 데이터)을 백필할 때만 사용합니다.
+TIME_OF_DAY_LABELS = ('기타', '오전', '오후', '야간', '틈틈이')
+TIME_OF_DAY_CODES = {label: code for code, label in enumerate(TIME_OF_DAY_LABELS)}
+OTHER_TIME_OF_DAY_CODE = 0
+
+# 현재 트랜잭션에서 새로 추가한 운동 종류 ({이름: ID})를 보관하는 세션 info 키
+PENDING_KEY = 'pending_exercise_types'
+
+def time_of_day_code(label):
+    """시간대 라벨을 코드로 바꿉니다. 알 수 없는 라벨은 '기타'(0)로 바꿉니다."""
+    return TIME_OF_DAY_CODES.get(label, OTHER_TIME_OF_DAY_CODE)
+
+def time_of_day_label(code):
+    """시간대 코드를 라벨로 바꿉니다."""
+    return TIME_OF_DAY_LABELS[code] if code is not None else None
+
+class ExerciseTypeCatalog:
+    """
+    운동 종류 이름 ↔ ID를 프로세스 안에 인터닝해 두는 캐시입니다.
+
+    이름과 ID의 대응은 한 번 만들어지면 바뀌지 않으므로 무효화가 필요 없습니다.
+    다만 아직 커밋되지 않은 트랜잭션에서 추가한 항목은 롤백되면 ID가 재사용될 수 있으므로,
+    세션의 `PENDING_KEY`에 따로 두었다가 커밋된 뒤에 캐시에 옮깁니다.
+    """
+
+    def __init__(self):
+        self._ids = {}
+        self._names = {}
+        self._lock = threading.Lock()
+
+    def remember(self, pairs):
+        """커밋된 (ID, 이름) 쌍들을 캐시에 저장합니다."""
+        with self._lock:
+            for type_id, name in pairs:
+                self._ids[name] = type_id
+                self._names[type_id] = name
+
+    def _pending(self):
+        return db.session.info.setdefault(PENDING_KEY, {})
+
+    def load(self):
+        """카탈로그 전체를 읽어 캐시를 채웁니다. 카탈로그는 운동 종류 수만큼만 행이 있으므로 작습니다."""
+        pending = self._pending()
+        rows = db.session.execute(select(ExerciseType.id, ExerciseType.name)).all()
+        self.remember((type_id, name) for type_id, name in rows if name not in pending)
+
+    def name_of(self, type_id):
+        """
+        운동 종류 ID를 이름으로 바꿉니다. 캐시에 없으면 카탈로그를 다시 읽습니다.
+
+        Returns:
+            str: 운동 종류 이름. 없는 ID이면 None.
+        """
+        if type_id is None:
+            return None
+        name = self._names.get(type_id)
+        if name is None:
+            for pending_name, pending_id in self._pending().items():
+                if pending_id == type_id:
+                    return pending_name
+            self.load()
+            name = self._names.get(type_id)
+        return name
+
+    def ids_for(self, names):
+        """
+        운동 종류 이름들을 ID로 바꿉니다. 카탈로그에 없는 이름은 현재 트랜잭션 안에서 추가합니다.
+
+        Args:
+            names: 운동 종류 이름의 iterable.
+
+        Returns:
+            dict: {이름: ID}.
+        """
+        names = set(names)
+        result = {name: self._ids[name] for name in names if name in self._ids}
+        missing = names - result.keys()
+        if not missing:
+            return result
+
+        pending = self._pending()
+        result.update({name: pending[name] for name in missing if name in pending})
+        missing -= result.keys()
+        if missing:
+            rows = db.session.execute(
+                select(ExerciseType.id, ExerciseType.name).where(ExerciseType.name.in_(missing))
+            ).all()
+            self.remember(rows)
+            result.update({name: type_id for type_id, name in rows})
+            missing -= result.keys()
+        if missing:
+            # 다른 워커가 같은 이름을 먼저 추가했어도 실패하지 않도록 충돌을 무시하고 다시 조회합니다.
+            db.session.execute(
+                sqlite_insert(ExerciseType).on_conflict_do_nothing(index_elements=['name']),
+                [{'name': name} for name in sorted(missing)]
+            )
+            rows = db.session.execute(
+                select(ExerciseType.id, ExerciseType.name).where(ExerciseType.name.in_(missing))
+            ).all()
+            pending.update({name: type_id for type_id, name in rows})
+            result.update({name: type_id for type_id, name in rows})
+        return result
+
+    def id_of(self, name):
+        """운동 종류 이름 하나를 ID로 바꿉니다 (없으면 추가)."""
+        return self.ids_for([name])[name]
+
+    def clear(self):
+        with self._lock:
+            self._ids.clear()
+            self._names.clear()
+
+# 앱 전역에서 사용하는 운동 종류 카탈로그 캐시
+exercise_type_catalog = ExerciseTypeCatalog()
+
+@event.listens_for(Session, 'after_commit')
+def _promote_pending_exercise_types(session):
+    pending = session.info.pop(PENDING_KEY, None)
+    if pending:
+        exercise_type_catalog.remember((type_id, name) for name, type_id in pending.items())
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_pending_exercise_types(session):
+    session.info.pop(PENDING_KEY, None)
+
+def encode_record_values(rows):
+    """
+    운동 기록 값 딕셔너리들의 'exercise_type', 'time_of_day' 이름을 저장용 ID/코드로 바꾼
+    새 딕셔너리 리스트를 반환합니다. Core executemany INSERT에 사용합니다.
+
+    Args:
+        rows: 'exercise_type', 'time_of_day' 키를 가진 딕셔너리 리스트.
+
+    Returns:
+        list: 'exercise_type_id', 'time_of_day_code' 키를 가진 딕셔너리 리스트.
+    """
+    type_ids = exercise_type_catalog.ids_for(row['exercise_type'] for row in rows)
+    encoded = []
+    for row in rows:
+        values = dict(row)
+        values['exercise_type_id'] = type_ids[values.pop('exercise_type')]
+        values['time_of_day_code'] = time_of_day_code(values.pop('time_of_day'))
+        encoded.append(values)
+    return encoded
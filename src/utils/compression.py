@@ -0,0 +1,37 @@
+import gzip
+from flask import request
+
+def init_json_compression(app):
+    """
+    JSON_GZIP_MIN_BYTES보다 큰 JSON API 응답을 gzip으로 압축하는 after_request 훅을 등록합니다.
+
+    클라이언트가 Accept-Encoding으로 gzip을 허용한 경우에만 압축하며, 스트리밍 응답(NDJSON 등)과
+    이미 인코딩된 응답은 건드리지 않습니다. JSON_GZIP_MIN_BYTES가 0이면 등록하지 않습니다.
+
+    Args:
+        app: Flask 앱.
+    """
+    min_bytes = app.config.get('JSON_GZIP_MIN_BYTES', 4096)
+    if not min_bytes:
+        return
+    level = app.config.get('JSON_GZIP_LEVEL', 5)
+
+    @app.after_request
+    def compress_json_response(response):
+        if (response.mimetype != 'application/json'
+                or response.status_code != 200
+                or response.direct_passthrough
+                or response.is_streamed
+                or 'Content-Encoding' in response.headers):
+            return response
+
+        response.vary.add('Accept-Encoding')
+        if request.accept_encodings.best_match(['gzip']) is None:
+            return response
+        data = response.get_data()
+        if len(data) < min_bytes:
+            return response
+
+        response.set_data(gzip.compress(data, compresslevel=level))
+        response.headers['Content-Encoding'] = 'gzip'
+        return response
@@ -0,0 +1,67 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from flask import current_app, g, has_app_context
+from ..models.user import db
+
+class QueryExecutor:
+    """
+    서로 독립적인 DB 조회를 제한된 크기의 스레드 풀에서 동시에 실행합니다.
+
+    각 작업은 자신의 앱 컨텍스트(따라서 별도의 세션과 커넥션)에서 실행되며, 호출한 요청의
+    읽기 전용 라우팅 표시(`use_read_replica`)를 그대로 이어받습니다.
+    풀 크기(DB_QUERY_CONCURRENCY)가 1 이하이거나 인메모리 SQLite처럼 커넥션 하나를 공유하는
+    데이터베이스에서는 호출한 스레드에서 순서대로 실행합니다.
+    """
+
+    def __init__(self):
+        self.max_workers = 1
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """
+        앱 설정에서 풀 크기를 읽습니다. 스레드 풀은 처음 사용할 때 만들어집니다.
+
+        Args:
+            app: Flask 앱.
+        """
+        self.max_workers = app.config.get('DB_QUERY_CONCURRENCY', 4)
+        with app.app_context():
+            if db.engine.url.get_backend_name() == 'sqlite' and db.engine.url.database in (None, '', ':memory:'):
+                self.max_workers = 1
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='db-query')
+            return self._executor
+
+    def gather(self, *funcs):
+        """
+        인자 없는 함수들을 동시에 실행하고 결과를 같은 순서의 리스트로 반환합니다.
+
+        앱 컨텍스트 안에서 호출해야 하며, 작업 중 하나라도 예외를 던지면 그 예외를 다시 던집니다.
+
+        Args:
+            *funcs: 실행할 함수들 (각각 독립적인 조회여야 합니다).
+
+        Returns:
+            list: 각 함수의 반환값.
+        """
+        if self.max_workers <= 1 or len(funcs) < 2 or not has_app_context():
+            return [func() for func in funcs]
+
+        app = current_app._get_current_object()
+        use_read_replica = g.get('_use_read_replica', False)
+
+        def run(func):
+            with app.app_context():
+                g._use_read_replica = use_read_replica
+                return func()
+
+        executor = self._get_executor()
+        futures = [executor.submit(run, func) for func in funcs]
+        return [future.result() for future in futures]
+
+# 앱 전역에서 사용하는 조회 실행기 (init_app으로 초기화)
+query_executor = QueryExecutor()
@@ -1,24 +1,38 @@
-from datetime import datetime, timedelta
-from ..models.user import db
 from ..models.exercise_record import ExerciseRecord
+from .search import exercise_type_filter
+from .validation import parse_iso_date
 
-def get_user_weekly_score(user_id):
+def apply_record_filters(query, start_date=None, end_date=None, exercise_type=None):
     """
-    특정 사용자의 최근 7일간의 운동 강도 총합(주간 점수)을 계산합니다.
+    운동 기록 쿼리에 공통 필터(날짜 범위, 운동 종류)를 적용합니다.
 
     Args:
-        user_id: 점수를 계산할 사용자의 ID.
+        query: ExerciseRecord 쿼리.
+        start_date: 시작 날짜 문자열 (YYYY-MM-DD, 포함).
+        end_date: 종료 날짜 문자열 (YYYY-MM-DD, 포함).
+        exercise_type: 운동 종류 검색어 (부분 일치). 운동 종류 카탈로그에서 일치하는 ID로 비교합니다.
 
     Returns:
-        int: 계산된 주간 점수. 기록이 없으면 0을 반환합니다.
+        Query: 필터가 적용된 쿼리.
+
+    Raises:
+        ValueError: 날짜 형식이 올바르지 않은 경우. 메시지는 클라이언트에 그대로 전달할 수 있습니다.
     """
-    week_ago = datetime.now() - timedelta(days=7)
+    if start_date:
+        try:
+            start_date_obj = parse_iso_date(start_date)
+        except ValueError:
+            raise ValueError('시작 날짜 형식이 올바르지 않습니다.')
+        query = query.filter(ExerciseRecord.date >= start_date_obj)
+
+    if end_date:
+        try:
+            end_date_obj = parse_iso_date(end_date)
+        except ValueError:
+            raise ValueError('종료 날짜 형식이 올바르지 않습니다.')
+        query = query.filter(ExerciseRecord.date <= end_date_obj)
 
-    weekly_score = db.session.query(
-        db.func.sum(ExerciseRecord.intensity)
-    ).filter(
-        ExerciseRecord.user_id == user_id,
-        ExerciseRecord.created_at >= week_ago
-    ).scalar() or 0
+    if exercise_type:
+        query = query.filter(exercise_type_filter(exercise_type))
 
-    return weekly_score
+    return query
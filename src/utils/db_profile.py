@@ -0,0 +1,130 @@
+from functools import wraps
+from flask import Response, current_app, g, has_app_context
+from flask_sqlalchemy.session import Session
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+READ_BIND_KEY = 'read'
+
+class RoutingSession(Session):
+    """
+    읽기 전용으로 표시된 요청의 조회 쿼리를 읽기 전용 엔진으로 보내는 세션입니다.
+
+    `SQLALCHEMY_BINDS['read']`가 설정되어 있고 현재 요청이 `use_read_replica`로 표시된 경우,
+    flush(쓰기) 중이 아닌 모든 쿼리는 읽기 전용 엔진의 커넥션을 사용합니다.
+    설정이 없으면 기본 엔진을 그대로 사용합니다.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None and not self._flushing and has_app_context() and g.get('_use_read_replica'):
+            read_engine = current_app.extensions['sqlalchemy'].engines.get(READ_BIND_KEY)
+            if read_engine is not None:
+                return read_engine
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+def use_read_replica(f):
+    """
+    라우트의 조회 쿼리를 읽기 전용 엔진으로 보내도록 표시하는 데코레이터입니다.
+
+    통계, 기록 목록, 리더보드처럼 쓰기가 없는 라우트에만 사용해야 합니다.
+    스트리밍 응답은 뷰가 반환된 뒤에 본문을 생성하며 조회하므로, 응답이 닫힐 때까지 표시를 유지합니다.
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        g._use_read_replica = True
+        streamed = False
+        try:
+            response = f(*args, **kwargs)
+            if isinstance(response, Response) and response.is_streamed:
+                response.call_on_close(_clear_read_replica)
+                streamed = True
+            return response
+        finally:
+            if not streamed:
+                _clear_read_replica()
+    return decorated_function
+
+def _clear_read_replica():
+    if has_app_context():
+        g._use_read_replica = False
+
+def apply_sqlite_pragmas(engine, pragmas):
+    """
+    SQLite 엔진의 새 커넥션마다 PRAGMA 설정을 적용하도록 이벤트를 등록합니다.
+
+    Args:
+        engine: SQLAlchemy 엔진. SQLite가 아니면 아무것도 하지 않습니다.
+        pragmas: {'journal_mode': 'WAL', 'busy_timeout': 5000, ...} 형태의 딕셔너리.
+    """
+    if engine.dialect.name != 'sqlite' or not pragmas:
+        return
+
+    @event.listens_for(engine, 'connect')
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
+
+def is_file_sqlite(url):
+    """URL이 파일에 저장되는 SQLite 데이터베이스인지 확인합니다 (인메모리 DB는 False)."""
+    if not url:
+        return False
+    url = make_url(url)
+    return url.get_backend_name() == 'sqlite' and url.database not in (None, '', ':memory:') \
+        and url.query.get('mode') != 'memory'
+
+def pool_engine_options(pool_size, busy_timeout_ms):
+    """
+    tuned 프로필에서 파일 SQLite 엔진에 사용하는 커넥션 풀 설정을 반환합니다.
+
+    Args:
+        pool_size: 유지할 커넥션 수 (DB_POOL_SIZE). 최대 두 배까지 추가로 열 수 있습니다.
+        busy_timeout_ms: 잠금 대기 시간(밀리초, DB_BUSY_TIMEOUT_MS).
+    """
+    return {
+        'poolclass': QueuePool,
+        'pool_size': pool_size,
+        'max_overflow': pool_size * 2,
+        'pool_timeout': 30,
+        'pool_pre_ping': True,
+        'connect_args': {'check_same_thread': False, 'timeout': busy_timeout_ms / 1000}
+    }
+
+def configure_engine_options(app):
+    """
+    tuned 프로필이면 기본 엔진의 커넥션 풀 설정(SQLALCHEMY_ENGINE_OPTIONS)을 채웁니다.
+
+    `db.init_app(app)` 이전에 호출해야 합니다. 파일 SQLite에만 적용하며, 인메모리 DB는
+    커넥션마다 별도의 빈 데이터베이스가 되므로 Flask-SQLAlchemy 기본 풀(StaticPool)을 그대로 사용합니다.
+    SQLALCHEMY_ENGINE_OPTIONS를 직접 지정한 경우에는 건드리지 않습니다.
+
+    Args:
+        app: Flask 앱.
+    """
+    if app.config.get('DB_PROFILE') != 'tuned' or app.config.get('SQLALCHEMY_ENGINE_OPTIONS'):
+        return
+    if is_file_sqlite(app.config.get('SQLALCHEMY_DATABASE_URI')):
+        app.config['SQLALCHEMY_ENGINE_OPTIONS'] = pool_engine_options(
+            app.config.get('DB_POOL_SIZE', 10), app.config.get('DB_BUSY_TIMEOUT_MS', 5000)
+        )
+
+def init_db_profile(app):
+    """
+    앱 설정의 데이터베이스 프로필(SQLITE_PRAGMAS)을 모든 엔진(기본, 읽기 전용)에 적용합니다.
+
+    `db.init_app(app)` 이후, 첫 커넥션이 만들어지기 전에 호출해야 합니다.
+
+    Args:
+        app: Flask 앱.
+    """
+    pragmas = app.config.get('SQLITE_PRAGMAS') or {}
+    with app.app_context():
+        engines = app.extensions['sqlalchemy'].engines
+        for engine in engines.values():
+            apply_sqlite_pragmas(engine, pragmas)
+    if READ_BIND_KEY in (app.config.get('SQLALCHEMY_BINDS') or {}):
+        app.logger.info("읽기 전용 데이터베이스 라우팅이 활성화되었습니다.")
@@ -0,0 +1,92 @@
+import hashlib
+from datetime import date
+from functools import wraps
+from flask import current_app, make_response, request
+from sqlalchemy import func, update
+from ..models.user import db, User
+from .friend_queries import get_friend_ids
+
+def bump_data_versions(user_ids):
+    """
+    사용자들의 데이터 버전을 1씩 올립니다.
+
+    운동 기록이나 친구 관계를 변경하는 트랜잭션 안에서 커밋 전에 호출하여,
+    변경 내용과 버전 증가가 함께 커밋되도록 합니다.
+
+    Args:
+        user_ids: 사용자 ID의 iterable.
+    """
+    user_ids = set(user_ids)
+    if not user_ids:
+        return
+    db.session.execute(
+        update(User)
+        .where(User.id.in_(user_ids))
+        # onupdate로 프로필 수정 시각이 바뀌지 않도록 updated_at은 그대로 유지합니다.
+        .values(data_version=User.data_version + 1, updated_at=User.updated_at)
+        .execution_options(synchronize_session=False)
+    )
+
+def data_version_fingerprint(user_ids, include_friends=False):
+    """
+    사용자들(및 선택적으로 첫 번째 사용자의 친구들)의 데이터 버전 요약을 조회합니다.
+
+    버전은 증가만 하므로 (사용자 수, 버전 합계)는 관련 데이터가 바뀔 때마다 달라집니다.
+    users 테이블의 기본 키만 읽으므로 집계 쿼리보다 훨씬 가볍습니다.
+
+    Args:
+        user_ids: 사용자 ID 리스트.
+        include_friends: True이면 `user_ids[0]`의 수락된 친구들도 포함합니다.
+
+    Returns:
+        tuple: (사용자 수, 데이터 버전 합계).
+    """
+    target_ids = set(user_ids)
+    if include_friends:
+        # 캐시된 친구 ID 집합을 사용합니다. 친구 관계가 바뀌면 본인의 버전도 함께 증가합니다.
+        target_ids |= get_friend_ids(user_ids[0])
+    count, version_sum = db.session.query(
+        func.count(User.id), func.coalesce(func.sum(User.data_version), 0)
+    ).filter(User.id.in_(target_ids)).one()
+    return count, int(version_sum)
+
+def compute_etag(*parts):
+    """요청 경로, 쿼리 파라미터와 주어진 값들로부터 ETag 값을 만듭니다."""
+    query = sorted(request.args.items(multi=True))
+    digest = hashlib.blake2b(repr((request.path, query) + parts).encode('utf-8'), digest_size=12)
+    return digest.hexdigest()
+
+def conditional_get(user_args=('user_id',), include_friends=False):
+    """
+    데이터 버전 기반 약한 ETag로 조건부 GET을 처리하는 데코레이터입니다.
+
+    `If-None-Match`가 현재 ETag와 일치하면 뷰(집계 쿼리)를 실행하지 않고 304를 반환합니다.
+    ETag는 대상 사용자들의 데이터 버전, 요청 쿼리 파라미터, 오늘 날짜(기간 통계와 점수의 기준일)로 만들어집니다.
+    점수와 통계는 운동 날짜 단위로 집계되므로, 기록이 바뀌거나 날짜가 바뀔 때만 ETag가 달라집니다.
+
+    Args:
+        user_args: 대상 사용자 ID를 담은 URL 인자 이름들.
+        include_friends: True이면 첫 번째 사용자의 친구들의 데이터 버전도 포함합니다 (친구 목록, 리더보드).
+    """
+    def decorator(view):
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            if not current_app.config.get('ETAG_ENABLED', True):
+                return view(*args, **kwargs)
+
+            parts = data_version_fingerprint([kwargs[name] for name in user_args], include_friends)
+            parts += (date.today().isoformat(),)
+            etag = compute_etag(*parts)
+
+            if request.if_none_match.contains_weak(etag):
+                response = current_app.response_class(status=304)
+            else:
+                response = make_response(view(*args, **kwargs))
+                if response.status_code != 200:
+                    return response
+            response.set_etag(etag, weak=True)
+            # 브라우저가 응답을 저장하되 매번 If-None-Match로 재검증하도록 합니다.
+            response.headers['Cache-Control'] = 'no-cache'
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,201 @@
+from sqlalchemy import and_, delete, func, or_, select, update
+from ..models.user import db, User
+from ..models.friendship import Friendship
+from ..models.friend_edge import FriendEdge
+from ..models.daily_exercise_rollup import DailyExerciseRollup
+from .cache import friend_ids_key, get_friend_ids_cache
+from .scores import DEFAULT_SCORE_WINDOW, cache_window_scores, get_window_scores, score_as_of, score_fields, window_start
+
+FRIEND_SORTS = ('score', 'name')
+
+def _edge_pair(friendship):
+    """
+    친구 관계의 두 방향 (user_id, friend_id) 쌍에 해당하는 friend_edges 조건
+
+    SQLite는 행 값 IN (VALUES ...) 조건에 기본 키를 쓰지 못하고 테이블 전체를 훑으므로,
+    기본 키 조회 두 번으로 처리되는 OR 조건으로 작성합니다.
+    """
+    return or_(
+        and_(FriendEdge.user_id == friendship.user_id, FriendEdge.friend_id == friendship.friend_id),
+        and_(FriendEdge.user_id == friendship.friend_id, FriendEdge.friend_id == friendship.user_id)
+    )
+
+def add_friend_edges(friendship):
+    """
+    새 친구 관계(요청)를 인접 인덱스에 방향별로 한 행씩 추가합니다.
+
+    friendship.id가 필요하므로 세션에 추가한 뒤 flush 하고 호출해야 하며, 같은 트랜잭션에서 커밋됩니다.
+    """
+    db.session.execute(FriendEdge.__table__.insert(), [
+        {'user_id': a, 'friend_id': b, 'friendship_id': friendship.id,
+         'status': friendship.status, 'since': friendship.created_at}
+        for a, b in ((friendship.user_id, friendship.friend_id), (friendship.friend_id, friendship.user_id))
+    ])
+
+def update_friend_edges(friendship):
+    """친구 관계의 상태 변경(수락 등)을 인접 인덱스의 두 행에 반영합니다."""
+    db.session.execute(
+        update(FriendEdge).where(_edge_pair(friendship)).values(status=friendship.status)
+        .execution_options(synchronize_session=False)
+    )
+
+def delete_friend_edges(friendship):
+    """삭제할 친구 관계의 두 행을 인접 인덱스에서 제거합니다."""
+    db.session.execute(
+        delete(FriendEdge).where(_edge_pair(friendship)).execution_options(synchronize_session=False)
+    )
+
+def rebuild_friend_edges():
+    """
+    friendships 테이블로부터 인접 인덱스 전체를 다시 만듭니다 (기존 데이터 백필용).
+
+    Returns:
+        int: 생성된 행 수.
+    """
+    db.session.execute(delete(FriendEdge))
+    rows = []
+    for friendship_id, user_id, friend_id, status, created_at in db.session.query(
+        Friendship.id, Friendship.user_id, Friendship.friend_id, Friendship.status, Friendship.created_at
+    ):
+        for a, b in ((user_id, friend_id), (friend_id, user_id)):
+            rows.append({'user_id': a, 'friend_id': b, 'friendship_id': friendship_id,
+                         'status': status or 'pending', 'since': created_at})
+    if rows:
+        db.session.execute(FriendEdge.__table__.insert(), rows)
+    db.session.commit()
+    return len(rows)
+
+def find_friendship(user_id, other_id):
+    """
+    두 사용자 사이의 친구 관계(방향, 상태 무관)를 인접 인덱스의 기본 키 조회 한 번으로 찾습니다.
+
+    Returns:
+        Friendship: 친구 관계. 없으면 None.
+    """
+    edge = db.session.get(FriendEdge, (user_id, other_id))
+    return db.session.get(Friendship, edge.friendship_id) if edge else None
+
+def get_friend_ids(user_id):
+    """
+    사용자의 수락된 친구 ID 집합을 반환합니다.
+
+    결과는 친구 ID 집합 캐시에 저장되며, 친구 관계가 수락/삭제되면 무효화됩니다.
+
+    Returns:
+        frozenset: 친구 ID 집합.
+    """
+    cache = get_friend_ids_cache()
+    hit, cached = cache.get(friend_ids_key(user_id))
+    if hit:
+        return frozenset(cached)
+    friend_ids = [friend_id for friend_id, in db.session.execute(accepted_friend_ids_select(user_id))]
+    cache.set(friend_ids_key(user_id), friend_ids)
+    return frozenset(friend_ids)
+
+def accepted_friend_links(user_id):
+    """
+    특정 사용자의 'accepted' 상태 친구 관계를 (friend_id, since) 형태로 반환하는 SELECT 문을 생성합니다.
+
+    양방향 OR 조건 없이 대칭 인접 인덱스(friend_edges)의 기본 키 (user_id, ...) 범위 조회 한 번으로 처리합니다.
+
+    Args:
+        user_id: 기준 사용자의 ID.
+
+    Returns:
+        Select: friend_id, since 두 컬럼을 반환하는 SELECT 문.
+    """
+    return select(FriendEdge.friend_id.label('friend_id'), FriendEdge.since.label('since')).where(
+        FriendEdge.user_id == user_id,
+        FriendEdge.status == 'accepted'
+    )
+
+def accepted_friend_ids_select(user_id):
+    """
+    특정 사용자의 'accepted' 상태 친구 ID 한 컬럼만 반환하는 SELECT 문을 생성합니다.
+
+    Args:
+        user_id: 기준 사용자의 ID.
+
+    Returns:
+        Select: IN 서브쿼리로 사용할 수 있는 SELECT 문.
+    """
+    return select(FriendEdge.friend_id).where(
+        FriendEdge.user_id == user_id,
+        FriendEdge.status == 'accepted'
+    )
+
+def fetch_friends_page(user_id, sort='score', limit=None, offset=0, days=DEFAULT_SCORE_WINDOW, as_of=None):
+    """
+    친구 프로필, 친구가 된 시각, 기간 점수(기본값: 주간)를 조회합니다.
+
+    두 정렬 모두 정렬과 LIMIT/OFFSET을 SQL에서 처리하고, 전체 친구 수는 윈도 함수(`COUNT(*) OVER ()`)로
+    같은 쿼리에서 함께 구합니다. 반환할 페이지의 친구 행만 Python으로 읽습니다.
+
+    - 'name' 정렬: 점수는 반환할 페이지의 친구만 점수 캐시(`get_window_scores`)에서 읽고,
+      캐시에 없는 친구의 점수만 일별 롤업에서 한 번의 집계 쿼리로 계산합니다.
+    - 'score' 정렬: 친구들의 기간 내 롤업 합계를 서브쿼리로 조인해 점수 내림차순으로 정렬하고,
+      반환한 페이지의 점수로 점수 캐시를 채웁니다.
+
+    Args:
+        user_id: 기준 사용자의 ID.
+        sort: 'score'(점수 내림차순) 또는 'name'(이름 오름차순).
+        limit: 반환할 최대 친구 수 (None이면 전체).
+        offset: 건너뛸 친구 수.
+        days: 점수 기간(일). `SCORE_WINDOWS` 중 하나.
+        as_of: 기준일. None이면 오늘.
+
+    Returns:
+        tuple: (친구 딕셔너리 리스트, 전체 친구 수).
+    """
+    as_of = as_of or score_as_of()
+    links = accepted_friend_links(user_id).subquery()
+
+    query = db.session.query(
+        User.id, User.username, User.email, links.c.since, func.count().over().label('total_count')
+    ).join(
+        links, links.c.friend_id == User.id
+    )
+
+    if sort == 'name':
+        query = query.order_by(User.username, User.id)
+    else:
+        # 친구들의 기간 내 롤업 행만 (user_id, date) 기본 키 범위로 읽어 합산합니다.
+        window_scores = db.session.query(
+            DailyExerciseRollup.user_id.label('user_id'),
+            func.sum(DailyExerciseRollup.intensity_sum).label('score')
+        ).join(
+            links, links.c.friend_id == DailyExerciseRollup.user_id
+        ).filter(
+            DailyExerciseRollup.date.between(window_start(days, as_of), as_of)
+        ).group_by(DailyExerciseRollup.user_id).subquery()
+        score = func.coalesce(window_scores.c.score, 0).label('score')
+        query = query.add_columns(score).outerjoin(
+            window_scores, window_scores.c.user_id == User.id
+        ).order_by(score.desc(), User.username, User.id)
+
+    if offset:
+        query = query.offset(offset)
+    if limit is not None:
+        query = query.limit(limit)
+    rows = query.all()
+
+    if rows:
+        total = rows[0].total_count
+    else:
+        # 요청한 페이지가 비어 있으면(limit=0, 범위를 넘는 offset 등) 윈도 함수 값이 없으므로 전체 수만 따로 셉니다.
+        total = db.session.query(func.count()).select_from(links).scalar()
+
+    if sort == 'name':
+        scores = get_window_scores([row.id for row in rows], days, as_of)
+    else:
+        scores = {row.id: int(row.score) for row in rows}
+        cache_window_scores(scores, days, as_of)
+
+    friends = [{
+        'id': row.id,
+        'username': row.username,
+        'email': row.email,
+        **score_fields(scores[row.id], days),
+        'friendship_since': row.since.isoformat() if row.since else None
+    } for row in rows]
+    return friends, total
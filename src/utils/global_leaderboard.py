@@ -0,0 +1,380 @@
+import heapq
+import logging
+import threading
+import time
+from sqlalchemy import func, select, true
+from ..models.user import db, User
+from ..models.daily_exercise_rollup import DailyExerciseRollup
+from .scores import DEFAULT_SCORE_WINDOW, score_as_of, window_start
+
+logger = logging.getLogger(__name__)
+
+class RankedScoreIndex:
+    """
+    사용자 점수의 순서 통계 인덱스입니다.
+
+    점수(양의 정수)별 사용자 수를 펜윅 트리(Binary Indexed Tree)에 저장하므로
+    점수 갱신, 순위, 백분위, k번째 점수 찾기가 모두 O(log 최대 점수)입니다.
+    점수가 0인 사용자(기간 안에 기록이 없거나 강도가 모두 0)는 순위에 포함하지 않습니다.
+
+    Args:
+        scores: 초기 점수 {user_id: 점수}. 한 번에 O(사용자 수 + 최대 점수)로 만듭니다.
+    """
+
+    def __init__(self, scores=None):
+        self._scores = {}
+        self._members = {}
+        self._size = 0
+        self._tree = [0]
+        for user_id, score in (scores or {}).items():
+            if score > 0:
+                self._scores[user_id] = score
+                self._members.setdefault(score, set()).add(user_id)
+        self._resize(max(self._members, default=1))
+
+    def __len__(self):
+        return len(self._scores)
+
+    def _resize(self, max_score):
+        """펜윅 트리 크기를 max_score 이상인 2의 거듭제곱으로 맞추고 점수별 사용자 수로 다시 만듭니다."""
+        size = 1
+        while size < max_score:
+            size *= 2
+        tree = [0] * (size + 1)
+        for score, members in self._members.items():
+            tree[score] = len(members)
+        for i in range(1, size + 1):
+            parent = i + (i & -i)
+            if parent <= size:
+                tree[parent] += tree[i]
+        self._size, self._tree = size, tree
+
+    def _add(self, score, delta):
+        while score <= self._size:
+            self._tree[score] += delta
+            score += score & -score
+
+    def _prefix(self, score):
+        """점수가 score 이하인 사용자 수"""
+        score = min(score, self._size)
+        count = 0
+        while score > 0:
+            count += self._tree[score]
+            score -= score & -score
+        return count
+
+    def _kth_smallest(self, k):
+        """점수 오름차순으로 k번째(1부터) 사용자의 점수 (트리 크기가 2의 거듭제곱이므로 이진 탐색 한 번)"""
+        position, step = 0, self._size
+        while step:
+            candidate = position + step
+            if candidate <= self._size and self._tree[candidate] < k:
+                position = candidate
+                k -= self._tree[candidate]
+            step //= 2
+        return position + 1
+
+    def set(self, user_id, score):
+        """사용자의 점수를 갱신합니다. 0 이하이면 인덱스에서 제거합니다."""
+        previous = self._scores.pop(user_id, None)
+        if previous is not None:
+            members = self._members[previous]
+            members.discard(user_id)
+            if not members:
+                del self._members[previous]
+            self._add(previous, -1)
+        if score <= 0:
+            return
+        self._scores[user_id] = score
+        self._members.setdefault(score, set()).add(user_id)
+        if score > self._size:
+            self._resize(score)
+        else:
+            self._add(score, 1)
+
+    def score_of(self, user_id):
+        return self._scores.get(user_id, 0)
+
+    def rank_of(self, user_id):
+        """
+        사용자의 순위를 반환합니다. 동점자는 같은 순위를 받습니다 (예: 1, 2, 2, 4).
+
+        Returns:
+            int: 순위. 순위에 포함되지 않는 사용자이면 None.
+        """
+        score = self._scores.get(user_id)
+        if score is None:
+            return None
+        return len(self._scores) - self._prefix(score) + 1
+
+    def percentile_of(self, user_id):
+        """
+        사용자의 백분위(점수가 같거나 낮은 사용자의 비율, 0-100)를 반환합니다.
+
+        Returns:
+            float: 백분위. 순위에 포함되지 않는 사용자이면 None.
+        """
+        score = self._scores.get(user_id)
+        if score is None:
+            return None
+        return round(100 * self._prefix(score) / len(self._scores), 2)
+
+    def top(self, limit, offset=0):
+        """
+        점수 내림차순으로 offset 다음부터 limit명을 반환합니다. 동점자는 user_id 오름차순입니다.
+
+        점수마다 순위를 한 번의 트리 탐색으로 찾으므로, 비용은 반환하는 점수 종류 수 × O(log 최대 점수)입니다.
+
+        Returns:
+            list: (순위, user_id, 점수) 튜플 리스트.
+        """
+        total = len(self._scores)
+        entries = []
+        position = offset + 1
+        while len(entries) < limit and position <= total:
+            score = self._kth_smallest(total - position + 1)
+            rank = total - self._prefix(score) + 1
+            members = self._members[score]
+            skip = position - rank
+            for user_id in heapq.nsmallest(skip + limit - len(entries), members)[skip:]:
+                entries.append((rank, user_id, score))
+            position = rank + len(members)
+        return entries
+
+def load_window_aggregates(days, as_of, user_ids=None):
+    """
+    일별 롤업에서 사용자별 기간 점수와 기간 안에 기록한 운동 종류를 조회합니다.
+
+    Args:
+        days: 점수 기간(일).
+        as_of: 기준일.
+        user_ids: 지정하면 해당 사용자들만 조회합니다 (증분 갱신용).
+
+    Returns:
+        tuple: ({user_id: 점수}, {user_id: frozenset(운동 종류 이름)}).
+    """
+    in_window = DailyExerciseRollup.date.between(window_start(days, as_of), as_of)
+    filters = [in_window]
+    if user_ids is not None:
+        filters.append(DailyExerciseRollup.user_id.in_(user_ids))
+
+    scores = dict(db.session.query(
+        DailyExerciseRollup.user_id, func.sum(DailyExerciseRollup.intensity_sum)
+    ).filter(*filters).group_by(DailyExerciseRollup.user_id).all())
+
+    # 롤업의 운동 종류별 횟수(JSON)를 json_each로 펼쳐 사용자별 운동 종류 목록을 구합니다.
+    entries = func.json_each(DailyExerciseRollup.exercise_type_counts).table_valued('key')
+    exercise_types = {}
+    for user_id, exercise_type in db.session.execute(
+        select(DailyExerciseRollup.user_id, entries.c.key)
+        .select_from(DailyExerciseRollup.__table__.join(entries, true()))
+        .where(*filters)
+        .distinct()
+    ):
+        exercise_types.setdefault(user_id, set()).add(exercise_type)
+    return (
+        {user_id: int(score or 0) for user_id, score in scores.items()},
+        {user_id: frozenset(types) for user_id, types in exercise_types.items()}
+    )
+
+class GlobalLeaderboard:
+    """
+    전체 사용자 리더보드와 운동 종류별 코호트 리더보드를 메모리에 보관하는 순위 인덱스입니다.
+
+    - 일별 롤업에서 기간 점수를 한 번 집계해 `RankedScoreIndex`를 만들고, 운동 기록이 바뀌면
+      해당 사용자만 다시 읽어 증분 갱신합니다. 상위 K명, 사용자 순위, 백분위는 O(log 최대 점수)입니다.
+    - 코호트는 기간 안에 해당 운동 종류를 기록한 사용자들이며, 같은 기간 점수로 순위를 매깁니다.
+    - 인덱스는 워커 프로세스마다 따로 있으므로, 다른 프로세스의 쓰기는 GLOBAL_LEADERBOARD_REFRESH_SECONDS
+      간격의 재구성으로 반영됩니다. 날짜가 바뀌거나 인덱스가 오래되면 기존 인덱스로 응답하면서
+      백그라운드에서 다시 만듭니다 (stale-while-revalidate).
+    """
+
+    def __init__(self, days=DEFAULT_SCORE_WINDOW, max_age=300):
+        self.days = days
+        self.max_age = max_age
+        self._app = None
+        self._indexes = None
+        self._user_types = {}
+        self.as_of = None
+        self._built_at = None
+        self._lock = threading.RLock()
+        self._refreshing = False
+        self._pending_users = None
+
+    def init_app(self, app):
+        """
+        앱 설정(GLOBAL_LEADERBOARD_WINDOW_DAYS, GLOBAL_LEADERBOARD_REFRESH_SECONDS)을 읽습니다.
+
+        Args:
+            app: Flask 앱.
+        """
+        self._app = app
+        self.days = app.config.get('GLOBAL_LEADERBOARD_WINDOW_DAYS', self.days)
+        self.max_age = app.config.get('GLOBAL_LEADERBOARD_REFRESH_SECONDS', self.max_age)
+
+    @property
+    def ready(self):
+        return self._indexes is not None
+
+    def rebuild(self):
+        """현재 앱 컨텍스트에서 일별 롤업으로부터 인덱스 전체를 다시 만듭니다."""
+        as_of = score_as_of()
+        with self._lock:
+            # 재구성 중에 들어온 증분 갱신은 새 인덱스에 다시 적용합니다.
+            self._pending_users = set()
+        scores, user_types = load_window_aggregates(self.days, as_of)
+
+        cohorts = {}
+        for user_id, types in user_types.items():
+            for exercise_type in types:
+                cohorts.setdefault(exercise_type, {})[user_id] = scores.get(user_id, 0)
+        indexes = {None: RankedScoreIndex(scores)}
+        indexes.update({exercise_type: RankedScoreIndex(members) for exercise_type, members in cohorts.items()})
+
+        with self._lock:
+            self._indexes, self._user_types, self.as_of = indexes, user_types, as_of
+            self._built_at = time.monotonic()
+            pending, self._pending_users = self._pending_users, None
+        if pending:
+            self.refresh_users(pending)
+
+    def refresh_users(self, user_ids):
+        """
+        운동 기록이 바뀐 사용자들의 점수와 코호트를 일별 롤업에서 다시 읽어 인덱스에 반영합니다.
+
+        변경이 커밋된 뒤 호출합니다. 이 프로세스에 인덱스가 아직 없으면 아무것도 하지 않습니다.
+        조회에 실패해도 이미 커밋된 요청이 실패하지 않도록 오류를 기록하고, 다음 조회 때 인덱스를 다시 만듭니다.
+
+        Args:
+            user_ids: 사용자 ID의 iterable.
+        """
+        user_ids = set(user_ids)
+        if not user_ids or self._indexes is None:
+            return
+        with self._lock:
+            if self._pending_users is not None:
+                self._pending_users |= user_ids
+            as_of = self.as_of
+        try:
+            scores, user_types = load_window_aggregates(self.days, as_of, user_ids)
+        except Exception as e:
+            logger.error(f"전체 리더보드 인덱스 증분 갱신 중 오류 발생: {e}", exc_info=True)
+            self._built_at = float('-inf')
+            return
+
+        with self._lock:
+            if self.as_of != as_of:
+                return
+            for user_id in user_ids:
+                score = scores.get(user_id, 0)
+                types = user_types.get(user_id, frozenset())
+                for exercise_type in self._user_types.get(user_id, frozenset()) - types:
+                    self._indexes[exercise_type].set(user_id, 0)
+                for exercise_type in types:
+                    self._indexes.setdefault(exercise_type, RankedScoreIndex()).set(user_id, score)
+                self._indexes[None].set(user_id, score)
+                if types:
+                    self._user_types[user_id] = types
+                else:
+                    self._user_types.pop(user_id, None)
+
+    def ensure_current(self):
+        """인덱스가 없으면 지금 만들고, 날짜가 바뀌었거나 오래되었으면 백그라운드 재구성을 시작합니다."""
+        if self._indexes is None:
+            self.rebuild()
+        elif self.as_of != score_as_of() or time.monotonic() - self._built_at >= self.max_age:
+            self._rebuild_async()
+
+    def _rebuild_async(self):
+        if self._app is None:
+            self.rebuild()
+            return
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._rebuild_in_app_context, name='global-leaderboard-rebuild', daemon=True).start()
+
+    def _rebuild_in_app_context(self):
+        try:
+            with self._app.app_context():
+                self.rebuild()
+                db.session.remove()
+        except Exception as e:
+            logger.error(f"전체 리더보드 인덱스 재구성 중 오류 발생: {e}", exc_info=True)
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _index(self, exercise_type):
+        self.ensure_current()
+        return self._indexes.get(exercise_type) or RankedScoreIndex()
+
+    def _meta(self, index, exercise_type):
+        return {
+            'total_participants': len(index),
+            'exercise_type': exercise_type,
+            'window_days': self.days,
+            'as_of': self.as_of.isoformat()
+        }
+
+    def top(self, limit=10, offset=0, exercise_type=None):
+        """
+        전체(또는 코호트) 상위 사용자 목록을 반환합니다.
+
+        Args:
+            limit: 반환할 최대 항목 수.
+            offset: 건너뛸 항목 수.
+            exercise_type: 지정하면 해당 운동 종류 코호트의 순위를 반환합니다.
+
+        Returns:
+            dict: 'leaderboard', 'total_participants', 'exercise_type', 'window_days', 'as_of' 키를 가진 딕셔너리.
+        """
+        index = self._index(exercise_type)
+        with self._lock:
+            rows = index.top(limit, offset)
+        usernames = dict(db.session.query(User.id, User.username).filter(
+            User.id.in_([user_id for _, user_id, _ in rows])
+        ).all()) if rows else {}
+        return {
+            'leaderboard': [
+                {'user_id': user_id, 'username': usernames.get(user_id), 'score': score, 'rank': rank}
+                for rank, user_id, score in rows
+            ],
+            **self._meta(index, exercise_type)
+        }
+
+    def user_rank(self, user_id, exercise_type=None):
+        """
+        사용자의 전체(또는 코호트) 순위와 백분위를 반환합니다.
+
+        Returns:
+            dict: 'user_id', 'score', 'rank', 'percentile' 및 메타 정보 키를 가진 딕셔너리.
+                  기간 점수가 0이거나 코호트에 속하지 않으면 rank와 percentile은 None입니다.
+        """
+        index = self._index(exercise_type)
+        with self._lock:
+            entry = {
+                'user_id': user_id,
+                'score': index.score_of(user_id),
+                'rank': index.rank_of(user_id),
+                'percentile': index.percentile_of(user_id)
+            }
+        return {**entry, **self._meta(index, exercise_type)}
+
+    def stats(self):
+        """인덱스 상태(사용자 수, 코호트 수, 기준일)를 반환합니다."""
+        with self._lock:
+            if self._indexes is None:
+                return {'ready': False}
+            return {
+                'ready': True,
+                'participants': len(self._indexes[None]),
+                'cohorts': len(self._indexes) - 1,
+                'window_days': self.days,
+                'as_of': self.as_of.isoformat(),
+                'age_seconds': round(time.monotonic() - self._built_at, 1)
+            }
+
+# 앱 전역에서 사용하는 전체 리더보드 인덱스
+global_leaderboard = GlobalLeaderboard()
@@ -0,0 +1,166 @@
+import logging
+import threading
+import time
+from datetime import date, datetime, timedelta
+from sqlalchemy import func, select, true
+from ..models.user import db
+from ..models.daily_exercise_rollup import DailyExerciseRollup
+from .concurrency import query_executor
+
+logger = logging.getLogger(__name__)
+
+GLOBAL_STATS_DAYS = 30
+
+def compute_global_statistics():
+    """
+    최근 30일간의 전체 사용자 통계를 일별 롤업으로부터 계산합니다.
+
+    원본 운동 기록 대신 (user_id, date) 단위 롤업을 집계하므로 비용이 기록 수가 아니라
+    '활성 사용자 수 × 일수'에 비례합니다. 합계 집계와 인기 운동 종류 집계는 서로 독립적이므로
+    `query_executor`로 동시에 실행합니다. 앱 컨텍스트 안에서 호출해야 합니다.
+
+    Returns:
+        dict: API 응답 형식의 전체 통계.
+    """
+    since = date.today() - timedelta(days=GLOBAL_STATS_DAYS - 1)
+    in_period = DailyExerciseRollup.date >= since
+
+    def totals():
+        return db.session.query(
+            func.coalesce(func.sum(DailyExerciseRollup.workout_count), 0),
+            func.count(func.distinct(DailyExerciseRollup.user_id)),
+            func.coalesce(func.sum(DailyExerciseRollup.intensity_sum), 0)
+        ).filter(in_period).one()
+
+    # 인기 운동 종류 (상위 5개): 롤업의 운동 종류별 횟수를 json_each로 펼쳐 합산
+    def popular():
+        entries = func.json_each(DailyExerciseRollup.exercise_type_counts).table_valued('key', 'value')
+        count = func.sum(entries.c.value).label('count')
+        return db.session.execute(
+            select(entries.c.key, count)
+            .select_from(DailyExerciseRollup.__table__.join(entries, true()))
+            .where(in_period)
+            .group_by(entries.c.key)
+            .order_by(count.desc())
+            .limit(5)
+        ).all()
+
+    (total_records, active_users, intensity_sum), popular_exercises = query_executor.gather(totals, popular)
+
+    return {
+        'period': '30_days',
+        'total_workout_records': int(total_records),
+        'active_users': active_users,
+        'average_intensity': round(intensity_sum / total_records, 1) if total_records else 0,
+        'popular_exercises': [
+            {'exercise_type': exercise_type, 'count': int(exercise_count)}
+            for exercise_type, exercise_count in popular_exercises
+        ],
+        'generated_at': datetime.utcnow().isoformat()
+    }
+
+class GlobalStatisticsSnapshot:
+    """
+    전체 통계를 메모리에 보관하고 주기적으로 갱신하는 스냅샷입니다.
+
+    - 백그라운드 갱신(GLOBAL_STATS_BACKGROUND_REFRESH)이 켜져 있으면 별도 스레드가
+      GLOBAL_STATS_REFRESH_SECONDS 간격으로 스냅샷을 다시 계산합니다. 스레드는 앱 생성 시가 아니라
+      첫 조회(`get`) 때 시작하므로, CLI 명령(`init-db` 등)이나 포크 전의 서버 마스터 프로세스에서는
+      실행되지 않고 요청을 처리하는 워커 프로세스마다 하나씩 실행됩니다.
+    - 요청 시 스냅샷이 오래되었으면 기존 값을 바로 반환하고 갱신은 백그라운드에서 수행합니다
+      (stale-while-revalidate). 스냅샷이 아직 없을 때만 요청 안에서 계산합니다.
+
+    따라서 요청 지연 시간은 테이블 크기와 관계없이 일정합니다.
+    """
+
+    def __init__(self, compute=compute_global_statistics, max_age=60):
+        self._compute = compute
+        self.max_age = max_age
+        self._app = None
+        self._value = None
+        self._computed_at = None
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._stop_event = threading.Event()
+        self._thread = None
+        self._background = False
+
+    def init_app(self, app):
+        """
+        앱 설정을 읽습니다. 백그라운드 갱신 스레드는 첫 조회 때 시작됩니다.
+
+        Args:
+            app: Flask 앱.
+        """
+        self._app = app
+        self.max_age = app.config.get('GLOBAL_STATS_REFRESH_SECONDS', self.max_age)
+        self._background = app.config.get('GLOBAL_STATS_BACKGROUND_REFRESH', False)
+
+    def start(self):
+        """
+        백그라운드 갱신 스레드를 시작합니다. 이미 실행 중이면 아무것도 하지 않습니다.
+
+        포크된 프로세스에서는 부모의 스레드가 실행되지 않으므로(`is_alive()`가 False) 새로 시작합니다.
+        """
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop_event.clear()
+            self._thread = threading.Thread(target=self._run, name='global-stats-refresher', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """백그라운드 갱신 스레드를 멈춥니다."""
+        self._stop_event.set()
+
+    def get(self):
+        """
+        현재 스냅샷을 반환합니다. 필요하면 갱신을 시작합니다.
+
+        Returns:
+            dict: 전체 통계 스냅샷.
+        """
+        if self._value is None:
+            self.refresh()
+        elif self._is_stale() and self._app is not None:
+            self._refresh_async()
+        # 첫 스냅샷을 계산한 뒤에 시작하므로 스레드는 다음 주기부터 갱신합니다.
+        if self._background and (self._thread is None or not self._thread.is_alive()):
+            self.start()
+        return self._value
+
+    def refresh(self):
+        """현재 앱 컨텍스트에서 스냅샷을 즉시 다시 계산합니다."""
+        value = self._compute()
+        with self._lock:
+            self._value = value
+            self._computed_at = time.monotonic()
+
+    def _is_stale(self):
+        return self._computed_at is None or time.monotonic() - self._computed_at >= self.max_age
+
+    def _refresh_async(self):
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._refresh_in_app_context, daemon=True).start()
+
+    def _refresh_in_app_context(self):
+        try:
+            with self._app.app_context():
+                self.refresh()
+                db.session.remove()
+        except Exception as e:
+            logger.error(f"전체 통계 스냅샷 갱신 중 오류 발생: {e}", exc_info=True)
+        finally:
+            with self._lock:
+                self._refreshing = False
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            if self._is_stale():
+                self._refresh_in_app_context()
+            self._stop_event.wait(self.max_age)
+
+global_stats_snapshot = GlobalStatisticsSnapshot()
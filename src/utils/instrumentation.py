@@ -0,0 +1,286 @@
+import bisect
+import cProfile
+import os
+import random
+import re
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from flask import Response, g, has_app_context, request
+from sqlalchemy import event
+from ..models.user import db
+from .cache import get_weekly_score_cache
+
+# SQL 문의 "모양" 비교를 위해 IN 목록과 공백을 정규화합니다.
+_IN_LIST_PATTERN = re.compile(r'\(\s*\?(?:\s*,\s*\?)*\s*\)')
+_WHITESPACE_PATTERN = re.compile(r'\s+')
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500)
+
+def statement_shape(statement):
+    """
+    파라미터 값과 IN 목록 길이를 무시한 SQL 문의 모양을 반환합니다. N+1 패턴 탐지에 사용합니다.
+    """
+    return _WHITESPACE_PATTERN.sub(' ', _IN_LIST_PATTERN.sub('(?)', statement)).strip()
+
+class Histogram:
+    """
+    라벨별 누적 버킷을 가진 Prometheus 형식 히스토그램입니다.
+
+    Args:
+        name: 메트릭 이름.
+        help_text: HELP 설명.
+        buckets: 오름차순 버킷 상한값 튜플.
+    """
+
+    def __init__(self, name, help_text, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = buckets
+        self._series = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels, value):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.setdefault(key, {'counts': [0] * len(self.buckets), 'sum': 0.0, 'count': 0})
+            index = bisect.bisect_left(self.buckets, value)
+            if index < len(self.buckets):
+                series['counts'][index] += 1
+            series['sum'] += value
+            series['count'] += 1
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} histogram']
+        with self._lock:
+            for key, series in sorted(self._series.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets, series['counts']):
+                    cumulative += count
+                    lines.append(f'{self.name}_bucket{_format_labels(key, le=bound)} {cumulative}')
+                lines.append(f'{self.name}_bucket{_format_labels(key, le="+Inf")} {series["count"]}')
+                lines.append(f'{self.name}_sum{_format_labels(key)} {series["sum"]}')
+                lines.append(f'{self.name}_count{_format_labels(key)} {series["count"]}')
+        return lines
+
+class CounterMetric:
+    """라벨별 누적 카운터입니다 (Prometheus counter)."""
+
+    def __init__(self, name, help_text):
+        self.name = name
+        self.help_text = help_text
+        self._values = Counter()
+        self._lock = threading.Lock()
+
+    def inc(self, labels, amount=1):
+        with self._lock:
+            self._values[tuple(sorted(labels.items()))] += amount
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.help_text}', f'# TYPE {self.name} counter']
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f'{self.name}{_format_labels(key)} {value}')
+        return lines
+
+def _format_labels(key, **extra):
+    items = list(key) + [(name, value) for name, value in extra.items()]
+    if not items:
+        return ''
+    escaped = (f'{name}="{str(value).replace(chr(92), chr(92) * 2).replace(chr(34), chr(92) + chr(34))}"'
+               for name, value in items)
+    return '{' + ','.join(escaped) + '}'
+
+class RequestStats:
+    """요청 하나 동안 수집되는 계측 값"""
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.sql_count = 0
+        self.sql_time = 0.0
+        self.serialization_time = 0.0
+        self.shapes = Counter()
+        self.profiler = None
+
+def record_serialization_time(seconds):
+    """
+    응답 직렬화에 걸린 시간을 현재 요청의 계측 값에 더합니다. 계측이 꺼져 있으면 무시됩니다.
+
+    Args:
+        seconds: 직렬화 소요 시간(초).
+    """
+    stats = g.get('_request_stats') if has_app_context() else None
+    if stats is not None:
+        stats.serialization_time += seconds
+
+class Instrumentation:
+    """
+    요청 단위 프로파일링과 SQL 계측을 위한 선택적 미들웨어입니다.
+
+    INSTRUMENTATION_ENABLED 설정이 켜져 있을 때만 등록되며, 다음을 수행합니다.
+
+    - 요청별 처리 시간, SQL 문 수, SQL 총 실행 시간, JSON 직렬화 시간을 기록합니다
+      (SQLAlchemy 엔진 이벤트 사용). 응답에는 `Server-Timing` 헤더로도 표시됩니다.
+    - 같은 모양의 SQL 문이 한 요청에서 INSTRUMENTATION_N_PLUS_ONE_THRESHOLD 회를 넘으면
+      N+1 패턴으로 경고 로그를 남기고 카운터를 올립니다.
+    - 엔드포인트별 히스토그램을 `/api/metrics`에서 Prometheus 텍스트 형식으로 노출합니다.
+    - INSTRUMENTATION_PROFILE_SAMPLE_RATE 비율의 요청을 cProfile로 측정하여, 가장 느린
+      INSTRUMENTATION_PROFILE_KEEP 개 요청의 프로파일을 INSTRUMENTATION_PROFILE_DIR에 저장합니다.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.request_duration = Histogram(
+            'http_request_duration_seconds', '요청 처리 시간(초)', DURATION_BUCKETS)
+        self.sql_statements = Histogram(
+            'http_request_sql_statements', '요청당 실행된 SQL 문 수', COUNT_BUCKETS)
+        self.sql_duration = Histogram(
+            'http_request_sql_duration_seconds', '요청당 SQL 총 실행 시간(초)', DURATION_BUCKETS)
+        self.serialization_duration = Histogram(
+            'http_request_serialization_seconds', '요청당 JSON 직렬화 시간(초)', DURATION_BUCKETS)
+        self.n_plus_one = CounterMetric(
+            'http_request_n_plus_one_total', 'N+1 패턴이 탐지된 요청 수')
+        self._profile_lock = threading.Lock()
+        self._saved_profiles = []  # (소요 시간, 파일 경로), 오름차순
+
+    def init_app(self, app):
+        """
+        설정이 켜져 있으면 요청 훅, 엔진 이벤트, `/api/metrics` 라우트를 등록합니다.
+
+        Args:
+            app: Flask 앱.
+        """
+        if not app.config.get('INSTRUMENTATION_ENABLED', False):
+            return
+        self.app = app
+        self.n_plus_one_threshold = app.config.get('INSTRUMENTATION_N_PLUS_ONE_THRESHOLD', 10)
+        self.profile_sample_rate = app.config.get('INSTRUMENTATION_PROFILE_SAMPLE_RATE', 0.0)
+        self.profile_keep = app.config.get('INSTRUMENTATION_PROFILE_KEEP', 20)
+        self.profile_dir = app.config.get('INSTRUMENTATION_PROFILE_DIR') or os.path.join(app.instance_path, 'profiles')
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+        app.teardown_request(self._teardown_request)
+        app.add_url_rule('/api/metrics', 'metrics', self.metrics_view)
+        self._wrap_json_provider(app)
+
+        with app.app_context():
+            event.listen(db.engine, 'before_cursor_execute', self._before_cursor_execute)
+            event.listen(db.engine, 'after_cursor_execute', self._after_cursor_execute)
+
+        app.logger.info("요청 계측(instrumentation)이 활성화되었습니다.")
+
+    def _before_request(self):
+        stats = RequestStats()
+        if self.profile_sample_rate and random.random() < self.profile_sample_rate:
+            # cProfile은 동시에 하나만 활성화할 수 있으므로 다른 요청을 측정 중이면 건너뜁니다.
+            if self._profile_lock.acquire(blocking=False):
+                stats.profiler = cProfile.Profile()
+                stats.profiler.enable()
+        g._request_stats = stats
+
+    def _after_request(self, response):
+        stats = g.pop('_request_stats', None)
+        if stats is None:
+            return response
+        duration = time.perf_counter() - stats.started_at
+        labels = {'endpoint': request.endpoint or 'unknown', 'method': request.method}
+
+        self.request_duration.observe(labels, duration)
+        self.sql_statements.observe(labels, stats.sql_count)
+        self.sql_duration.observe(labels, stats.sql_time)
+        self.serialization_duration.observe(labels, stats.serialization_time)
+
+        repeated = [(shape, count) for shape, count in stats.shapes.items() if count > self.n_plus_one_threshold]
+        if repeated:
+            self.n_plus_one.inc(labels)
+            for shape, count in repeated:
+                self.app.logger.warning(f"N+1 쿼리 패턴 의심 ({labels['endpoint']}): 같은 SQL이 {count}회 실행됨 - {shape[:200]}")
+
+        if stats.profiler is not None:
+            stats.profiler.disable()
+            try:
+                self._save_profile(stats.profiler, duration, labels['endpoint'])
+            finally:
+                self._profile_lock.release()
+
+        response.headers['Server-Timing'] = (
+            f'app;dur={duration * 1000:.1f}, '
+            f'sql;dur={stats.sql_time * 1000:.1f};desc="{stats.sql_count} queries", '
+            f'serialize;dur={stats.serialization_time * 1000:.1f}'
+        )
+        return response
+
+    def _teardown_request(self, exc):
+        # after_request가 실행되지 않은 경우(처리되지 않은 예외 등)에도 프로파일러를 정리합니다.
+        stats = g.pop('_request_stats', None)
+        if stats is not None and stats.profiler is not None:
+            stats.profiler.disable()
+            self._profile_lock.release()
+
+    def _wrap_json_provider(self, app):
+        """앱의 JSON provider(Flask 2.2+)의 dumps를 감싸 직렬화 시간을 기록합니다."""
+        provider = getattr(app, 'json', None)
+        if provider is None or not hasattr(provider, 'dumps'):
+            return
+        original_dumps = provider.dumps
+
+        def timed_dumps(obj, **kwargs):
+            started = time.perf_counter()
+            try:
+                return original_dumps(obj, **kwargs)
+            finally:
+                record_serialization_time(time.perf_counter() - started)
+
+        provider.dumps = timed_dumps
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('_query_started_at', []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started_stack = conn.info.get('_query_started_at')
+        if not started_stack:
+            return
+        started = started_stack.pop()
+        stats = g.get('_request_stats') if has_app_context() else None
+        if stats is not None:
+            stats.sql_count += 1
+            stats.sql_time += time.perf_counter() - started
+            stats.shapes[statement_shape(statement)] += 1
+
+    def _save_profile(self, profiler, duration, endpoint):
+        """가장 느린 요청 N개 안에 들면 프로파일을 파일로 저장하고, 밀려난 파일은 삭제합니다."""
+        if len(self._saved_profiles) >= self.profile_keep and duration <= self._saved_profiles[0][0]:
+            return
+        os.makedirs(self.profile_dir, exist_ok=True)
+        filename = f"{int(duration * 1000):06d}ms_{endpoint.replace('.', '_')}_{datetime.utcnow():%Y%m%dT%H%M%S%f}.prof"
+        path = os.path.join(self.profile_dir, filename)
+        profiler.dump_stats(path)
+        bisect.insort(self._saved_profiles, (duration, path))
+        while len(self._saved_profiles) > self.profile_keep:
+            _, removed = self._saved_profiles.pop(0)
+            try:
+                os.remove(removed)
+            except OSError:
+                pass
+
+    def render_metrics(self):
+        """수집된 모든 메트릭을 Prometheus 텍스트 형식 문자열로 반환합니다."""
+        lines = []
+        for metric in (self.request_duration, self.sql_statements, self.sql_duration,
+                       self.serialization_duration, self.n_plus_one):
+            lines.extend(metric.render())
+
+        cache_stats = get_weekly_score_cache().stats()
+        for name in ('hits', 'misses', 'evictions'):
+            lines.append(f'# TYPE weekly_score_cache_{name}_total counter')
+            lines.append(f'weekly_score_cache_{name}_total {cache_stats.get(name, 0)}')
+        return '\n'.join(lines) + '\n'
+
+    def metrics_view(self):
+        """수집된 요청 메트릭을 Prometheus 텍스트 형식으로 반환합니다."""
+        return Response(self.render_metrics(), mimetype='text/plain; version=0.0.4')
+
+instrumentation = Instrumentation()
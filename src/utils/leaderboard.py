@@ -0,0 +1,101 @@
+from sqlalchemy import or_
+from ..models.user import db, User
+from .friend_queries import accepted_friend_ids_select
+from .scores import DEFAULT_SCORE_WINDOW, get_window_scores, score_as_of, score_fields
+
+def fetch_participant_scores(user_id, days=DEFAULT_SCORE_WINDOW, as_of=None):
+    """
+    사용자 본인과 모든 친구의 기간 점수와 이름을 조회합니다.
+
+    참가자(본인과 수락된 친구)의 이름은 한 번의 쿼리로 읽고, 점수는 점수 캐시(`get_window_scores`)에서
+    가져옵니다. 캐시에 없는 사용자의 점수만 일별 롤업에서 한 번의 집계 쿼리로 계산하므로,
+    친구 수와 관계없이 쿼리는 최대 두 번입니다.
+
+    Args:
+        user_id: 기준 사용자의 ID.
+        days: 점수 기간(일).
+        as_of: 기준일. None이면 오늘.
+
+    Returns:
+        list: (user_id, username, score) 튜플 리스트. 점수 내림차순, 이름 오름차순으로 정렬됩니다.
+    """
+    participants = db.session.query(User.id, User.username).filter(
+        or_(User.id == user_id, User.id.in_(accepted_friend_ids_select(user_id)))
+    ).all()
+    scores = get_window_scores([uid for uid, _ in participants], days, as_of or score_as_of())
+    rows = [(uid, username, scores[uid]) for uid, username in participants]
+    rows.sort(key=lambda row: (-row[2], row[1]))
+    return rows
+
+def rank_entries(rows, current_user_id, days=DEFAULT_SCORE_WINDOW):
+    """
+    점수 내림차순으로 정렬된 행에 순위를 매깁니다.
+
+    동점자는 같은 순위를 받고, 다음 순위는 동점자 수만큼 건너뜁니다 (예: 1, 2, 2, 4).
+
+    Args:
+        rows: (user_id, username, score) 튜플 리스트 (점수 내림차순 정렬).
+        current_user_id: `is_current_user` 표시에 사용할 현재 사용자의 ID.
+        days: 점수 기간(일). 7일이면 항목에 `weekly_score`도 포함합니다.
+
+    Returns:
+        list: 리더보드 항목 딕셔너리 리스트.
+    """
+    entries = []
+    previous_score = None
+    rank = 0
+    for position, (uid, username, score) in enumerate(rows, start=1):
+        score = int(score or 0)
+        if score != previous_score:
+            rank = position
+            previous_score = score
+        entries.append({
+            'user_id': uid,
+            'username': username,
+            **score_fields(score, days),
+            'is_current_user': uid == current_user_id,
+            'rank': rank
+        })
+    return entries
+
+def build_leaderboard(user_id, limit=None, offset=0, around=None, days=DEFAULT_SCORE_WINDOW, as_of=None):
+    """
+    사용자와 친구들의 기간 점수(기본값: 주간) 리더보드를 생성합니다.
+
+    Args:
+        user_id: 기준 사용자의 ID.
+        limit: 반환할 최대 항목 수 (None이면 전체).
+        offset: 건너뛸 항목 수. `around`가 지정되면 무시됩니다.
+        around: 지정 시 현재 사용자의 위아래로 이 개수만큼의 항목만 반환합니다 ("rank around me").
+        days: 점수 기간(일). `SCORE_WINDOWS` 중 하나.
+        as_of: 기준일. None이면 오늘.
+
+    Returns:
+        dict: 'leaderboard', 'total_participants', 'current_user_rank', 'window_days', 'as_of' 키를 가진 딕셔너리.
+    """
+    as_of = as_of or score_as_of()
+    rows = fetch_participant_scores(user_id, days, as_of)
+
+    entries = rank_entries(rows, user_id, days)
+    total_participants = len(entries)
+
+    current_index = next((i for i, entry in enumerate(entries) if entry['is_current_user']), None)
+    current_user_rank = entries[current_index]['rank'] if current_index is not None else None
+
+    if around is not None:
+        if current_index is None:
+            entries = []
+        else:
+            entries = entries[max(current_index - around, 0):current_index + around + 1]
+    else:
+        entries = entries[offset:]
+        if limit is not None:
+            entries = entries[:limit]
+
+    return {
+        'leaderboard': entries,
+        'total_participants': total_participants,
+        'current_user_rank': current_user_rank,
+        'window_days': days,
+        'as_of': as_of.isoformat()
+    }
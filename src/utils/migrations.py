@@ -0,0 +1,187 @@
+import os
+from sqlalchemy import inspect, text
+from sqlalchemy.schema import CreateColumn
+from ..models.user import db
+from .catalog import TIME_OF_DAY_CODES, OTHER_TIME_OF_DAY_CODE
+from .search import drop_search_index, ensure_search_index
+
+def ensure_columns():
+    """
+    모델에 새로 추가된 컬럼 중 기존 테이블에 없는 것을 `ALTER TABLE ... ADD COLUMN`으로 추가합니다.
+
+    별도의 마이그레이션 도구 없이 기존 SQLite 데이터베이스를 최신 모델에 맞추기 위한 용도이므로,
+    새 컬럼은 NULL을 허용하거나 서버 기본값을 가져야 합니다.
+
+    Returns:
+        list: 추가된 컬럼의 'table.column' 이름 리스트.
+    """
+    inspector = inspect(db.engine)
+    added = []
+    with db.engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+            existing = {column['name'] for column in inspector.get_columns(table.name)}
+            for column in table.columns:
+                if column.name in existing:
+                    continue
+                column_ddl = CreateColumn(column).compile(dialect=db.engine.dialect)
+                connection.execute(text(f'ALTER TABLE {table.name} ADD COLUMN {column_ddl}'))
+                added.append(f'{table.name}.{column.name}')
+    return added
+
+def ensure_indexes():
+    """
+    모델에 선언된 인덱스 중 데이터베이스에 없는 것을 생성합니다.
+
+    `db.create_all()`은 이미 존재하는 테이블에 새로 선언된 인덱스를 추가하지 않으므로,
+    기존 데이터베이스에도 인덱스가 적용되도록 시작 시 함께 호출합니다.
+
+    Returns:
+        int: 확인한 인덱스 수.
+    """
+    checked = 0
+    for table in db.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=db.engine, checkfirst=True)
+            checked += 1
+    return checked
+
+
+def ensure_database_directory():
+    """
+    파일 기반 SQLite 데이터베이스의 상위 디렉토리가 없으면 만듭니다.
+
+    설정 클래스 정의 시점이 아니라 `init-db` 명령에서 한 번만 파일 시스템을 확인합니다.
+    """
+    url = db.engine.url
+    if url.get_backend_name() == 'sqlite' and url.database not in (None, '', ':memory:'):
+        os.makedirs(os.path.dirname(os.path.abspath(url.database)), exist_ok=True)
+
+def backfill_friend_edges():
+    """
+    친구 인접 인덱스(friend_edges)가 비어 있고 친구 관계가 있으면 친구 관계 테이블로부터 채웁니다.
+
+    인접 인덱스가 추가되기 전에 만들어진 데이터베이스를 위한 일회성 백필입니다.
+
+    Returns:
+        int: 생성된 행 수. 백필이 필요 없으면 0.
+    """
+    from ..models.friendship import Friendship
+    from ..models.friend_edge import FriendEdge
+    from .friend_queries import rebuild_friend_edges
+    if db.session.query(FriendEdge.user_id).first() or not db.session.query(Friendship.id).first():
+        return 0
+    return rebuild_friend_edges()
+
+def backfill_record_updated_at():
+    """
+    updated_at이 비어 있는 운동 기록을 created_at(또는 현재 시각)으로 채웁니다.
+
+    증분 동기화는 (updated_at, id) 커서로 변경을 찾으므로, 값이 NULL인 행은 커서 비교에서 빠지게 됩니다.
+
+    Returns:
+        int: 채운 행 수.
+    """
+    with db.engine.begin() as connection:
+        return connection.execute(text(
+            'UPDATE exercise_records SET updated_at = COALESCE(created_at, CURRENT_TIMESTAMP) WHERE updated_at IS NULL'
+        )).rowcount
+
+def backfill_rollups():
+    """
+    일별 롤업 테이블이 비어 있고 운동 기록이 있으면 운동 기록으로부터 채웁니다.
+
+    롤업 테이블이 추가되기 전에 만들어진 데이터베이스를 위한 일회성 백필입니다. 채우지 않으면
+    통계, 리더보드, 친구 점수가 모두 0으로 조회됩니다.
+
+    Returns:
+        int: 생성된 롤업 행 수. 백필이 필요 없으면 0.
+    """
+    from ..models.exercise_record import ExerciseRecord
+    from ..models.daily_exercise_rollup import DailyExerciseRollup
+    from .rollup import rebuild_rollups
+    if db.session.query(DailyExerciseRollup.user_id).first() or not db.session.query(ExerciseRecord.id).first():
+        return 0
+    return rebuild_rollups()
+
+def normalize_exercise_records():
+    """
+    운동 종류와 시간대를 문자열로 저장하던 기존 exercise_records 테이블을 ID/코드 컬럼으로 바꿉니다.
+
+    1. 기존 운동 종류 이름을 exercise_types 카탈로그에 추가합니다.
+    2. 새 스키마로 테이블을 다시 만들고 (SQLite는 컬럼 타입 변경과 삭제가 제한적이므로),
+       기존 행을 카탈로그 ID와 시간대 코드로 바꿔 복사합니다. 목록에 없는 시간대 값은 '기타'(0)가 됩니다.
+    3. 검색 색인은 원본이 바뀌므로 삭제하며, 이후 `ensure_search_index`가 다시 만듭니다.
+
+    일별 롤업은 시간대를 이름으로 집계하므로, 목록에 없던 시간대 값이 '기타'로 바뀐 기록과 어긋납니다.
+    변환한 기록이 있으면 `init_database`가 롤업을 다시 만듭니다.
+
+    모든 단계는 하나의 트랜잭션에서 실행됩니다. 이미 변환된 데이터베이스에서는 아무 작업도 하지 않습니다.
+    변환 후 파일 크기를 줄이려면 `VACUUM`을 실행합니다.
+
+    Returns:
+        int: 변환된 운동 기록 수.
+    """
+    from ..models.exercise_record import ExerciseRecord
+    from ..models.exercise_type import ExerciseType
+
+    inspector = inspect(db.engine)
+    if not inspector.has_table(ExerciseRecord.__tablename__):
+        return 0
+    legacy_columns = {column['name'] for column in inspector.get_columns(ExerciseRecord.__tablename__)}
+    if 'exercise_type' not in legacy_columns:
+        return 0
+
+    time_of_day_case = 'CASE r.time_of_day {} ELSE {} END'.format(
+        ' '.join(f"WHEN '{label}' THEN {code}" for label, code in TIME_OF_DAY_CODES.items() if code),
+        OTHER_TIME_OF_DAY_CODE
+    )
+    copied = [column.name for column in ExerciseRecord.__table__.columns if column.name in legacy_columns]
+    target_columns = copied + ['exercise_type_id', 'time_of_day_code']
+    source_columns = [f'r.{name}' for name in copied] + ['t.id', time_of_day_case]
+
+    with db.engine.begin() as connection:
+        ExerciseType.__table__.create(connection, checkfirst=True)
+        connection.execute(text(
+            'INSERT OR IGNORE INTO exercise_types (name, created_at) '
+            'SELECT DISTINCT exercise_type, CURRENT_TIMESTAMP FROM exercise_records'
+        ))
+        drop_search_index(connection)
+        # 인덱스 이름은 데이터베이스 전체에서 고유하므로, 새 테이블을 만들기 전에 기존 인덱스를 삭제합니다.
+        for index in inspector.get_indexes(ExerciseRecord.__tablename__):
+            connection.execute(text(f'DROP INDEX IF EXISTS {index["name"]}'))
+        connection.execute(text('ALTER TABLE exercise_records RENAME TO exercise_records_legacy'))
+        ExerciseRecord.__table__.create(connection)
+        count = connection.execute(text(
+            f"INSERT INTO exercise_records ({', '.join(target_columns)}) "
+            f"SELECT {', '.join(source_columns)} FROM exercise_records_legacy r "
+            "JOIN exercise_types t ON t.name = r.exercise_type"
+        )).rowcount
+        connection.execute(text('DROP TABLE exercise_records_legacy'))
+    return count
+
+def init_database():
+    """
+    데이터베이스 디렉토리와 테이블을 만들고, 누락된 컬럼과 인덱스를 추가합니다. 앱 컨텍스트 안에서 호출합니다.
+    기존 운동 기록의 운동 종류/시간대 문자열을 ID/코드로 변환하고 (변환한 경우 일별 롤업을 다시 만듭니다),
+    일별 롤업과 친구 인접 인덱스가 비어 있으면 기존 운동 기록과 친구 관계로부터 백필하며,
+    비어 있는 운동 기록 updated_at을 채우고, 운동 기록 검색 색인(FTS5)을 만듭니다.
+
+    Returns:
+        tuple: (추가된 컬럼 이름 리스트, 확인한 인덱스 수).
+    """
+    from .rollup import rebuild_rollups
+    ensure_database_directory()
+    normalized = normalize_exercise_records()
+    db.create_all()
+    added, checked = ensure_columns(), ensure_indexes()
+    if normalized:
+        # 롤업의 시간대/운동 종류 이름을 변환된 기록(목록에 없던 시간대는 '기타')에 맞춥니다.
+        rebuild_rollups()
+    else:
+        backfill_rollups()
+    backfill_friend_edges()
+    backfill_record_updated_at()
+    ensure_search_index()
+    return added, checked
@@ -0,0 +1,65 @@
+import base64
+import binascii
+from datetime import datetime
+from sqlalchemy import and_, or_
+
+class InvalidCursorError(ValueError):
+    """커서 문자열을 해석할 수 없을 때 발생하는 예외"""
+
+def encode_cursor(created_at, record_id):
+    """
+    (created_at, id) 키를 클라이언트에 전달할 불투명한 커서 문자열로 인코딩합니다.
+
+    Args:
+        created_at: 마지막으로 반환한 행의 생성 시각.
+        record_id: 마지막으로 반환한 행의 ID.
+
+    Returns:
+        str: URL-safe base64 커서 문자열.
+    """
+    raw = f"{created_at.isoformat()}|{record_id}"
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+def decode_cursor(cursor):
+    """
+    `encode_cursor`로 만든 커서 문자열을 (created_at, id) 튜플로 되돌립니다.
+
+    Args:
+        cursor: 커서 문자열.
+
+    Returns:
+        tuple: (datetime, int).
+
+    Raises:
+        InvalidCursorError: 커서 형식이 올바르지 않은 경우.
+    """
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        raw = base64.urlsafe_b64decode(padded.encode('ascii')).decode('utf-8')
+        created_at, record_id = raw.rsplit('|', 1)
+        return datetime.fromisoformat(created_at), int(record_id)
+    except (ValueError, binascii.Error, UnicodeError) as e:
+        raise InvalidCursorError(f"잘못된 커서입니다: {cursor}") from e
+
+def apply_keyset(query, created_at_column, id_column, cursor):
+    """
+    (created_at, id) 내림차순 키셋 페이지네이션 조건과 정렬을 쿼리에 적용합니다.
+
+    OFFSET과 달리 앞 페이지의 행을 건너뛰며 읽지 않으므로, 페이지 위치와 관계없이 비용이 일정합니다.
+
+    Args:
+        query: 원본 쿼리.
+        created_at_column: 정렬 기준 시각 컬럼.
+        id_column: 동일 시각 내 정렬을 위한 PK 컬럼.
+        cursor: 이전 페이지의 커서 문자열 (없으면 첫 페이지).
+
+    Returns:
+        Query: 조건과 정렬이 적용된 쿼리.
+    """
+    if cursor:
+        last_created_at, last_id = decode_cursor(cursor)
+        query = query.filter(or_(
+            created_at_column < last_created_at,
+            and_(created_at_column == last_created_at, id_column < last_id)
+        ))
+    return query.order_by(created_at_column.desc(), id_column.desc())
@@ -1,6 +1,6 @@
 from flask import jsonify
 
-def api_success(data=None, message="성공", status_code=200):
+def api_success(data=None, message="성공", status_code=200, meta=None):
     """
     성공적인 API 응답을 위한 표준 형식을 생성합니다.
 
@@ -8,6 +8,7 @@ def api_success(data=None, message="성공", status_code=200):
         data: 클라이언트에게 전달할 데이터 (dict 또는 list).
         message: 응답 메시지.
         status_code: HTTP 상태 코드.
+        meta: 페이지네이션 정보 등 부가 정보 (선택 사항).
 
     Returns:
         Response: Flask Response 객체.
@@ -18,6 +19,8 @@ def api_success(data=None, message="성공", status_code=200):
     }
     if data is not None:
         response['data'] = data
+    if meta is not None:
+        response['meta'] = meta
     return jsonify(response), status_code
 
 def api_error(message="오류가 발생했습니다.", status_code=400, error_code=None):
@@ -0,0 +1,342 @@
+from datetime import date, timedelta
+from sqlalchemy import func, literal, select, true, tuple_, union_all
+from ..models.user import db
+from ..models.exercise_record import ExerciseRecord
+from ..models.daily_exercise_rollup import DailyExerciseRollup
+from .catalog import exercise_type_catalog, time_of_day_label
+from .concurrency import query_executor
+
+INTENSITY_LEVELS = 11  # 0-10
+# 여러 기록을 한 번에 반영할 때 기존 롤업 행을 조회하는 (user_id, date) 키 청크 크기
+ROLLUP_CHUNK_SIZE = 500
+
+# 추이 버킷 단위와, 기간 일수에 따라 자동으로 고를 때의 최대 일수
+BUCKETS = ('day', 'week', 'month')
+DAY_BUCKET_MAX_DAYS = 31
+WEEK_BUCKET_MAX_DAYS = 183
+
+def record_snapshot(record):
+    """
+    롤업 갱신에 필요한 운동 기록의 필드 값을 복사해 둡니다.
+
+    수정/삭제 전에 호출하여 기존 값을 보관하는 용도로 사용합니다.
+
+    Args:
+        record: ExerciseRecord 객체.
+
+    Returns:
+        dict: user_id, date, time_of_day, intensity, exercise_type 값을 담은 딕셔너리.
+    """
+    return {
+        'user_id': record.user_id,
+        'date': record.date,
+        'time_of_day': record.time_of_day,
+        'intensity': record.intensity,
+        'exercise_type': record.exercise_type
+    }
+
+def _adjust_counts(counts, key, delta):
+    counts = dict(counts or {})
+    value = counts.get(key, 0) + delta
+    if value > 0:
+        counts[key] = value
+    else:
+        counts.pop(key, None)
+    return counts
+
+def _rollup_deltas(snapshots, sign):
+    """운동 기록들을 (user_id, date)별 롤업 변화량으로 합칩니다."""
+    deltas = {}
+    for snapshot in snapshots:
+        delta = deltas.setdefault((snapshot['user_id'], snapshot['date']), {
+            'workout_count': 0,
+            'intensity_sum': 0,
+            'intensity_counts': [0] * INTENSITY_LEVELS,
+            'time_of_day_counts': {},
+            'exercise_type_counts': {}
+        })
+        intensity = snapshot['intensity']
+        delta['workout_count'] += sign
+        delta['intensity_sum'] += sign * intensity
+        delta['intensity_counts'][intensity] += sign
+        for field, key in (('time_of_day_counts', snapshot['time_of_day']),
+                           ('exercise_type_counts', snapshot['exercise_type'])):
+            delta[field][key] = delta[field].get(key, 0) + sign
+    return deltas
+
+def apply_many_to_rollup(snapshots, sign=1):
+    """
+    여러 운동 기록을 일별 롤업에 더하거나(sign=1) 뺍니다(sign=-1).
+
+    기록들을 먼저 (user_id, date)별 변화량으로 합친 뒤, 기존 롤업 행을 키 청크마다 한 번의 쿼리로 읽어
+    행마다 한 번씩만 갱신합니다. 따라서 대량 등록에서도 기록 수가 아니라 (사용자, 날짜) 수와 청크 수에
+    비례하는 작업만 합니다. 커밋은 하지 않으므로 호출한 쪽의 트랜잭션에 함께 포함됩니다.
+    하루의 운동 횟수가 0이 되면 해당 롤업 행을 삭제합니다.
+
+    Args:
+        snapshots: `record_snapshot`이 반환한 딕셔너리(또는 같은 키를 가진 값)의 iterable.
+        sign: 1이면 추가, -1이면 제거.
+    """
+    deltas = _rollup_deltas(snapshots, sign)
+    keys = list(deltas)
+    rollups = {}
+    for start in range(0, len(keys), ROLLUP_CHUNK_SIZE):
+        chunk = keys[start:start + ROLLUP_CHUNK_SIZE]
+        for rollup in DailyExerciseRollup.query.filter(
+            tuple_(DailyExerciseRollup.user_id, DailyExerciseRollup.date).in_(chunk)
+        ):
+            rollups[(rollup.user_id, rollup.date)] = rollup
+
+    for (user_id, day), delta in deltas.items():
+        rollup = rollups.get((user_id, day))
+        if rollup is None:
+            if sign < 0:
+                continue
+            rollup = DailyExerciseRollup(
+                user_id=user_id,
+                date=day,
+                workout_count=0,
+                intensity_sum=0,
+                intensity_max=0,
+                intensity_counts=[0] * INTENSITY_LEVELS,
+                time_of_day_counts={},
+                exercise_type_counts={}
+            )
+            db.session.add(rollup)
+
+        intensity_counts = [
+            max(count + change, 0)
+            for count, change in zip(rollup.intensity_counts or [0] * INTENSITY_LEVELS, delta['intensity_counts'])
+        ]
+        time_of_day_counts, exercise_type_counts = rollup.time_of_day_counts, rollup.exercise_type_counts
+        for key, change in delta['time_of_day_counts'].items():
+            time_of_day_counts = _adjust_counts(time_of_day_counts, key, change)
+        for key, change in delta['exercise_type_counts'].items():
+            exercise_type_counts = _adjust_counts(exercise_type_counts, key, change)
+
+        rollup.workout_count += delta['workout_count']
+        rollup.intensity_sum += delta['intensity_sum']
+        rollup.intensity_counts = intensity_counts
+        rollup.intensity_max = max((i for i, c in enumerate(intensity_counts) if c > 0), default=0)
+        rollup.time_of_day_counts = time_of_day_counts
+        rollup.exercise_type_counts = exercise_type_counts
+
+        if rollup.workout_count <= 0:
+            db.session.delete(rollup)
+
+def apply_to_rollup(snapshot, sign=1):
+    """
+    운동 기록 한 건을 일별 롤업에 더하거나(sign=1) 뺍니다(sign=-1). `apply_many_to_rollup`의 단건 버전입니다.
+
+    Args:
+        snapshot: `record_snapshot`이 반환한 딕셔너리.
+        sign: 1이면 추가, -1이면 제거.
+    """
+    apply_many_to_rollup([snapshot], sign)
+
+def rebuild_rollups(user_id=None):
+    """
+    원본 운동 기록으로부터 일별 롤업 테이블을 다시 만듭니다.
+
+    기존 롤업 행을 삭제한 뒤 GROUP BY 집계 쿼리로 다시 채우며, 마지막에 커밋합니다.
+    최초 도입 시 백필이나 롤업이 어긋났을 때의 복구 용도로 사용합니다.
+
+    Args:
+        user_id: 지정하면 해당 사용자의 롤업만 다시 만듭니다.
+
+    Returns:
+        int: 생성된 롤업 행 수.
+    """
+    def scoped(query):
+        if user_id is not None:
+            query = query.filter(ExerciseRecord.user_id == user_id)
+        return query
+
+    delete_query = DailyExerciseRollup.query
+    if user_id is not None:
+        delete_query = delete_query.filter(DailyExerciseRollup.user_id == user_id)
+    delete_query.delete(synchronize_session=False)
+
+    day_key = (ExerciseRecord.user_id, ExerciseRecord.date)
+    rollups = {}
+
+    for uid, day, value, count in scoped(db.session.query(
+        *day_key, ExerciseRecord.intensity, func.count(ExerciseRecord.id)
+    )).group_by(*day_key, ExerciseRecord.intensity):
+        rollup = rollups.setdefault((uid, day), {
+            'intensity_counts': [0] * INTENSITY_LEVELS,
+            'time_of_day_counts': {},
+            'exercise_type_counts': {}
+        })
+        rollup['intensity_counts'][value] += count
+
+    # 정수 코드/ID로 GROUP BY 한 뒤 롤업에는 이름으로 저장합니다.
+    for column, field, decode in ((ExerciseRecord.time_of_day_code, 'time_of_day_counts', time_of_day_label),
+                                  (ExerciseRecord.exercise_type_id, 'exercise_type_counts', exercise_type_catalog.name_of)):
+        for uid, day, value, count in scoped(db.session.query(
+            *day_key, column, func.count(ExerciseRecord.id)
+        )).group_by(*day_key, column):
+            rollups[(uid, day)][field][decode(value)] = count
+
+    rows = []
+    for (uid, day), rollup in rollups.items():
+        intensity_counts = rollup['intensity_counts']
+        rows.append({
+            'user_id': uid,
+            'date': day,
+            'workout_count': sum(intensity_counts),
+            'intensity_sum': sum(i * c for i, c in enumerate(intensity_counts)),
+            'intensity_max': max((i for i, c in enumerate(intensity_counts) if c > 0), default=0),
+            **rollup
+        })
+
+    if rows:
+        db.session.bulk_insert_mappings(DailyExerciseRollup, rows)
+    db.session.commit()
+    return len(rows)
+
+def load_rollups(user_ids, start_date, end_date=None):
+    """
+    기간 내 일별 롤업 행을 조회합니다.
+
+    Args:
+        user_ids: 조회할 사용자 ID 리스트.
+        start_date: 시작 날짜 (포함).
+        end_date: 종료 날짜 (포함, 선택 사항).
+
+    Returns:
+        list: DailyExerciseRollup 객체 리스트 (날짜 오름차순).
+    """
+    query = DailyExerciseRollup.query.filter(
+        DailyExerciseRollup.user_id.in_(user_ids),
+        DailyExerciseRollup.date >= start_date
+    )
+    if end_date is not None:
+        query = query.filter(DailyExerciseRollup.date <= end_date)
+    return query.order_by(DailyExerciseRollup.date).all()
+
+def choose_bucket(start_date, end_date):
+    """
+    기간 길이에 맞는 추이 버킷 단위를 고릅니다 (31일 이하: day, 183일 이하: week, 그 이상: month).
+    """
+    num_days = (end_date - start_date).days + 1
+    if num_days <= DAY_BUCKET_MAX_DAYS:
+        return 'day'
+    if num_days <= WEEK_BUCKET_MAX_DAYS:
+        return 'week'
+    return 'month'
+
+def bucket_start(day, bucket):
+    """날짜가 속한 버킷의 시작 날짜 (주: 월요일, 월: 1일)를 반환합니다."""
+    if bucket == 'week':
+        return day - timedelta(days=day.weekday())
+    if bucket == 'month':
+        return day.replace(day=1)
+    return day
+
+def _next_bucket(day, bucket):
+    if bucket == 'week':
+        return day + timedelta(days=7)
+    if bucket == 'month':
+        return date(day.year + day.month // 12, day.month % 12 + 1, 1)
+    return day + timedelta(days=1)
+
+def _bucket_expression(bucket):
+    """SQLite 날짜 함수로 롤업 날짜를 버킷 시작 날짜 문자열('YYYY-MM-DD')로 변환하는 식"""
+    column = DailyExerciseRollup.date
+    if bucket == 'week':
+        return func.date(column, '-6 days', 'weekday 1')
+    if bucket == 'month':
+        return func.strftime('%Y-%m-01', column)
+    return func.date(column)
+
+def _distribution_query(user_id, start_date, end_date):
+    """롤업의 JSON 분포 컬럼을 json_each로 펼쳐 (종류, 키, 합계)로 집계하는 SELECT 문"""
+    selects = []
+    for kind, column in (('time_of_day', DailyExerciseRollup.time_of_day_counts),
+                         ('exercise_type', DailyExerciseRollup.exercise_type_counts)):
+        entries = func.json_each(column).table_valued('key', 'value')
+        selects.append(
+            select(literal(kind).label('kind'), entries.c.key, func.sum(entries.c.value))
+            .select_from(DailyExerciseRollup.__table__.join(entries, true()))
+            .where(
+                DailyExerciseRollup.user_id == user_id,
+                DailyExerciseRollup.date.between(start_date, end_date)
+            )
+            .group_by(entries.c.key)
+        )
+    return union_all(*selects)
+
+def period_statistics(user_id, start_date, end_date, bucket=None):
+    """
+    임의의 기간에 대한 통계와 버킷별 추이를 SQL 집계로 계산합니다.
+
+    추이, 합계, 최대 강도, 운동한 날 수는 버킷 단위 GROUP BY 쿼리 한 번으로,
+    시간대/운동 종류 분포는 json_each 집계 쿼리 한 번으로 구하므로,
+    1년 범위도 1주 범위와 같은 수의 쿼리로 처리됩니다. 운동하지 않은 버킷은 0으로 채웁니다.
+    두 쿼리는 서로 독립적이므로 `query_executor`로 동시에 실행합니다.
+
+    Args:
+        user_id: 사용자 ID.
+        start_date: 시작 날짜 (포함).
+        end_date: 종료 날짜 (포함).
+        bucket: 'day', 'week', 'month' 중 하나. None이면 기간 길이에 따라 자동 선택합니다.
+
+    Returns:
+        dict: bucket, total_workouts, total_intensity_score, max_intensity, active_days, total_days,
+              consistency_score, time_of_day_distribution, exercise_type_distribution, trends 키를 가진 딕셔너리.
+    """
+    bucket = bucket or choose_bucket(start_date, end_date)
+    bucket_column = _bucket_expression(bucket).label('bucket')
+
+    def bucket_rows():
+        return db.session.query(
+            bucket_column,
+            func.sum(DailyExerciseRollup.workout_count),
+            func.sum(DailyExerciseRollup.intensity_sum),
+            func.max(DailyExerciseRollup.intensity_max),
+            func.count()
+        ).filter(
+            DailyExerciseRollup.user_id == user_id,
+            DailyExerciseRollup.date.between(start_date, end_date),
+            DailyExerciseRollup.workout_count > 0
+        ).group_by(bucket_column).all()
+
+    def distribution_rows():
+        return db.session.execute(_distribution_query(user_id, start_date, end_date)).all()
+
+    rows, distribution_result = query_executor.gather(bucket_rows, distribution_rows)
+    by_bucket = {row[0]: row for row in rows}
+
+    distributions = {'time_of_day': {}, 'exercise_type': {}}
+    for kind, key, count in distribution_result:
+        if count:
+            distributions[kind][key] = int(count)
+
+    trends = []
+    current = bucket_start(start_date, bucket)
+    while current <= end_date:
+        _, workout_count, intensity_sum, _, active_days = by_bucket.get(current.isoformat(), (None, 0, 0, 0, 0))
+        trends.append({
+            'date': current.isoformat(),
+            'average_intensity': round(intensity_sum / workout_count, 1) if workout_count else 0,
+            'workout_count': int(workout_count),
+            'active_days': int(active_days)
+        })
+        current = _next_bucket(current, bucket)
+
+    total_days = (end_date - start_date).days + 1
+    active_days = sum(int(row[4]) for row in rows)
+    return {
+        'bucket': bucket,
+        'total_workouts': sum(int(row[1]) for row in rows),
+        'total_intensity_score': sum(int(row[2]) for row in rows),
+        'max_intensity': max((int(row[3]) for row in rows), default=0),
+        'active_days': active_days,
+        'total_days': total_days,
+        'consistency_score': round(active_days / total_days * 100, 1),
+        'time_of_day_distribution': distributions['time_of_day'],
+        'exercise_type_distribution': distributions['exercise_type'],
+        'trends': trends
+    }
+
@@ -0,0 +1,143 @@
+from datetime import date, timedelta
+from sqlalchemy import case, func
+from ..models.user import db
+from ..models.daily_exercise_rollup import DailyExerciseRollup
+from .cache import get_weekly_score_cache, score_key
+from .validation import parse_iso_date
+
+# 점수 기간(일). 운동 날짜(date) 기준으로 기준일(as_of)을 포함한 최근 N일의 운동 강도 합계입니다.
+SCORE_WINDOWS = (7, 30, 90)
+DEFAULT_SCORE_WINDOW = 7
+# 이 기간의 점수는 기존 클라이언트 호환을 위해 `weekly_score` 키로도 반환합니다.
+WEEKLY_SCORE_WINDOW = 7
+
+def score_as_of():
+    """
+    점수 기준일(오늘)을 반환합니다.
+
+    점수는 기록 시각이 아니라 운동 날짜 단위로 집계되므로, 같은 날의 요청은 모두 같은 구간을 사용하며
+    결과를 캐시하거나 요청 사이에 공유할 수 있습니다.
+    """
+    return date.today()
+
+def score_fields(score, days):
+    """
+    응답 항목에 담을 점수 필드를 반환합니다.
+
+    `score`는 항상 포함하고, 7일 기간이면 기존 응답 키인 `weekly_score`도 같은 값으로 포함합니다.
+    """
+    fields = {'score': score}
+    if days == WEEKLY_SCORE_WINDOW:
+        fields['weekly_score'] = score
+    return fields
+
+def window_start(days, as_of):
+    """기준일을 포함한 최근 `days`일 구간의 시작 날짜를 반환합니다."""
+    return as_of - timedelta(days=days - 1)
+
+def parse_score_window(window=None, as_of=None):
+    """
+    쿼리 파라미터의 점수 기간과 기준일을 검증합니다.
+
+    Args:
+        window: 기간(일) 문자열 또는 정수. None이면 `DEFAULT_SCORE_WINDOW`.
+        as_of: 기준일 문자열 (YYYY-MM-DD). None이면 오늘.
+
+    Returns:
+        tuple: (기간 일수, 기준일 date).
+
+    Raises:
+        ValueError: 값이 올바르지 않은 경우. 메시지는 클라이언트에 그대로 전달할 수 있습니다.
+    """
+    try:
+        days = int(window) if window is not None else DEFAULT_SCORE_WINDOW
+    except ValueError:
+        days = None
+    if days not in SCORE_WINDOWS:
+        raise ValueError(f"window는 {', '.join(map(str, SCORE_WINDOWS))} 중 하나여야 합니다.")
+    if as_of is None:
+        return days, score_as_of()
+    try:
+        return days, parse_iso_date(as_of)
+    except ValueError:
+        raise ValueError('as_of 날짜 형식이 올바르지 않습니다.')
+
+def fetch_window_scores(user_ids, windows=SCORE_WINDOWS, as_of=None):
+    """
+    여러 사용자의 여러 기간 점수를 일별 롤업에서 한 번의 집계 쿼리로 계산합니다.
+
+    가장 긴 기간의 롤업 행만 읽고, 짧은 기간은 같은 행을 날짜 조건으로 나눠 더합니다.
+
+    Args:
+        user_ids: 사용자 ID의 iterable.
+        windows: 계산할 기간(일)들.
+        as_of: 기준일. None이면 오늘.
+
+    Returns:
+        dict: {user_id: {기간: 점수}}. 기록이 없는 사용자도 0점으로 포함됩니다.
+    """
+    user_ids = set(user_ids)
+    as_of = as_of or score_as_of()
+    scores = {user_id: dict.fromkeys(windows, 0) for user_id in user_ids}
+    if not user_ids:
+        return scores
+
+    sums = [
+        func.sum(case(
+            (DailyExerciseRollup.date >= window_start(days, as_of), DailyExerciseRollup.intensity_sum), else_=0
+        ))
+        for days in windows
+    ]
+    rows = db.session.query(DailyExerciseRollup.user_id, *sums).filter(
+        DailyExerciseRollup.user_id.in_(user_ids),
+        DailyExerciseRollup.date.between(window_start(max(windows), as_of), as_of)
+    ).group_by(DailyExerciseRollup.user_id)
+    for user_id, *values in rows:
+        scores[user_id] = {days: int(value or 0) for days, value in zip(windows, values)}
+    return scores
+
+def cache_window_scores(scores, days, as_of):
+    """
+    다른 집계(리더보드, 친구 목록)에서 함께 계산한 점수({user_id: 점수})로 점수 캐시를 채웁니다.
+
+    기록 변경 시 `invalidate_scores`는 오늘 기준 키만 지우므로, 다른 기준일의 점수는 캐시하지 않습니다.
+    """
+    if as_of != score_as_of():
+        return
+    get_weekly_score_cache().set_many({score_key(user_id, days, as_of): int(score) for user_id, score in scores.items()})
+
+def get_window_scores(user_ids, days=DEFAULT_SCORE_WINDOW, as_of=None):
+    """
+    여러 사용자의 기간 점수를 반환합니다. 캐시에 없는 사용자만 한 번의 쿼리로 계산합니다.
+
+    계산할 때는 모든 기간(`SCORE_WINDOWS`)을 함께 구해 캐시에 저장하므로, 같은 사용자의 다른 기간 조회는 쿼리가 없습니다.
+    캐시 키에 기준일이 포함되므로 날짜가 바뀌면 자연히 새 구간으로 계산됩니다.
+    오늘이 아닌 기준일은 기록 변경 시 무효화되지 않으므로 캐시를 거치지 않고 매번 한 번의 쿼리로 계산합니다.
+
+    Args:
+        user_ids: 사용자 ID의 iterable.
+        days: 기간(일). `SCORE_WINDOWS` 중 하나.
+        as_of: 기준일. None이면 오늘.
+
+    Returns:
+        dict: {user_id: 점수}.
+    """
+    as_of = as_of or score_as_of()
+    if as_of != score_as_of():
+        return {user_id: values[days] for user_id, values in fetch_window_scores(user_ids, (days,), as_of).items()}
+
+    cache = get_weekly_score_cache()
+    scores, missing = {}, []
+    for user_id in set(user_ids):
+        hit, score = cache.get(score_key(user_id, days, as_of))
+        if hit:
+            scores[user_id] = score
+        else:
+            missing.append(user_id)
+
+    if missing:
+        computed = fetch_window_scores(missing, SCORE_WINDOWS, as_of)
+        for window in SCORE_WINDOWS:
+            cache_window_scores({user_id: values[window] for user_id, values in computed.items()}, window, as_of)
+        scores.update({user_id: values[days] for user_id, values in computed.items()})
+    return scores
@@ -0,0 +1,192 @@
+from flask import current_app
+from sqlalchemy import column, func, inspect, literal_column, or_, select, table, text
+from sqlalchemy.exc import OperationalError
+from ..models.user import db
+from ..models.exercise_record import ExerciseRecord
+from ..models.exercise_type import ExerciseType
+from .serialization import record_columns, record_row_to_dict
+
+# exercise_records의 운동 종류 이름과 memo를 색인하는 FTS5 외부 콘텐츠 테이블과, 그 원본이 되는 뷰
+FTS_TABLE = 'exercise_records_fts'
+FTS_SOURCE_VIEW = 'exercise_records_search_source'
+# trigram 토크나이저는 3글자 단위로 색인하므로, 이보다 짧은 검색어(예: '러닝')는 LIKE로 처리합니다.
+MIN_TRIGRAM_LENGTH = 3
+# bm25 컬럼 가중치 (exercise_type, memo): 운동 종류 일치를 메모 일치보다 높게 평가합니다.
+SEARCH_COLUMN_WEIGHTS = (2.0, 1.0)
+MAX_SEARCH_TERMS = 8
+
+fts_table = table(FTS_TABLE, column('rowid'))
+
+FTS_TRIGGERS = (f'{FTS_TABLE}_ai', f'{FTS_TABLE}_ad', f'{FTS_TABLE}_au')
+
+SEARCH_INDEX_DDL = (
+    # 운동 기록은 운동 종류를 ID로 저장하므로, 이름을 붙인 뷰를 외부 콘텐츠('rebuild'의 원본)로 사용합니다.
+    f"""CREATE VIEW IF NOT EXISTS {FTS_SOURCE_VIEW} AS
+        SELECT r.id AS id, t.name AS exercise_type, r.memo AS memo
+        FROM exercise_records r JOIN exercise_types t ON t.id = r.exercise_type_id""",
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    f"exercise_type, memo, content='{FTS_SOURCE_VIEW}', content_rowid='id', tokenize='trigram')",
+    # 외부 콘텐츠 테이블이므로 원본 테이블의 변경을 트리거로 색인에 반영합니다.
+    # (ORM 쓰기와 Core 대량 삽입 모두 같은 트랜잭션에서 반영됩니다)
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON exercise_records BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, exercise_type, memo)
+        SELECT new.id, name, new.memo FROM exercise_types WHERE id = new.exercise_type_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON exercise_records BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, exercise_type, memo)
+        SELECT 'delete', old.id, name, old.memo FROM exercise_types WHERE id = old.exercise_type_id;
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF exercise_type_id, memo ON exercise_records BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, exercise_type, memo)
+        SELECT 'delete', old.id, name, old.memo FROM exercise_types WHERE id = old.exercise_type_id;
+        INSERT INTO {FTS_TABLE}(rowid, exercise_type, memo)
+        SELECT new.id, name, new.memo FROM exercise_types WHERE id = new.exercise_type_id;
+    END"""
+)
+
+def drop_search_index(connection):
+    """검색 색인 테이블, 트리거, 원본 뷰를 삭제합니다 (정의가 바뀌었을 때 다시 만들기 위해 사용)."""
+    for trigger in FTS_TRIGGERS:
+        connection.execute(text(f'DROP TRIGGER IF EXISTS {trigger}'))
+    connection.execute(text(f'DROP TABLE IF EXISTS {FTS_TABLE}'))
+    connection.execute(text(f'DROP VIEW IF EXISTS {FTS_SOURCE_VIEW}'))
+
+def ensure_search_index():
+    """
+    SQLite FTS5 검색 색인과 동기화 트리거를 만들고, 새로 만든 경우 기존 기록으로 채웁니다.
+
+    SQLite가 아니거나 FTS5 trigram 토크나이저(SQLite 3.34+)를 지원하지 않으면 만들지 않으며,
+    이 경우 검색은 LIKE 부분 일치로 동작합니다.
+
+    Returns:
+        bool: 검색 색인을 사용할 수 있으면 True.
+    """
+    if db.engine.url.get_backend_name() != 'sqlite':
+        return False
+    try:
+        with db.engine.begin() as connection:
+            definition = connection.execute(
+                text("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = :name"), {'name': FTS_TABLE}
+            ).scalar()
+            # 이전 정의(exercise_records를 직접 원본으로 사용)의 색인은 삭제하고 다시 만듭니다.
+            if definition is not None and FTS_SOURCE_VIEW not in definition:
+                drop_search_index(connection)
+                definition = None
+            created = definition is None
+            for statement in SEARCH_INDEX_DDL:
+                connection.execute(text(statement))
+            if created:
+                connection.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+    except OperationalError as e:
+        current_app.logger.warning(f"FTS5 검색 색인을 만들 수 없어 LIKE 검색을 사용합니다: {e}")
+        return False
+    return True
+
+def rebuild_search_index():
+    """
+    검색 색인을 exercise_records 전체로부터 다시 만듭니다 (색인이 어긋난 경우 복구용).
+
+    Returns:
+        int: 색인된 기록 수.
+    """
+    db.session.execute(text(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"))
+    db.session.commit()
+    return db.session.query(func.count(ExerciseRecord.id)).scalar()
+
+def search_index_ready():
+    """
+    검색 색인 테이블이 존재하는지 확인합니다.
+
+    사용 가능한 경우에만 앱 확장 상태에 기억하므로, 워커 실행 중에 `init-db`로 색인을 만들어도 반영됩니다.
+    """
+    state = current_app.extensions.setdefault('search_index', {})
+    if not state.get('ready'):
+        state['ready'] = db.engine.url.get_backend_name() == 'sqlite' and inspect(db.engine).has_table(FTS_TABLE)
+    return state['ready']
+
+def split_search_terms(query_text):
+    """검색어를 공백 기준으로 나누고, FTS 연산자로 쓰이는 따옴표와 '*'를 제거합니다. 중복은 제외합니다."""
+    terms = []
+    for term in query_text.replace('"', ' ').replace('*', ' ').split():
+        if term not in terms:
+            terms.append(term)
+    return terms[:MAX_SEARCH_TERMS]
+
+def fts_match_expression(terms):
+    """
+    검색어들을 모두 포함하는(AND) FTS5 MATCH 식을 만듭니다.
+
+    각 검색어는 따옴표로 감싼 문자열로 넘기므로, trigram 토크나이저에서 부분 문자열(접두어 포함) 일치로 동작합니다.
+    """
+    return ' AND '.join(f'"{term}"' for term in terms)
+
+def like_pattern(term):
+    """LIKE 부분 일치 패턴을 만듭니다. 검색어의 %, _는 문자 그대로 일치하도록 이스케이프합니다."""
+    escaped = term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+    return f'%{escaped}%'
+
+def matching_type_ids(term):
+    """이름에 검색어가 포함된 운동 종류 ID를 반환하는 SELECT 문 (카탈로그는 작으므로 ILIKE로 충분합니다)"""
+    return select(ExerciseType.id).where(ExerciseType.name.ilike(like_pattern(term), escape='\\'))
+
+def exercise_type_filter(term):
+    """
+    운동 종류 부분 일치 조건을 반환합니다.
+
+    기록마다 운동 종류 문자열을 비교하는 대신, 작은 운동 종류 카탈로그에서 일치하는 ID를 찾아
+    `exercise_type_id IN (...)`으로 비교하므로 검색어 길이와 관계없이 기록 행의 문자열 비교가 없습니다.
+    """
+    return ExerciseRecord.exercise_type_id.in_(matching_type_ids(term))
+
+def search_records(query_text, user_id=None, limit=50):
+    """
+    운동 종류와 메모에서 검색어를 모두 포함하는 운동 기록을 관련도 순으로 찾습니다.
+
+    3글자 이상인 검색어는 FTS5 trigram 색인으로 찾아 bm25 점수로 정렬하고, 짧은 검색어는
+    색인으로 좁힌 결과에 LIKE 조건으로 추가 적용합니다. 모든 검색어가 짧거나 색인이 없으면
+    LIKE 부분 일치로 찾아 최신순으로 정렬합니다.
+
+    Args:
+        query_text: 검색어 (공백으로 구분된 여러 단어는 AND 조건).
+        user_id: 지정하면 해당 사용자의 기록만 검색합니다.
+        limit: 반환할 최대 기록 수.
+
+    Returns:
+        list: 운동 기록 딕셔너리 리스트. 각 항목의 'relevance'는 bm25 점수(클수록 관련도 높음)이며,
+              LIKE로 찾은 경우 None입니다.
+    """
+    terms = split_search_terms(query_text)
+    if not terms:
+        return []
+    indexed_terms = [term for term in terms if len(term) >= MIN_TRIGRAM_LENGTH]
+    use_index = bool(indexed_terms) and search_index_ready()
+    like_terms = [term for term in terms if not use_index or len(term) < MIN_TRIGRAM_LENGTH]
+
+    if use_index:
+        rank = func.bm25(literal_column(FTS_TABLE), *SEARCH_COLUMN_WEIGHTS).label('rank')
+        query = db.session.query(*record_columns(), rank).select_from(fts_table).join(
+            ExerciseRecord, ExerciseRecord.id == fts_table.c.rowid
+        ).filter(
+            literal_column(FTS_TABLE).op('MATCH')(fts_match_expression(indexed_terms))
+        ).order_by(rank, ExerciseRecord.created_at.desc())
+    else:
+        query = db.session.query(*record_columns()).order_by(
+            ExerciseRecord.created_at.desc(), ExerciseRecord.id.desc()
+        )
+
+    if user_id is not None:
+        query = query.filter(ExerciseRecord.user_id == user_id)
+    for term in like_terms:
+        pattern = like_pattern(term)
+        query = query.filter(or_(
+            ExerciseRecord.exercise_type_id.in_(matching_type_ids(term)),
+            ExerciseRecord.memo.ilike(pattern, escape='\\')
+        ))
+
+    results = []
+    for row in query.limit(limit):
+        record = record_row_to_dict(row)
+        # bm25는 관련도가 높을수록 작은(음수) 값이므로 부호를 바꿔 반환합니다.
+        record['relevance'] = round(-row[-1], 4) if use_index else None
+        results.append(record)
+    return results
@@ -0,0 +1,107 @@
+import json
+from datetime import date, datetime
+from flask.json.provider import DefaultJSONProvider
+from ..models.exercise_record import ExerciseRecord
+from .catalog import exercise_type_catalog, time_of_day_label
+
+try:
+    import orjson
+except ImportError:  # orjson은 선택 의존성입니다.
+    orjson = None
+
+# 목록 API에서 ORM 객체 없이 조회할 운동 기록 컬럼 (ExerciseRecord.to_dict()와 같은 키/순서)
+RECORD_FIELDS = (
+    'id', 'user_id', 'date', 'time_of_day', 'intensity', 'exercise_type',
+    'memo', 'client_key', 'created_at', 'updated_at'
+)
+# ID/코드로 저장되는 필드와 실제 컬럼 이름
+ENCODED_FIELDS = {'time_of_day': 'time_of_day_code', 'exercise_type': 'exercise_type_id'}
+
+def _default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f'JSON으로 직렬화할 수 없는 타입입니다: {type(value).__name__}')
+
+def dumps(obj, use_orjson=True):
+    """
+    객체를 JSON 문자열로 직렬화합니다.
+
+    orjson이 설치되어 있으면 orjson을, 없으면 표준 json 모듈을 사용합니다.
+    date/datetime은 두 경우 모두 ISO 8601 문자열로 변환됩니다.
+
+    Args:
+        obj: 직렬화할 객체.
+        use_orjson: False이면 orjson이 있어도 표준 json 모듈을 사용합니다.
+
+    Returns:
+        str: JSON 문자열.
+    """
+    if use_orjson and orjson is not None:
+        return orjson.dumps(obj, default=_default, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(obj, default=_default, ensure_ascii=False, separators=(',', ':'))
+
+class FastJSONProvider(DefaultJSONProvider):
+    """
+    Flask의 jsonify/api_success가 사용하는 JSON provider입니다.
+
+    orjson이 있으면 orjson으로 직렬화하고, 없으면 표준 json 모듈로 대체합니다.
+    기본 provider와 달리 date/datetime을 HTTP 날짜 형식이 아닌 ISO 8601 문자열로 직렬화하므로,
+    `to_dict()`를 거치지 않은 컬럼 값(datetime)도 같은 형식으로 응답됩니다.
+    """
+
+    use_orjson = orjson is not None
+
+    @staticmethod
+    def default(o):
+        if isinstance(o, (date, datetime)):
+            return o.isoformat()
+        return DefaultJSONProvider.default(o)
+
+    def dumps(self, obj, **kwargs):
+        if self.use_orjson and not kwargs:
+            return dumps(obj)
+        return super().dumps(obj, **kwargs)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self.dumps(obj) + '\n', mimetype=self.mimetype)
+
+def init_json_provider(app):
+    """
+    JSON_BACKEND 설정에 따라 앱의 JSON provider를 교체합니다.
+
+    - 'auto'(기본값): orjson이 있으면 사용하고, 없으면 표준 json 모듈을 사용합니다.
+    - 'stdlib': 항상 표준 json 모듈을 사용합니다.
+
+    Args:
+        app: Flask 앱.
+    """
+    provider = FastJSONProvider(app)
+    provider.use_orjson = orjson is not None and app.config.get('JSON_BACKEND', 'auto') != 'stdlib'
+    provider.ensure_ascii = False
+    app.json = provider
+    app.logger.info(f"JSON 직렬화 백엔드: {'orjson' if provider.use_orjson else 'stdlib'}")
+
+def record_columns():
+    """`RECORD_FIELDS` 순서의 ExerciseRecord 컬럼 목록을 반환합니다. 운동 종류와 시간대는 ID/코드 컬럼입니다."""
+    return [getattr(ExerciseRecord, ENCODED_FIELDS.get(field, field)) for field in RECORD_FIELDS]
+
+def project_records(query):
+    """
+    ExerciseRecord 쿼리가 ORM 객체 대신 필요한 컬럼만 튜플로 반환하도록 바꿉니다.
+
+    필터, 정렬, LIMIT은 그대로 유지되며, 객체 생성과 identity map 등록 비용을 건너뜁니다.
+    """
+    return query.with_entities(*record_columns())
+
+def record_row_to_dict(row):
+    """
+    `project_records`로 조회한 행을 응답용 딕셔너리로 변환합니다.
+
+    운동 종류 ID와 시간대 코드는 카탈로그 캐시로 이름으로 바꾸고, date/datetime 값은 그대로 두어
+    JSON provider(또는 `dumps`)가 ISO 8601 문자열로 직렬화합니다.
+    """
+    record = dict(zip(RECORD_FIELDS, row))
+    record['time_of_day'] = time_of_day_label(record['time_of_day'])
+    record['exercise_type'] = exercise_type_catalog.name_of(record['exercise_type'])
+    return record
@@ -0,0 +1,150 @@
+import gzip
+import hashlib
+import mimetypes
+import os
+import re
+from flask import request, send_file
+
+try:
+    import brotli
+except ImportError:  # brotli는 선택 의존성입니다. 없으면 gzip 변형만 만듭니다.
+    brotli = None
+
+# Vite 빌드 결과물처럼 파일 이름에 내용 해시가 포함된 자산 (예: assets/index-BdH3k2Qe.js)
+HASHED_ASSET_PATTERN = re.compile(r'^assets/.+-[A-Za-z0-9_-]{8,}\.[A-Za-z0-9]+$')
+COMPRESSIBLE_TYPES = ('text/', 'application/javascript', 'application/json', 'image/svg+xml')
+IMMUTABLE_CACHE_CONTROL = 'public, max-age=31536000, immutable'
+
+class StaticAsset:
+    """
+    정적 파일 하나의 메타데이터와 미리 압축한 변형(gzip, br)입니다.
+
+    Attributes:
+        path: 파일의 절대 경로.
+        mimetype: Content-Type.
+        etag: 파일 내용의 해시.
+        immutable: 파일 이름에 내용 해시가 포함되어 있는지 여부.
+        variants: {'br': bytes, 'gzip': bytes} 형태의 압축 변형.
+    """
+
+    def __init__(self, path, mimetype, etag, immutable, variants):
+        self.path = path
+        self.mimetype = mimetype
+        self.etag = etag
+        self.immutable = immutable
+        self.variants = variants
+
+def build_asset(path, relative_path, min_size=1024, max_size=10 * 1024 * 1024):
+    """
+    파일을 읽어 `StaticAsset`을 만들고, 압축 가능한 형식이면 gzip/brotli 변형을 미리 계산합니다.
+
+    압축 결과가 원본보다 작지 않으면 해당 변형은 버립니다.
+
+    Args:
+        path: 파일의 절대 경로.
+        relative_path: 정적 폴더 기준 상대 경로 ('/' 구분).
+        min_size: 이보다 작은 파일은 압축하지 않습니다.
+        max_size: 이보다 큰 파일은 메모리에 압축본을 두지 않습니다.
+
+    Returns:
+        StaticAsset: 생성된 자산.
+    """
+    with open(path, 'rb') as f:
+        content = f.read()
+    mimetype = mimetypes.guess_type(path)[0] or 'application/octet-stream'
+
+    variants = {}
+    if min_size <= len(content) <= max_size and mimetype.startswith(COMPRESSIBLE_TYPES):
+        if brotli is not None:
+            variants['br'] = brotli.compress(content, quality=11)
+        variants['gzip'] = gzip.compress(content, compresslevel=9, mtime=0)
+        variants = {encoding: data for encoding, data in variants.items() if len(data) < len(content)}
+
+    return StaticAsset(
+        path=path,
+        mimetype=mimetype,
+        etag=hashlib.blake2b(content, digest_size=12).hexdigest(),
+        immutable=bool(HASHED_ASSET_PATTERN.search(relative_path)),
+        variants=variants
+    )
+
+class StaticAssetPipeline:
+    """
+    React 빌드 결과물(정적 폴더)을 제공하는 파이프라인입니다.
+
+    - 시작 시 정적 폴더를 한 번 훑어 메모리 매니페스트를 만들므로, 요청마다 `os.path.exists`를 호출하지 않습니다.
+    - 압축 가능한 파일은 gzip/brotli 변형을 미리 계산해 두고 Accept-Encoding에 따라 선택합니다.
+    - 파일 이름에 내용 해시가 포함된 자산은 `immutable` 장기 캐시 헤더를, 그 외(index.html 등)는
+      ETag 재검증(`no-cache`)을 사용합니다.
+
+    빌드 결과물을 교체하면 서버를 다시 시작하거나 `reload()`를 호출해야 합니다.
+    """
+
+    def __init__(self):
+        self.app = None
+        self.static_folder = None
+        self.assets = {}
+
+    def init_app(self, app):
+        """
+        STATIC_PIPELINE_ENABLED 설정이 켜져 있으면 매니페스트를 만듭니다.
+
+        Args:
+            app: Flask 앱.
+        """
+        if not app.config.get('STATIC_PIPELINE_ENABLED', True) or app.static_folder is None:
+            return
+        self.app = app
+        self.static_folder = app.static_folder
+        self.reload()
+        app.logger.info(f"정적 자산 매니페스트 생성: {len(self.assets)}개 파일 "
+                        f"(압축 변형 {sum(len(asset.variants) for asset in self.assets.values())}개)")
+
+    @property
+    def enabled(self):
+        return self.app is not None
+
+    def reload(self):
+        """정적 폴더를 다시 훑어 매니페스트와 압축 변형을 새로 만듭니다."""
+        min_size = self.app.config.get('STATIC_COMPRESS_MIN_BYTES', 1024)
+        assets = {}
+        if os.path.isdir(self.static_folder):
+            for directory, _, filenames in os.walk(self.static_folder):
+                for filename in filenames:
+                    path = os.path.join(directory, filename)
+                    relative_path = os.path.relpath(path, self.static_folder).replace(os.sep, '/')
+                    assets[relative_path] = build_asset(path, relative_path, min_size=min_size)
+        self.assets = assets
+
+    def serve(self, path):
+        """
+        요청 경로의 정적 파일을, 매니페스트에 없으면 index.html을 반환합니다 (클라이언트 사이드 라우팅).
+
+        Args:
+            path: 정적 폴더 기준 요청 경로.
+
+        Returns:
+            Response: 파일 응답. index.html도 없으면 None.
+        """
+        asset = self.assets.get(path) if path else None
+        if asset is None:
+            asset = self.assets.get('index.html')
+            if asset is None:
+                return None
+
+        encoding = request.accept_encodings.best_match(list(asset.variants)) if asset.variants else None
+        if encoding:
+            response = self.app.response_class(asset.variants[encoding], mimetype=asset.mimetype)
+            response.headers['Content-Encoding'] = encoding
+            response.set_etag(f'{asset.etag}-{encoding}')
+        else:
+            response = send_file(asset.path, mimetype=asset.mimetype, etag=False, conditional=False)
+            response.set_etag(asset.etag)
+
+        if asset.variants:
+            response.vary.add('Accept-Encoding')
+        response.headers['Cache-Control'] = IMMUTABLE_CACHE_CONTROL if asset.immutable else 'no-cache'
+        return response.make_conditional(request)
+
+# 앱 전역에서 사용하는 정적 자산 파이프라인 (main.py에서 init_app으로 초기화)
+static_assets = StaticAssetPipeline()
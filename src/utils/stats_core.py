@@ -0,0 +1,42 @@
+import numpy as np
+
+def daily_series(day_ordinals, intensity_sums, start_date, num_days, workout_counts=None):
+    """
+    날짜별 운동 횟수와 평균 강도를 `np.bincount`로 한 번에 계산합니다.
+
+    원본 기록(행마다 1회, 강도 1개)과 일별 롤업(행마다 횟수/강도 합계) 모두에 사용할 수 있습니다.
+    기간 밖의 날짜는 무시합니다.
+
+    Args:
+        day_ordinals: 각 행의 날짜 ordinal 배열.
+        intensity_sums: 행별 강도 (롤업이면 강도 합계).
+        start_date: 기간 시작 날짜.
+        num_days: 기간 일수.
+        workout_counts: 행별 운동 횟수 (None이면 모두 1).
+
+    Returns:
+        tuple: (일별 운동 횟수 배열, 일별 강도 합계 배열, 일별 평균 강도 배열). 길이는 모두 num_days.
+    """
+    offsets = np.asarray(day_ordinals, dtype=np.int64) - start_date.toordinal()
+    mask = (offsets >= 0) & (offsets < num_days)
+    offsets = offsets[mask]
+    weights = None if workout_counts is None else np.asarray(workout_counts, dtype=np.float64)[mask]
+    counts = np.bincount(offsets, weights=weights, minlength=num_days)
+    sums = np.bincount(offsets, weights=np.asarray(intensity_sums, dtype=np.float64)[mask], minlength=num_days)
+    averages = np.divide(sums, counts, out=np.zeros(num_days), where=counts > 0)
+    return counts.astype(np.int64), sums.astype(np.int64), averages
+
+def rollup_columns(rollups):
+    """
+    일별 롤업 객체 리스트를 (날짜 ordinal, 강도 합계, 운동 횟수) 배열로 변환합니다.
+
+    Returns:
+        tuple: (날짜 ordinal 배열, 강도 합계 배열, 운동 횟수 배열).
+               `daily_series(ordinals, sums, start, days, workout_counts=counts)` 형태로 사용합니다.
+    """
+    rollups = list(rollups)
+    return (
+        np.fromiter((r.date.toordinal() for r in rollups), dtype=np.int64, count=len(rollups)),
+        np.fromiter((r.intensity_sum for r in rollups), dtype=np.int64, count=len(rollups)),
+        np.fromiter((r.workout_count for r in rollups), dtype=np.int64, count=len(rollups))
+    )
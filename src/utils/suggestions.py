@@ -0,0 +1,161 @@
+import math
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import and_, func, select
+from sqlalchemy.orm import aliased
+from ..models.user import db, User
+from ..models.exercise_record import ExerciseRecord
+from ..models.friend_edge import FriendEdge
+from .cache import get_suggestions_cache, invalidate_suggestions, suggestions_key
+from .concurrency import query_executor
+from .friend_queries import get_friend_ids
+
+def mutual_friend_candidates_select(user_id, pool_size):
+    """
+    친구의 친구(2촌)를 공통 친구 수 내림차순으로 반환하는 SELECT 문을 생성합니다.
+
+    친구 인접 인덱스(friend_edges)를 자기 자신과 한 번 조인하여 (나 → 친구 → 친구의 친구) 경로를
+    후보별로 세므로, 2촌 연결이 수천 개여도 (user_id, status, friend_id) 인덱스만으로 처리됩니다.
+    본인과 이미 관계가 있는 사용자(수락, 대기 중 모두)는 제외합니다.
+
+    Args:
+        user_id: 기준 사용자의 ID.
+        pool_size: 반환할 최대 후보 수.
+
+    Returns:
+        Select: (candidate_id, mutual_count) 두 컬럼을 반환하는 SELECT 문.
+    """
+    mine = aliased(FriendEdge)
+    theirs = aliased(FriendEdge)
+    known_ids = select(FriendEdge.friend_id).where(FriendEdge.user_id == user_id)
+    mutual_count = func.count().label('mutual_count')
+
+    return select(
+        theirs.friend_id.label('candidate_id'), mutual_count
+    ).select_from(mine).join(
+        theirs,
+        and_(theirs.user_id == mine.friend_id, theirs.status == 'accepted')
+    ).where(
+        mine.user_id == user_id,
+        mine.status == 'accepted',
+        theirs.friend_id != user_id,
+        theirs.friend_id.not_in(known_ids)
+    ).group_by(
+        theirs.friend_id
+    ).order_by(
+        mutual_count.desc(), theirs.friend_id
+    ).limit(pool_size)
+
+def fetch_exercise_type_counts(user_ids, days):
+    """
+    사용자별 최근 `days`일간의 운동 종류별 기록 수를 조회합니다. 유사도 계산에만 쓰이므로 이름 대신 ID로 집계합니다.
+
+    Returns:
+        dict: {user_id: {exercise_type_id: count}}.
+    """
+    since = (datetime.utcnow() - timedelta(days=days)).date()
+    counts = {}
+    for uid, exercise_type_id, count in db.session.query(
+        ExerciseRecord.user_id, ExerciseRecord.exercise_type_id, func.count()
+    ).filter(
+        ExerciseRecord.user_id.in_(user_ids),
+        ExerciseRecord.date >= since
+    ).group_by(ExerciseRecord.user_id, ExerciseRecord.exercise_type_id):
+        counts.setdefault(uid, {})[exercise_type_id] = count
+    return counts
+
+def type_similarity(a, b):
+    """두 운동 종류 분포({종류: 횟수})의 코사인 유사도(0-1)를 계산합니다. 한쪽이 비어 있으면 0입니다."""
+    if not a or not b:
+        return 0.0
+    dot = sum(count * b.get(exercise_type, 0) for exercise_type, count in a.items())
+    if not dot:
+        return 0.0
+    norm = math.sqrt(sum(c * c for c in a.values())) * math.sqrt(sum(c * c for c in b.values()))
+    return dot / norm
+
+def compute_suggestions(user_id, weighted=False):
+    """
+    "알 수도 있는 사람" 추천 목록을 계산합니다.
+
+    공통 친구 수가 많은 2촌 후보를 `SUGGESTION_POOL_SIZE`명까지 가져온 뒤, `weighted`이면
+    최근 운동 종류 분포의 유사도로 점수를 보정합니다 (점수 = 공통 친구 수 × (1 + 가중치 × 유사도)).
+    가중치를 사용할 때 후보 이름 조회와 운동 종류 분포 조회는 서로 독립적이므로 함께 실행합니다.
+
+    Args:
+        user_id: 기준 사용자의 ID.
+        weighted: True이면 운동 종류 유사도를 점수에 반영합니다.
+
+    Returns:
+        list: 점수 내림차순으로 정렬된 추천 항목 딕셔너리 리스트.
+    """
+    config = current_app.config
+    candidates = db.session.execute(
+        mutual_friend_candidates_select(user_id, config.get('SUGGESTION_POOL_SIZE', 100))
+    ).all()
+    if not candidates:
+        return []
+    candidate_ids = [candidate_id for candidate_id, _ in candidates]
+
+    def usernames():
+        return dict(db.session.query(User.id, User.username).filter(User.id.in_(candidate_ids)).all())
+
+    if weighted:
+        names, counts = query_executor.gather(usernames, lambda: fetch_exercise_type_counts(
+            candidate_ids + [user_id], config.get('SUGGESTION_TYPE_WINDOW_DAYS', 90)
+        ))
+    else:
+        names, counts = usernames(), {}
+    type_weight = config.get('SUGGESTION_TYPE_WEIGHT', 1.0)
+    my_types = counts.get(user_id, {})
+
+    suggestions = []
+    for candidate_id, mutual_count in candidates:
+        entry = {
+            'user_id': candidate_id,
+            'username': names.get(candidate_id),
+            'mutual_friend_count': mutual_count,
+            'score': float(mutual_count)
+        }
+        if weighted:
+            similarity = type_similarity(my_types, counts.get(candidate_id, {}))
+            entry['exercise_similarity'] = round(similarity, 4)
+            entry['score'] = round(mutual_count * (1 + type_weight * similarity), 4)
+        suggestions.append(entry)
+
+    if weighted:
+        suggestions.sort(key=lambda entry: (-entry['score'], -entry['mutual_friend_count'], entry['user_id']))
+    return suggestions
+
+def get_suggestions(user_id, limit=10, weighted=False):
+    """
+    캐시된 추천 목록에서 상위 `limit`개를 반환합니다. 캐시에 없으면 계산하여 저장합니다.
+
+    추천 목록은 사용자별로 (가중치 사용 여부마다) 캐시되며, 본인이나 친구의 친구 관계가 바뀌면
+    `invalidate_suggestions_around`로 무효화됩니다. 운동 기록 변경은 캐시 TTL이 지나면 반영됩니다.
+
+    Returns:
+        list: 추천 항목 딕셔너리 리스트.
+    """
+    cache = get_suggestions_cache()
+    key = suggestions_key(user_id, weighted)
+    hit, suggestions = cache.get(key)
+    if not hit:
+        suggestions = compute_suggestions(user_id, weighted)
+        cache.set(key, suggestions)
+    return suggestions[:limit]
+
+def invalidate_suggestions_around(member_ids):
+    """
+    친구 관계 변경 후, 관계 당사자와 그 친구들의 추천 캐시를 삭제합니다.
+
+    A와 B의 관계가 바뀌면 A, B 본인의 후보 제외 목록뿐 아니라 A의 친구들에게서 B의
+    (B의 친구들에게서 A의) 공통 친구 수도 바뀌므로, 친구 ID 캐시를 무효화한 뒤 호출해야 합니다.
+
+    Args:
+        member_ids: 관계 당사자 사용자 ID의 iterable.
+    """
+    affected = set(member_ids)
+    for member_id in list(affected):
+        affected |= get_friend_ids(member_id)
+    invalidate_suggestions(affected)
@@ -0,0 +1,118 @@
+from datetime import datetime, timedelta
+from flask import current_app
+from sqlalchemy import and_, exists, or_
+from ..models.user import db
+from ..models.exercise_record import ExerciseRecord
+from ..models.exercise_record_deletion import ExerciseRecordDeletion
+from .pagination import decode_cursor, encode_cursor
+from .serialization import project_records, record_row_to_dict
+
+class SyncCursorExpiredError(Exception):
+    """커서가 툼스톤 보존 기간보다 오래되어 삭제 내역을 빠짐없이 전달할 수 없을 때 발생하는 예외"""
+
+def record_deletion(record):
+    """
+    운동 기록 삭제를 툼스톤 로그에 추가합니다. 삭제와 같은 트랜잭션 안에서 호출하며, 커밋은 호출자가 합니다.
+
+    Args:
+        record: 삭제할 ExerciseRecord.
+    """
+    db.session.add(ExerciseRecordDeletion(record_id=record.id, user_id=record.user_id, deleted_at=datetime.utcnow()))
+
+def tombstone_cutoff(now=None):
+    """이 시각 이전의 툼스톤은 보존하지 않습니다 (SYNC_TOMBSTONE_RETENTION_DAYS)."""
+    now = now or datetime.utcnow()
+    return now - timedelta(days=current_app.config.get('SYNC_TOMBSTONE_RETENTION_DAYS', 30))
+
+def fetch_changes(since=None, user_id=None, limit=500):
+    """
+    커서 이후에 생성/수정된 운동 기록과 삭제된 기록 ID를 (updated_at, id) 오름차순으로 반환합니다.
+
+    (updated_at, id) 인덱스의 범위 조회이므로 비용은 전체 기록 수가 아니라 변경 건수에 비례합니다.
+    커서가 없으면 전체 기록을 같은 순서로 페이지 단위로 반환하며 (최초 동기화), 삭제 목록은 비어 있습니다.
+
+    다음 커서는 마지막으로 반환한 행의 키이지만, 변경을 모두 따라잡은 경우에는 현재 시각에서
+    SYNC_OVERLAP_SECONDS만큼 이전 시각보다 앞서지 않게 합니다. 커밋이 늦은 쓰기(타임스탬프는 앞서지만
+    커서 이후에 보이게 된 행)를 놓치지 않기 위한 것으로, 겹치는 구간의 행은 다시 전달될 수 있으므로
+    클라이언트는 ID 기준으로 덮어쓰기(upsert)해야 합니다.
+
+    Args:
+        since: 이전 응답의 next_since 커서 문자열 (없으면 최초 동기화).
+        user_id: 지정하면 해당 사용자의 변경만 반환합니다.
+        limit: 한 번에 반환할 최대 기록 수.
+
+    Returns:
+        dict: {'records': 기록 딕셔너리 리스트, 'deleted': 삭제된 기록 ID 리스트,
+               'next_since': 다음 요청의 커서, 'has_more': 남은 변경이 있는지 여부}.
+
+    Raises:
+        InvalidCursorError: 커서 형식이 올바르지 않은 경우.
+        SyncCursorExpiredError: 커서가 툼스톤 보존 기간보다 오래된 경우 (전체 동기화가 필요합니다).
+    """
+    now = datetime.utcnow()
+    since_key = decode_cursor(since) if since else None
+    if since_key and since_key[0] < tombstone_cutoff(now):
+        raise SyncCursorExpiredError('동기화 커서가 만료되었습니다. 전체 목록을 다시 받아야 합니다.')
+
+    query = ExerciseRecord.query
+    if user_id is not None:
+        query = query.filter(ExerciseRecord.user_id == user_id)
+    if since_key:
+        last_updated_at, last_id = since_key
+        # 앞의 범위 조건은 결과에 영향이 없지만, SQLite가 OR 조건을 인덱스 범위 조회 하나로 처리해
+        # 정렬 없이 limit건에서 멈추게 합니다.
+        query = query.filter(ExerciseRecord.updated_at >= last_updated_at, or_(
+            ExerciseRecord.updated_at > last_updated_at,
+            and_(ExerciseRecord.updated_at == last_updated_at, ExerciseRecord.id > last_id)
+        ))
+    query = query.order_by(ExerciseRecord.updated_at, ExerciseRecord.id)
+
+    # 다음 페이지 존재 여부를 알기 위해 한 건 더 조회합니다.
+    records = [record_row_to_dict(row) for row in project_records(query).limit(limit + 1).all()]
+    has_more = len(records) > limit
+    records = records[:limit]
+    last_key = (records[-1]['updated_at'], records[-1]['id']) if records else None
+
+    if has_more:
+        next_key = last_key
+    else:
+        overlap_floor = (now - timedelta(seconds=current_app.config.get('SYNC_OVERLAP_SECONDS', 5)), 0)
+        next_key = min(last_key, overlap_floor) if last_key else overlap_floor
+        if since_key:
+            next_key = max(since_key, next_key)
+
+    deleted = []
+    if since_key:
+        tombstones = db.session.query(ExerciseRecordDeletion.record_id).filter(
+            ExerciseRecordDeletion.deleted_at > since_key[0],
+            # SQLite는 가장 큰 ID가 삭제되면 그 ID를 다시 쓸 수 있으므로, 현재 존재하는 기록의 툼스톤은 제외합니다.
+            ~exists().where(ExerciseRecord.id == ExerciseRecordDeletion.record_id)
+        )
+        if user_id is not None:
+            tombstones = tombstones.filter(ExerciseRecordDeletion.user_id == user_id)
+        if has_more:
+            # 다음 페이지의 커서 이후 삭제는 다음 요청에서 전달합니다.
+            tombstones = tombstones.filter(ExerciseRecordDeletion.deleted_at <= next_key[0])
+        deleted = list(dict.fromkeys(record_id for record_id, in tombstones))
+
+    return {
+        'records': records,
+        'deleted': deleted,
+        'next_since': encode_cursor(*next_key),
+        'has_more': has_more
+    }
+
+def prune_deletions(now=None):
+    """
+    보존 기간(SYNC_TOMBSTONE_RETENTION_DAYS)이 지난 툼스톤을 삭제합니다.
+
+    이보다 오래된 커서는 `fetch_changes`에서 만료 처리되므로, 정리된 툼스톤이 필요한 클라이언트는 없습니다.
+
+    Returns:
+        int: 삭제된 툼스톤 수.
+    """
+    count = ExerciseRecordDeletion.query.filter(
+        ExerciseRecordDeletion.deleted_at < tombstone_cutoff(now)
+    ).delete(synchronize_session=False)
+    db.session.commit()
+    return count
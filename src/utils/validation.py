@@ -1,13 +1,112 @@
-from functools import wraps
+from datetime import date
+from functools import lru_cache, wraps
+from importlib import import_module
 from flask import request, jsonify, current_app, g
-from pydantic import ValidationError
+
+SCHEMA_MODULE = 'src.validation.schemas'
+
+def parse_iso_date(value):
+    """
+    'YYYY-MM-DD' 문자열을 date로 변환합니다.
+
+    `datetime.strptime`보다 훨씬 빠른 `date.fromisoformat`을 사용하되, 길이를 확인하여
+    'YYYY-MM-DD' 이외의 ISO 형식(예: '20240101')은 받지 않습니다. date 객체는 그대로 반환합니다.
+
+    Raises:
+        ValueError: 형식이 올바르지 않거나 존재하지 않는 날짜인 경우.
+    """
+    if isinstance(value, date):
+        return value
+    if not isinstance(value, str) or len(value) != 10 or value[4] != '-' or value[7] != '-':
+        raise ValueError('날짜 형식이 올바르지 않습니다. (YYYY-MM-DD)')
+    try:
+        return date.fromisoformat(value)
+    except ValueError:
+        raise ValueError('날짜 형식이 올바르지 않습니다. (YYYY-MM-DD)')
+
+@lru_cache(maxsize=None)
+def resolve_schema(schema):
+    """
+    스키마 이름을 `src.validation.schemas`의 클래스로 바꿉니다. 클래스가 주어지면 그대로 반환합니다.
+
+    pydantic은 import 비용이 크므로, 스키마 모듈은 첫 검증 요청에서 처음 불러옵니다.
+    """
+    if isinstance(schema, str):
+        return getattr(import_module(SCHEMA_MODULE), schema)
+    return schema
+
+@lru_cache(maxsize=None)
+def get_adapter(schema, many=False):
+    """
+    스키마(또는 스키마 리스트)에 대한 pydantic `TypeAdapter`를 한 번만 만들어 재사용합니다.
+
+    Args:
+        schema: 스키마 클래스 또는 이름.
+        many: True이면 `list[schema]`를 검증하는 어댑터를 반환합니다.
+
+    Returns:
+        TypeAdapter: 컴파일된 검증기.
+    """
+    from pydantic import TypeAdapter
+    schema = resolve_schema(schema)
+    return TypeAdapter(list[schema] if many else schema)
+
+def error_details(error):
+    """
+    ValidationError를 JSON으로 응답할 수 있는 오류 목록으로 변환합니다.
+
+    입력값(`input`)은 bytes 등 직렬화할 수 없는 값일 수 있으므로 제외합니다.
+    """
+    details = error.errors(include_url=False, include_context=False)
+    for detail in details:
+        detail.pop('input', None)
+    return details
+
+def format_validation_error(error):
+    """ValidationError를 '필드: 메시지' 형태의 한 줄 문자열로 요약합니다. 행별 오류 보고에 사용합니다."""
+    return '; '.join(
+        f"{'.'.join(str(part) for part in detail['loc']) or '본문'}: {detail['msg']}"
+        for detail in error.errors(include_url=False, include_context=False)
+    )
+
+def validate_rows(schema, rows, from_json=False):
+    """
+    여러 행을 검증하고 유효한 행과 행별 오류를 나누어 반환합니다.
+
+    모든 행이 유효한 일반적인 경우는 `list[schema]` 어댑터 한 번으로 검증하고,
+    실패하면 행마다 다시 검증하여 유효한 행만 골라냅니다.
+
+    Args:
+        schema: 스키마 클래스 또는 이름.
+        rows: 행 리스트. from_json이면 각 행은 JSON 문자열(예: NDJSON의 한 줄)입니다.
+        from_json: True이면 행을 파이썬 객체로 변환하지 않고 JSON에서 바로 검증합니다.
+
+    Returns:
+        tuple: ([(행 번호, 검증된 모델), ...], [{'index': 행 번호, 'error': 메시지}, ...]).
+    """
+    from pydantic import ValidationError
+    adapter = get_adapter(schema)
+    if not from_json:
+        try:
+            return list(enumerate(get_adapter(schema, many=True).validate_python(rows))), []
+        except ValidationError:
+            pass
+
+    valid, errors = [], []
+    for index, row in enumerate(rows):
+        try:
+            valid.append((index, adapter.validate_json(row) if from_json else adapter.validate_python(row)))
+        except ValidationError as e:
+            errors.append({'index': index, 'error': format_validation_error(e)})
+    return valid, errors
 
 def validate_with(schema):
     """
     Pydantic 스키마를 사용하여 요청 본문을 검증하는 데코레이터입니다.
 
     이 데코레이터는 Flask 라우트 함수에 적용됩니다.
-    요청의 JSON 본문을 주어진 Pydantic 스키마와 비교하여 검증합니다.
+    요청 본문(JSON)을 파이썬 객체로 먼저 변환하지 않고, 스키마별로 한 번 만들어 둔
+    `TypeAdapter`로 JSON에서 바로 파싱과 검증을 함께 수행합니다.
 
     검증에 성공하면, 검증된 데이터는 Flask의 `g` 객체 (`g.validated_data`)에 저장되어
     라우트 함수 내에서 안전하게 접근할 수 있습니다.
@@ -15,27 +114,30 @@ def validate_with(schema):
     검증에 실패하면, 400 Bad Request 응답과 함께 상세한 오류 메시지를 반환합니다.
 
     Args:
-        schema: 검증에 사용할 Pydantic BaseModel 클래스.
+        schema: 검증에 사용할 Pydantic BaseModel 클래스, 또는 `src.validation.schemas`의 클래스 이름.
+                이름으로 지정하면 pydantic import가 첫 요청까지 미뤄집니다.
     """
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
+            from pydantic import ValidationError
             try:
-                # 요청 본문에서 JSON 데이터를 가져옵니다.
-                data = request.get_json()
-                if data is None:
+                # 요청 본문을 가져옵니다.
+                body = request.get_data()
+                if not body:
                     return jsonify(error="잘못된 요청입니다. JSON 본문이 필요합니다."), 400
 
                 # 스키마를 사용하여 데이터 검증하고 g 객체에 저장
-                g.validated_data = schema(**data)
+                g.validated_data = get_adapter(schema).validate_json(body)
 
             except ValidationError as e:
-                # Pydantic 검증 오류 처리
-                current_app.logger.warning(f"입력값 검증 실패: {e.errors()}")
-                return jsonify(error="입력값이 유효하지 않습니다.", details=e.errors()), 400
+                # Pydantic 검증 오류 처리 (JSON 파싱 실패 포함)
+                details = error_details(e)
+                current_app.logger.warning(f"입력값 검증 실패: {details}")
+                return jsonify(error="입력값이 유효하지 않습니다.", details=details), 400
 
             except Exception as e:
-                # 기타 예외 처리 (예: JSON 파싱 실패)
+                # 기타 예외 처리
                 current_app.logger.error(f"요청 처리 중 예기치 않은 오류 발생: {e}", exc_info=True)
                 return jsonify(error="요청 처리 중 오류가 발생했습니다."), 400
 
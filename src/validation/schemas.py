@@ -1,4 +1,16 @@
-from pydantic import BaseModel, constr, PositiveInt
+from datetime import date
+from typing import Annotated, Literal, Optional
+from pydantic import BaseModel, BeforeValidator, Field, constr, PositiveInt
+from src.utils.validation import parse_iso_date
+
+# 'YYYY-MM-DD' 문자열만 받는 날짜 (pydantic 기본 date 타입은 타임스탬프 숫자 등도 받으므로 빠른 전용 파서 사용)
+IsoDate = Annotated[date, BeforeValidator(parse_iso_date)]
+# 0-10 정수 강도 (strict: true/false나 5.0 같은 값은 거부)
+Intensity = Annotated[int, Field(ge=0, le=10, strict=True)]
+ClientKey = constr(min_length=1, max_length=64)
+# 시간대는 작은 정수 코드로 저장되므로 정해진 값만 받습니다 (src.utils.catalog.TIME_OF_DAY_LABELS).
+TimeOfDay = Literal['오전', '오후', '야간', '틈틈이']
+ExerciseTypeName = constr(min_length=1, max_length=100)
 
 class FriendRequestSchema(BaseModel):
     """'친구 요청 보내기' API에 대한 검증 스키마"""
@@ -13,3 +25,25 @@ class RemoveFriendSchema(BaseModel):
     """'친구 삭제' API에 대한 검증 스키마"""
     user_id: PositiveInt
     friend_id: PositiveInt
+
+class ExerciseRecordSchema(BaseModel):
+    """'운동 기록 생성' API (단건, 대량)에 대한 검증 스키마"""
+    user_id: PositiveInt
+    date: IsoDate
+    time_of_day: TimeOfDay
+    intensity: Intensity
+    exercise_type: ExerciseTypeName
+    memo: Optional[str] = ''
+    client_key: Optional[ClientKey] = None
+
+class ExerciseRecordUpdateSchema(BaseModel):
+    """
+    '운동 기록 수정' API에 대한 검증 스키마. 보낸 필드만 수정합니다 (`model_fields_set`).
+
+    memo 이외의 필드는 null로 보낼 수 없습니다 (기본값 None은 필드를 생략한 경우에만 사용).
+    """
+    date: IsoDate = None
+    time_of_day: TimeOfDay = None
+    intensity: Intensity = None
+    exercise_type: ExerciseTypeName = None
+    memo: Optional[str] = None
@@ -1,173 +1,136 @@
 from flask import Blueprint, request, jsonify
-from src.models.user import db
-from src.models.exercise_record import ExerciseRecord
-from datetime import datetime, timedelta
-from sqlalchemy import func
+from src.utils.rollup import BUCKETS, load_rollups, period_statistics
+from src.utils.global_stats import global_stats_snapshot
+from src.utils.db_profile import use_read_replica
+from src.utils.etag import conditional_get
+from src.utils.validation import parse_iso_date
+from datetime import date, timedelta
 
 statistics_bp = Blueprint('statistics', __name__)
 
+# 기간별 일수 (오늘 포함)
+PERIOD_DAYS = {'day': 1, 'week': 7, 'month': 30, 'year': 365}
+MAX_RANGE_DAYS = 3660
+
 @statistics_bp.route('/statistics/<int:user_id>', methods=['GET'])
+@use_read_replica
+@conditional_get()
 def get_user_statistics(user_id):
-    """사용자의 운동 통계 조회"""
+    """
+    사용자의 운동 통계 조회 (일별 롤업 기반)
+
+    쿼리 파라미터:
+    - period: day, week, month, year (기본값 week). 오늘을 포함한 최근 기간입니다.
+    - start, end (YYYY-MM-DD, 선택): 임의 기간. 지정하면 period 대신 사용합니다.
+      end를 생략하면 오늘, start를 생략하면 end로부터 period 길이만큼을 사용합니다.
+    - bucket: day, week, month (선택). 생략하면 기간 길이에 따라 자동 선택합니다.
+
+    사용자의 데이터가 바뀌지 않았으면 `If-None-Match`에 대해 집계 없이 304를 반환합니다.
+    """
     try:
         # 쿼리 파라미터
         period = request.args.get('period', 'week')  # day, week, month, year
+        start_param = request.args.get('start')
+        end_param = request.args.get('end')
+        bucket = request.args.get('bucket')
         
-        # 기간 설정
-        now = datetime.now()
-        if period == 'day':
-            start_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        elif period == 'week':
-            start_date = now - timedelta(days=7)
-        elif period == 'month':
-            start_date = now - timedelta(days=30)
-        elif period == 'year':
-            start_date = now - timedelta(days=365)
-        else:
+        if period not in PERIOD_DAYS:
             return jsonify({'error': '유효하지 않은 기간입니다. (day, week, month, year)'}), 400
-        
-        # 기간 내 운동 기록 조회
-        records = ExerciseRecord.query.filter(
-            ExerciseRecord.user_id == user_id,
-            ExerciseRecord.created_at >= start_date
-        ).all()
-        
-        if not records:
-            return jsonify({
-                'period': period,
-                'total_workouts': 0,
-                'average_intensity': 0,
-                'max_intensity': 0,
-                'total_intensity_score': 0,
-                'consistency_score': 0,
-                'time_of_day_distribution': {},
-                'exercise_type_distribution': {},
-                'daily_trends': []
-            }), 200
-        
-        # 기본 통계 계산
-        total_workouts = len(records)
-        intensities = [record.intensity for record in records]
-        average_intensity = sum(intensities) / len(intensities)
-        max_intensity = max(intensities)
-        total_intensity_score = sum(intensities)
-        
-        # 일관성 점수 계산 (최근 7일 중 운동한 날의 비율)
-        if period == 'week':
-            workout_dates = set(record.date for record in records)
-            consistency_score = (len(workout_dates) / 7) * 100
-        else:
-            consistency_score = 0  # 다른 기간에 대해서는 별도 계산 로직 필요
-        
-        # 시간대별 분포
-        time_of_day_distribution = {}
-        for record in records:
-            time_of_day = record.time_of_day
-            time_of_day_distribution[time_of_day] = time_of_day_distribution.get(time_of_day, 0) + 1
-        
-        # 운동 종류별 분포
-        exercise_type_distribution = {}
-        for record in records:
-            exercise_type = record.exercise_type
-            exercise_type_distribution[exercise_type] = exercise_type_distribution.get(exercise_type, 0) + 1
-        
-        # 일별 추이 (최근 7일)
-        daily_trends = []
-        for i in range(7):
-            date = (now - timedelta(days=6-i)).date()
-            day_records = [r for r in records if r.date == date]
-            
-            if day_records:
-                day_avg_intensity = sum(r.intensity for r in day_records) / len(day_records)
-                day_workout_count = len(day_records)
-            else:
-                day_avg_intensity = 0
-                day_workout_count = 0
-            
-            daily_trends.append({
-                'date': date.isoformat(),
-                'average_intensity': round(day_avg_intensity, 1),
-                'workout_count': day_workout_count
-            })
+        if bucket is not None and bucket not in BUCKETS:
+            return jsonify({'error': '유효하지 않은 버킷입니다. (day, week, month)'}), 400
+        
+        # 기간 설정 (운동 날짜 기준, 양 끝 포함)
+        try:
+            end_date = parse_iso_date(end_param) if end_param else date.today()
+            start_date = (parse_iso_date(start_param) if start_param
+                          else end_date - timedelta(days=PERIOD_DAYS[period] - 1))
+        except ValueError:
+            return jsonify({'error': '날짜 형식이 올바르지 않습니다. (YYYY-MM-DD)'}), 400
+        
+        if start_date > end_date:
+            return jsonify({'error': '시작 날짜는 종료 날짜보다 늦을 수 없습니다.'}), 400
+        if (end_date - start_date).days + 1 > MAX_RANGE_DAYS:
+            return jsonify({'error': f'조회 기간은 최대 {MAX_RANGE_DAYS}일입니다.'}), 400
+        
+        # 버킷별 추이, 합계, 일관성 점수(운동한 날 / 전체 일수)를 SQL 집계로 계산
+        stats = period_statistics(user_id, start_date, end_date, bucket)
+        total_workouts = stats['total_workouts']
+        average_intensity = stats['total_intensity_score'] / total_workouts if total_workouts else 0
         
         return jsonify({
-            'period': period,
+            'period': 'custom' if (start_param or end_param) else period,
+            'start_date': start_date.isoformat(),
+            'end_date': end_date.isoformat(),
+            'bucket': stats['bucket'],
             'total_workouts': total_workouts,
             'average_intensity': round(average_intensity, 1),
-            'max_intensity': max_intensity,
-            'total_intensity_score': total_intensity_score,
-            'consistency_score': round(consistency_score, 1),
-            'time_of_day_distribution': time_of_day_distribution,
-            'exercise_type_distribution': exercise_type_distribution,
-            'daily_trends': daily_trends
+            'max_intensity': stats['max_intensity'],
+            'total_intensity_score': stats['total_intensity_score'],
+            'active_days': stats['active_days'],
+            'consistency_score': stats['consistency_score'],
+            'time_of_day_distribution': stats['time_of_day_distribution'],
+            'exercise_type_distribution': stats['exercise_type_distribution'],
+            'daily_trends': stats['trends']
         }), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 @statistics_bp.route('/statistics/compare/<int:user_id>/<int:friend_id>', methods=['GET'])
+@use_read_replica
+@conditional_get(user_args=('user_id', 'friend_id'))
 def compare_with_friend(user_id, friend_id):
-    """친구와의 운동 통계 비교"""
+    """친구와의 운동 통계 비교 (일별 롤업 기반)"""
+    # NumPy는 이 API에서만 사용하므로 워커 시작 시간을 줄이기 위해 첫 호출 시 불러옵니다.
+    from src.utils.stats_core import daily_series, rollup_columns
     try:
         period = request.args.get('period', 'week')
         
         # 기간 설정
-        now = datetime.now()
-        if period == 'week':
-            start_date = now - timedelta(days=7)
-        elif period == 'month':
-            start_date = now - timedelta(days=30)
-        else:
+        if period not in ('week', 'month'):
             return jsonify({'error': '비교는 week 또는 month 기간만 지원합니다.'}), 400
-        
-        # 두 사용자의 운동 기록 조회
-        user_records = ExerciseRecord.query.filter(
-            ExerciseRecord.user_id == user_id,
-            ExerciseRecord.created_at >= start_date
-        ).all()
-        
-        friend_records = ExerciseRecord.query.filter(
-            ExerciseRecord.user_id == friend_id,
-            ExerciseRecord.created_at >= start_date
-        ).all()
-        
-        # 통계 계산 함수
-        def calculate_stats(records):
-            if not records:
+        days = PERIOD_DAYS[period]
+        today = date.today()
+        start_date = today - timedelta(days=days - 1)
+        
+        # 두 사용자의 일별 롤업을 한 번에 조회
+        rollups = load_rollups([user_id, friend_id], start_date)
+        user_rollups = [r for r in rollups if r.user_id == user_id]
+        friend_rollups = [r for r in rollups if r.user_id == friend_id]
+        
+        # 통계 계산 함수 (일별 횟수/강도 합계 배열에서 계산)
+        def calculate_stats(day_counts, day_sums):
+            total_workouts = int(day_counts.sum())
+            if not total_workouts:
                 return {
                     'total_workouts': 0,
                     'average_intensity': 0,
                     'total_score': 0
                 }
             
-            intensities = [r.intensity for r in records]
+            total_score = int(day_sums.sum())
             return {
-                'total_workouts': len(records),
-                'average_intensity': round(sum(intensities) / len(intensities), 1),
-                'total_score': sum(intensities)
+                'total_workouts': total_workouts,
+                'average_intensity': round(total_score / total_workouts, 1),
+                'total_score': total_score
             }
         
-        user_stats = calculate_stats(user_records)
-        friend_stats = calculate_stats(friend_records)
+        def series(user_rollup_rows):
+            ordinals, intensity_sums, workout_counts = rollup_columns(user_rollup_rows)
+            return daily_series(ordinals, intensity_sums, start_date, days, workout_counts=workout_counts)
         
-        # 일별 비교 데이터
-        comparison_data = []
-        days = 7 if period == 'week' else 30
+        user_counts, user_sums, user_averages = series(user_rollups)
+        friend_counts, friend_sums, friend_averages = series(friend_rollups)
         
-        for i in range(days):
-            date = (now - timedelta(days=days-1-i)).date()
-            
-            user_day_records = [r for r in user_records if r.date == date]
-            friend_day_records = [r for r in friend_records if r.date == date]
-            
-            user_day_avg = sum(r.intensity for r in user_day_records) / len(user_day_records) if user_day_records else 0
-            friend_day_avg = sum(r.intensity for r in friend_day_records) / len(friend_day_records) if friend_day_records else 0
-            
-            comparison_data.append({
-                'date': date.isoformat(),
-                'user_intensity': round(user_day_avg, 1),
-                'friend_intensity': round(friend_day_avg, 1)
-            })
+        user_stats = calculate_stats(user_counts, user_sums)
+        friend_stats = calculate_stats(friend_counts, friend_sums)
+        
+        # 일별 비교 데이터
+        comparison_data = [{
+            'date': (start_date + timedelta(days=i)).isoformat(),
+            'user_intensity': round(float(user_averages[i]), 1),
+            'friend_intensity': round(float(friend_averages[i]), 1)
+        } for i in range(days)]
         
         return jsonify({
             'period': period,
@@ -180,52 +143,16 @@ def compare_with_friend(user_id, friend_id):
         return jsonify({'error': str(e)}), 500
 
 @statistics_bp.route('/statistics/global', methods=['GET'])
+@use_read_replica
 def get_global_statistics():
-    """전체 사용자 통계 (익명화된 데이터)"""
+    """
+    전체 사용자 통계 (익명화된 데이터)
+
+    최근 30일 통계는 메모리의 스냅샷에서 반환하며, 스냅샷은 백그라운드에서 주기적으로
+    갱신됩니다 (`src/utils/global_stats.py` 참고). `generated_at`은 스냅샷 계산 시각입니다.
+    """
     try:
-        # 최근 30일간의 전체 통계
-        thirty_days_ago = datetime.now() - timedelta(days=30)
-        
-        # 전체 운동 기록 수
-        total_records = ExerciseRecord.query.filter(
-            ExerciseRecord.created_at >= thirty_days_ago
-        ).count()
-        
-        # 활성 사용자 수 (최근 30일간 운동 기록이 있는 사용자)
-        active_users = db.session.query(ExerciseRecord.user_id).filter(
-            ExerciseRecord.created_at >= thirty_days_ago
-        ).distinct().count()
-        
-        # 평균 운동 강도
-        avg_intensity_result = db.session.query(func.avg(ExerciseRecord.intensity)).filter(
-            ExerciseRecord.created_at >= thirty_days_ago
-        ).scalar()
-        
-        avg_intensity = round(avg_intensity_result, 1) if avg_intensity_result else 0
-        
-        # 인기 운동 종류 (상위 5개)
-        popular_exercises = db.session.query(
-            ExerciseRecord.exercise_type,
-            func.count(ExerciseRecord.id).label('count')
-        ).filter(
-            ExerciseRecord.created_at >= thirty_days_ago
-        ).group_by(ExerciseRecord.exercise_type).order_by(
-            func.count(ExerciseRecord.id).desc()
-        ).limit(5).all()
-        
-        popular_exercises_list = [
-            {'exercise_type': exercise[0], 'count': exercise[1]}
-            for exercise in popular_exercises
-        ]
-        
-        return jsonify({
-            'period': '30_days',
-            'total_workout_records': total_records,
-            'active_users': active_users,
-            'average_intensity': avg_intensity,
-            'popular_exercises': popular_exercises_list
-        }), 200
+        return jsonify(global_stats_snapshot.get()), 200
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
-